@@ -0,0 +1,45 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+"""Run time of the functions in protlearn.dimreduction on random feature 
+matrices."""
+
+from sklearn.linear_model import LogisticRegression
+from protlearn import dimreduction
+from .common import feature_matrix
+
+# keyword arguments of each function, and the largest number of matrix 
+# entries (n_samples*n_features) benchmarked
+DIMREDUCTION = {
+    'correlation': ({}, 10**8),
+    'lasso': ({}, 10**7),
+    'pca': ({}, 10**8),
+    'rfe': ({'estimator': LogisticRegression(max_iter=200), 'n_features': 10, 
+             'step': .1}, 10**6),
+    'sequential': ({'estimator': LogisticRegression(max_iter=200), 
+                    'n_features': 3}, 10**4),
+    'tree_importance': ({'n_estimators': 20, 'n_iterations': 1}, 10**7),
+    'tsne': ({}, 10**6),
+    'univariate_filter': ({'top': 10}, 10**8),
+    'variance': ({}, 10**8),
+}
+
+# functions that take no labels
+UNSUPERVISED = ['correlation', 'pca', 'tsne', 'variance']
+
+class DimReduction:
+
+    params = (sorted(DIMREDUCTION), [100, 10000, 1000000], [50, 500])
+    param_names = ['function', 'n_samples', 'n_features']
+    timeout = 900
+
+    def setup(self, name, n_samples, n_features):
+        if n_samples*n_features > DIMREDUCTION[name][1]:
+            raise NotImplementedError
+        self.X, self.y = feature_matrix(n_samples, n_features)
+        self.func = getattr(dimreduction, name)
+
+    def time_dimreduction(self, name, n_samples, n_features):
+        if name in UNSUPERVISED:
+            self.func(self.X, **DIMREDUCTION[name][0])
+        else:
+            self.func(self.X, self.y, **DIMREDUCTION[name][0])
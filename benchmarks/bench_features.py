@@ -0,0 +1,54 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+"""Steady-state run time of the functions in protlearn.features."""
+
+import protlearn
+from protlearn import features
+from .common import FEATURES, N_SAMPLES, LENGTHS, sequences, skip_features
+
+class Features:
+    """Run time of each feature function on random sequences of equal 
+    length. Throughput in residues per second is n_samples*length divided by
+    the reported time."""
+
+    params = (sorted(FEATURES), N_SAMPLES, LENGTHS)
+    param_names = ['function', 'n_samples', 'length']
+    timeout = 600
+
+    def setup(self, name, n_samples, length):
+        skip_features(name, n_samples, length)
+        self.X = sequences(n_samples, length)
+        self.func = getattr(features, name)
+
+        # warm up (load data tables)
+        self.func(self.X[:2], **FEATURES[name])
+
+    def time_features(self, name, n_samples, length):
+        self.func(self.X, **FEATURES[name])
+
+    def peakmem_features(self, name, n_samples, length):
+        self.func(self.X, **FEATURES[name])
+
+class Pipeline:
+    """Run time of several feature sets computed in one FeaturePipeline."""
+
+    params = ([1000, 100000], [100, 1000])
+    param_names = ['n_samples', 'length']
+    timeout = 600
+
+    def setup(self, n_samples, length):
+        self.X = sequences(n_samples, length)
+        self.pipe = features.FeaturePipeline([
+            ('aac', None), ('aaindex1', None), ('paac', {'lambda_': 5}),
+            ('apaac', {'lambda_': 5}), ('qso', {'d': 5}), ('moran', {'d': 5}),
+            ('geary', {'d': 5}), ('ctdc', None), ('ctdt', None)])
+        self.pipe.transform(self.X[:2])
+
+    def time_pipeline(self, n_samples, length):
+        self.pipe.transform(self.X)
+
+    def time_dedup(self, n_samples, length):
+        # 30% unique sequences
+        X = self.X[:int(.3*n_samples)]*4
+        with protlearn.config_context(dedup=True):
+            self.pipe.transform(X[:n_samples])
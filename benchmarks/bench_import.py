@@ -0,0 +1,33 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+"""Import time and cold first-call latency, each measured in a fresh 
+interpreter."""
+
+from .common import FEATURES
+
+def timeraw_import_protlearn():
+    return "import protlearn"
+
+def timeraw_import_features():
+    return "import protlearn.features"
+
+def timeraw_import_preprocessing():
+    return "import protlearn.preprocessing"
+
+def timeraw_import_dimreduction():
+    return "import protlearn.dimreduction"
+
+class FirstCall:
+    """Latency of the first call of each feature function after import, 
+    which includes loading its data tables."""
+
+    params = sorted(FEATURES)
+    param_names = ['function']
+
+    def timeraw_first_call(self, name):
+        setup = ("from protlearn.features import {name}\n"
+                 "X = ['MKTAYIAKQRQISFVKSHFSRQ', 'GSHMLEDPVAGKTEWLTAYCAN']"
+                 ).format(name=name)
+        code = "{name}(X, **{params!r})".format(name=name, 
+                                                  params=FEATURES[name])
+        return code, setup
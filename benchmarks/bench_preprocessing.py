@@ -0,0 +1,32 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+"""Run time of the functions in protlearn.preprocessing."""
+
+from protlearn.preprocessing import integer_encode, remove_duplicates, \
+                                    remove_unnatural
+from .common import N_SAMPLES, LENGTHS, MAX_RESIDUES, sequences
+
+class Preprocessing:
+
+    params = (N_SAMPLES, LENGTHS)
+    param_names = ['n_samples', 'length']
+    timeout = 600
+
+    def setup(self, n_samples, length):
+        if n_samples*length > MAX_RESIDUES:
+            raise NotImplementedError
+        self.X = sequences(n_samples, length)
+
+        # half of the sequences are duplicates, some contain unnatural 
+        # amino acids
+        self.X_dup = self.X[:n_samples//2]*2
+        self.X_unnat = sequences(n_samples, length, alphabet='ACDEFGHIKLMNPQRSTVWYXBZ')
+
+    def time_integer_encode(self, n_samples, length):
+        integer_encode(self.X)
+
+    def time_remove_duplicates(self, n_samples, length):
+        remove_duplicates(self.X_dup, verbose=0)
+
+    def time_remove_unnatural(self, n_samples, length):
+        remove_unnatural(self.X_unnat)
@@ -0,0 +1,80 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# dataset sizes and sequence lengths covered by the benchmarks
+N_SAMPLES = [10, 1000, 100000, 1000000]
+LENGTHS = [10, 100, 1000, 5000]
+
+# largest number of residues (n_samples*length) and output entries 
+# (n_samples*n_features) benchmarked per function call; larger combinations 
+# are skipped
+MAX_RESIDUES = 2*10**7
+MAX_ENTRIES = 2*10**8
+
+# keyword arguments of each function in protlearn.features, valid for all 
+# benchmarked lengths
+FEATURES = {
+    'aac': {},
+    'aaindex1': {},
+    'apaac': {'lambda_': 5},
+    'atc': {},
+    'binary': {},
+    'cksaap': {},
+    'ctd': {},
+    'ctdc': {},
+    'ctdd': {},
+    'ctdt': {},
+    'entropy': {},
+    'geary': {'d': 5},
+    'length': {},
+    'moran': {'d': 5},
+    'moreau_broto': {'d': 5},
+    'motif': {'pattern': 'N{P}[ST]{P}'},
+    'ngram': {'n': 2},
+    'paac': {'lambda_': 5},
+    'posrich': {'position': 5, 'aminoacid': 'A'},
+    'qso': {'d': 5},
+    'socn': {'d': 5},
+}
+
+# number of output columns of each function (for skipping oversized outputs)
+N_COLUMNS = {'aaindex1': 553, 'binary': lambda length: 20*length, 
+             'cksaap': 400, 'ctd': 343, 'ctdd': 195, 'ngram': 400}
+
+# functions implemented as per-sequence Python loops
+LOOPS = ['binary', 'ctd', 'motif', 'posrich']
+
+_cache = {}
+
+def sequences(n_samples, length, alphabet=AMINO_ACIDS, seed=0):
+    """Random amino acid sequences of equal length (cached)."""
+    key = (n_samples, length, alphabet, seed)
+    if key not in _cache:
+        rng = np.random.default_rng(seed)
+        letters = np.frombuffer(alphabet.encode(), dtype=np.uint8)
+        buf = letters[rng.integers(0, len(letters), size=n_samples*length)]
+        text = buf.tobytes().decode()
+        _cache[key] = [text[i*length:(i+1)*length] for i in range(n_samples)]
+    return _cache[key]
+
+def feature_matrix(n_samples, n_features, seed=0):
+    """Random non-negative feature matrix with binary labels."""
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, size=n_samples)
+    X = rng.random((n_samples, n_features))
+    X[:,:5] += y[:,None] # informative features
+    return X, y
+
+def skip_features(name, n_samples, length):
+    """Raise NotImplementedError (asv's skip signal) for combinations that 
+    exceed the benchmark budget."""
+    n_cols = N_COLUMNS.get(name, 20)
+    if callable(n_cols):
+        n_cols = n_cols(length)
+    max_residues = MAX_RESIDUES // 10 if name in LOOPS else MAX_RESIDUES
+    if n_samples*length > max_residues or n_samples*n_cols > MAX_ENTRIES:
+        raise NotImplementedError
@@ -0,0 +1,148 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+"""Empirical scaling of the functions in protlearn.features.
+
+Sweeps sequence length, dataset size, and (where applicable) the lag
+parameter one at a time, fits a power law t = c*x^k to the run times of each
+sweep, and writes a report with the fitted exponents and extrapolated run
+times, e.g. for a single titin-like sequence of 35,000 residues.
+
+Usage
+-----
+
+    python -m benchmarks.scaling                          # all functions
+    python -m benchmarks.scaling paac qso --out scaling   # selected functions
+
+Writes <out>.md and <out>.json.
+"""
+
+import sys
+import json
+import time
+import argparse
+import warnings
+import numpy as np
+from protlearn import features
+from .common import FEATURES, sequences
+
+# sweeps of each variable, with the other variables fixed
+LENGTHS = [100, 300, 1000, 3000, 10000]
+N_SAMPLES = [100, 1000, 10000, 100000]
+LAGS = [1, 3, 10, 30]
+FIXED = {'n_samples': 100, 'length': 1000}
+
+# lag parameter of each function
+LAG_PARAMS = {'apaac': 'lambda_', 'cksaap': 'k', 'geary': 'd', 'moran': 'd',
+              'moreau_broto': 'd', 'paac': 'lambda_', 'qso': 'd', 'socn': 'd'}
+
+# points the fitted curves are extrapolated to
+TARGETS = {'length': 35000, 'n_samples': 10**6, 'lag': 100}
+
+def measure(func, X, params, repeat=3):
+    """Best run time of func(X, **params) in seconds."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(X, **params)
+        times.append(time.perf_counter()-t0)
+    return min(times)
+
+def fit_power_law(x, t):
+    """Least-squares fit of log(t) = log(c) + k*log(x); returns (c, k)."""
+    k, log_c = np.polyfit(np.log(x), np.log(t), 1)
+    return np.exp(log_c), k
+
+def sweep(name, variable, values, max_seconds):
+    """Run times of function name along one variable. Larger values are
+    skipped once a single call exceeds max_seconds."""
+    func = getattr(features, name)
+    x, t = [], []
+    for value in values:
+        n_samples = value if variable == 'n_samples' else FIXED['n_samples']
+        length = value if variable == 'length' else FIXED['length']
+        params = dict(FEATURES[name])
+        if variable == 'lag':
+            params[LAG_PARAMS[name]] = value
+        X = sequences(n_samples, length)
+        func(X[:2], **params) # warm up (load data tables)
+        seconds = measure(func, X, params)
+        x.append(value)
+        t.append(seconds)
+        if seconds > max_seconds:
+            break
+    return x, t
+
+def scaling(names, max_seconds=10.):
+    """Sweep and fit all variables of the given functions.
+
+    Returns
+    -------
+
+    results : dict
+        For each function and variable, the measured points, the fitted
+        coefficient c and exponent k, and the extrapolated run time at
+        TARGETS.
+
+    """
+
+    results = {}
+    for name in names:
+        results[name] = {}
+        sweeps = {'length': LENGTHS, 'n_samples': N_SAMPLES}
+        if name in LAG_PARAMS:
+            sweeps['lag'] = LAGS
+        for variable, values in sweeps.items():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                x, t = sweep(name, variable, values, max_seconds)
+            res = {'x': x, 'seconds': t}
+            if len(x) > 1:
+                c, k = fit_power_law(x, t)
+                res.update(c=c, k=k, predicted=c*TARGETS[variable]**k)
+            results[name][variable] = res
+            print('%-14s %-10s %s' % (name, variable,
+                  ', '.join('%g: %.3gs' % p for p in zip(x, t))),
+                  file=sys.stderr)
+    return results
+
+def report(results):
+    """Markdown report of the fitted exponents and extrapolations."""
+    lines = ['# Scaling of protlearn.features', '',
+             'Run time t = c*x^k fitted per variable, with the other variables'
+             ' fixed at %s. Predictions extrapolate the fit to length=%d, '
+             'n_samples=%d, and lag=%d.' % (FIXED, TARGETS['length'],
+                                            TARGETS['n_samples'],
+                                            TARGETS['lag']), '',
+             '| function | k (length) | t (length=%d) | k (n_samples) | '
+             't (n_samples=%d) | k (lag) | t (lag=%d) |' % (
+                 TARGETS['length'], TARGETS['n_samples'], TARGETS['lag']),
+             '|---|---|---|---|---|---|---|']
+    for name, res in results.items():
+        cells = [name]
+        for variable in ['length', 'n_samples', 'lag']:
+            if 'k' in res.get(variable, {}):
+                cells += ['%.2f' % res[variable]['k'],
+                          '%.3g s' % res[variable]['predicted']]
+            else:
+                cells += ['-', '-']
+        lines.append('| ' + ' | '.join(cells) + ' |')
+    return '\n'.join(lines) + '\n'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('functions', nargs='*', default=sorted(FEATURES),
+                        help='feature functions to sweep (default: all)')
+    parser.add_argument('--out', default='scaling',
+                        help='path of the report without extension')
+    parser.add_argument('--max-seconds', type=float, default=10.,
+                        help='stop a sweep once a call exceeds this time')
+    args = parser.parse_args(argv)
+
+    results = scaling(args.functions, args.max_seconds)
+    with open(args.out+'.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    with open(args.out+'.md', 'w') as f:
+        f.write(report(results))
+
+if __name__ == '__main__':
+    main()
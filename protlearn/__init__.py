@@ -13,6 +13,20 @@ See https://protlearn.readthedocs.io/en/latest/ for complete documentation.
 
 __version__ = '2.1'
 
+from importlib import import_module
+from ._config import get_config, set_config, config_context
+from ._profiling import profile
+
 __all__ = ['preprocessing',
            'features',
-           'dimreduction']
\ No newline at end of file
+           'dimreduction',
+           'get_config',
+           'set_config',
+           'config_context',
+           'profile']
+
+def __getattr__(name):
+    # submodules are imported on first access, e.g. protlearn.features
+    if name in ['preprocessing', 'features', 'dimreduction']:
+        return import_module('.'+name, __name__)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
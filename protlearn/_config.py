@@ -0,0 +1,160 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_global_config = {
+    'n_jobs': 1,
+    'backend': 'processes',
+    'dedup': False,
+    'cache_dir': None,
+    'cache_size': 2**30,
+    'memo_size': 0,
+}
+
+# configuration of the current config_context, local to the thread (and 
+# asyncio task) that entered it; None outside any config_context
+_local_config = ContextVar('protlearn_config', default=None)
+
+def _current():
+    local = _local_config.get()
+    return _global_config if local is None else local
+
+def get_config():
+    """Retrieve the current protlearn configuration.
+
+    Returns
+    -------
+
+    config : dict
+        Keys are parameter names that can be passed to set_config.
+
+    """
+
+    return _current().copy()
+
+def set_config(*, n_jobs=None, backend=None, dedup=None, cache_dir=None,
+               cache_size=None, memo_size=None):
+    """Set global protlearn configuration.
+
+    Within a config_context, only the configuration of that context is 
+    changed.
+
+    Parameters
+    ----------
+
+    n_jobs : int or None, default=None
+        Number of workers used by the functions in protlearn.features to 
+        compute their per-sequence descriptors. 1 runs sequentially, -1 uses 
+        all available cores. If None, the current setting is left unchanged.
+
+    backend : string or None, default=None
+        'processes' : rows are sharded across worker processes that share the
+                      sequences and the output through shared memory
+        'threads' : rows are computed in chunks on a thread pool, which avoids
+                    process start-up costs and is most effective for the
+                    NumPy-based descriptors (e.g. aac, aaindex1, atc, moran)
+        If None, the current setting is left unchanged.
+
+    dedup : bool or None, default=None
+        If True, the functions in protlearn.features compute their descriptors
+        only once for each unique sequence and scatter the rows back to the
+        order of the input, which saves time on datasets with many repeated 
+        sequences. If None, the current setting is left unchanged.
+
+    cache_dir : string, False, or None, default=None
+        Directory of a persistent cache of feature rows. If set, the rows 
+        computed by the functions in protlearn.features are stored per 
+        sequence, keyed by the sequence digest, function, parameters, and 
+        protlearn version, and only sequences not seen before are computed.
+        False disables the cache. If None, the current setting is left 
+        unchanged.
+
+    cache_size : int or None, default=None
+        Maximum size of the persistent cache in bytes (default 1 GiB). The 
+        least recently used rows are evicted once it is exceeded. If None, 
+        the current setting is left unchanged.
+
+    memo_size : int or None, default=None
+        Maximum number of rows kept in an in-process, least recently used 
+        cache shared by all functions in protlearn.features (default 0, i.e.
+        disabled). Rows of sequences found in the cache are returned without
+        validating or computing them again; see utils.cache.memo_info for 
+        hit and miss counts. If None, the current setting is left unchanged.
+
+    Examples
+    --------
+
+    >>> import protlearn
+    >>> from protlearn.features import aac
+    >>> protlearn.set_config(n_jobs=-1)
+    >>> comp, aa = aac(seqs) # computed on all available cores
+
+    """
+
+    config = _current()
+    if n_jobs is not None:
+        if not isinstance(n_jobs, int) or n_jobs == 0:
+            raise ValueError('n_jobs must be a non-zero integer!')
+        config['n_jobs'] = n_jobs
+
+    if backend is not None:
+        valid = ['processes', 'threads']
+        if backend not in valid:
+            raise ValueError("backend must be one of %r." % valid)
+        config['backend'] = backend
+
+    if dedup is not None:
+        if not isinstance(dedup, bool):
+            raise ValueError('dedup must be a boolean!')
+        config['dedup'] = dedup
+
+    if cache_dir is not None:
+        config['cache_dir'] = cache_dir or None
+
+    if cache_size is not None:
+        if not isinstance(cache_size, int) or cache_size <= 0:
+            raise ValueError('cache_size must be a positive integer!')
+        config['cache_size'] = cache_size
+
+    if memo_size is not None:
+        if not isinstance(memo_size, int) or memo_size < 0:
+            raise ValueError('memo_size must be a non-negative integer!')
+        config['memo_size'] = memo_size
+
+@contextmanager
+def config_context(**new_config):
+    """Context manager for temporarily changing the global configuration.
+
+    The changed configuration only applies to the thread (or asyncio task) 
+    that entered the context, so concurrent threads keep their own settings.
+
+    Parameters
+    ----------
+
+    **new_config
+        Any parameter accepted by set_config.
+
+    Examples
+    --------
+
+    >>> import protlearn
+    >>> from protlearn.features import paac
+    >>> with protlearn.config_context(n_jobs=8):
+    ...     comp, desc = paac(seqs, lambda_=10)
+
+    """
+
+    token = _local_config.set(get_config())
+    try:
+        set_config(**new_config)
+        yield
+    finally:
+        _local_config.reset(token)
+
+def effective_n_jobs(n_jobs):
+    """Resolve negative n_jobs values to a number of worker processes."""
+    if n_jobs < 0:
+        n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
@@ -0,0 +1,161 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+from time import perf_counter
+from functools import wraps
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# stages of a function call
+STAGES = ['parsing', 'validation', 'loading', 'compute', 'assembly']
+
+# profile collecting the timings of the current context
+_current = ContextVar('protlearn_profile', default=None)
+
+class Profile:
+    """Timings collected by profile.
+
+    Attributes
+    ----------
+
+    stats : dict
+        For each profiled function, the number of calls, the number of
+        sequences and bytes processed, and the time spent in each stage (and
+        in total) in seconds, summed over all calls. Times are exclusive, i.e.
+        the time of a stage does not include nested stages or nested function
+        calls.
+
+    records : list of dicts
+        The same information for each single call, in the order in which the
+        calls completed.
+
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stats = {}
+        self.records = []
+        self._stack = []
+
+    def _add(self, record):
+        self.records.append(record)
+        stats = self.stats.setdefault(record['function'], {
+            'calls': 0, 'n_sequences': 0, 'n_bytes': 0,
+            'seconds': dict.fromkeys(STAGES+['total'], 0.)})
+        stats['calls'] += 1
+        stats['n_sequences'] += record['n_sequences']
+        stats['n_bytes'] += record['n_bytes']
+        for key, seconds in record['seconds'].items():
+            stats['seconds'][key] += seconds
+        if self.callback is not None:
+            self.callback(record)
+
+    def _frame(self):
+        """Innermost function call."""
+        for entry in reversed(self._stack):
+            if 'function' in entry:
+                return entry
+
+@contextmanager
+def profile(callback=None):
+    """Context manager for profiling protlearn functions.
+
+    Within the context, each call of a function in protlearn.features or
+    protlearn.preprocessing records the time spent on parsing the input,
+    validating the sequences, loading data tables, computing the descriptors,
+    and assembling the output, as well as the number of sequences and bytes
+    processed.
+
+    Parameters
+    ----------
+
+    callback : callable, default=None
+        Called with the record of each completed function call, a dict with
+        keys 'function', 'n_sequences', 'n_bytes', and 'seconds' (time per
+        stage and in total).
+
+    Yields
+    ------
+
+    prof : Profile
+        Collected timings, available as prof.stats and prof.records.
+
+    Examples
+    --------
+
+    >>> import protlearn
+    >>> from protlearn.features import aac, paac
+    >>> with protlearn.profile() as prof:
+    ...     comp, aa = aac(seqs)
+    ...     comp, desc = paac(seqs, lambda_=5)
+    >>> prof.stats['paac']['seconds']
+    {'parsing': 1.2e-06, 'validation': 0.0011, 'loading': 0.0019,
+     'compute': 0.0009, 'assembly': 2.8e-05, 'total': 0.0039}
+
+    """
+
+    prof = Profile(callback)
+    token = _current.set(prof)
+    try:
+        yield prof
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def stage(name):
+    """Attribute the time spent within the context to a stage of the current
+    function call (no-op unless profiling)."""
+    prof = _current.get()
+    if prof is None or prof._frame() is None:
+        yield
+        return
+
+    entry = {'stage': name, 'child': 0.}
+    prof._stack.append(entry)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        prof._stack.pop()
+        prof._stack[-1]['child'] += elapsed
+        prof._frame()['seconds'][name] += elapsed - entry['child']
+
+def record_input(X):
+    """Record the number of sequences and bytes of the parsed input of the
+    current function call."""
+    prof = _current.get()
+    if prof is None:
+        return
+    frame = prof._frame()
+    if frame is not None and not frame['n_sequences']:
+        frame['n_sequences'] = len(X)
+        frame['n_bytes'] = sum(len(seq) for seq in X)
+
+def profiled(func):
+    """Decorator recording the calls of a public function in the current
+    profile."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        prof = _current.get()
+        if prof is None:
+            return func(*args, **kwargs)
+
+        frame = {'function': func.__qualname__, 'n_sequences': 0,
+                 'n_bytes': 0, 'seconds': dict.fromkeys(STAGES, 0.),
+                 'child': 0.}
+        prof._stack.append(frame)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            prof._stack.pop()
+            if prof._stack:
+                prof._stack[-1]['child'] += elapsed
+
+            # time not spent in any stage or nested call
+            frame['seconds']['assembly'] += elapsed - frame.pop('child')
+            frame['seconds']['total'] = elapsed
+            prof._add(frame)
+
+    return wrapper
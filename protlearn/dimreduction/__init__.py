@@ -6,6 +6,8 @@ from .tree_importance import tree_importance
 from .univariate_filter import univariate_filter
 from .lasso import lasso
 from .sequential import sequential
+from .variance import variance
+from .transformers import ColumnSelector, Projection
 
 __all__ = ['correlation',
            'pca',
@@ -14,4 +16,7 @@ __all__ = ['correlation',
            'tree_importance',
            'univariate_filter',
            'lasso',
-           'sequential']
\ No newline at end of file
+           'sequential',
+           'variance',
+           'ColumnSelector',
+           'Projection']
\ No newline at end of file
@@ -0,0 +1,64 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from scipy import sparse
+
+def column_moments(X, block_size=1024):
+    """Mean and (population) variance of each column of a dense or sparse
+    matrix, computed without densifying or copying X as a whole."""
+    n_samples, n_features = X.shape
+    if sparse.issparse(X):
+        X = sparse.csc_matrix(X)
+        mean = np.asarray(X.sum(axis=0), dtype=np.float64).ravel() / n_samples
+        sq = np.asarray(X.multiply(X).sum(axis=0),
+                        dtype=np.float64).ravel() / n_samples
+        return mean, np.maximum(sq - mean**2, 0)
+
+    mean = np.empty((n_features,))
+    var = np.empty((n_features,))
+    for start in range(0, n_features, block_size):
+        block = np.asarray(X[:,start:start+block_size], dtype=np.float64)
+        mean[start:start+block_size] = block.mean(axis=0)
+        var[start:start+block_size] = block.var(axis=0)
+    return mean, var
+
+def class_statistics(X, y, chunk_size=10000):
+    """Per-class sums, and overall sums of squares, minima and maxima of the
+    columns of a dense, sparse, or memory-mapped matrix, accumulated over 
+    chunks of rows.
+
+    Returns the number of samples per class (n_classes,), the class sums 
+    (n_classes, n_features), and the sums of squares, minima, and maxima 
+    (n_features,) each."""
+    classes, y = np.unique(np.asarray(y), return_inverse=True)
+    n_classes = len(classes)
+    n_samples, n_features = X.shape
+    is_sparse = sparse.issparse(X)
+    if is_sparse:
+        X = sparse.csr_matrix(X)
+    
+    sums = np.zeros((n_classes, n_features))
+    sq = np.zeros((n_features,))
+    low = np.full((n_features,), np.inf)
+    high = np.full((n_features,), -np.inf)
+    for start in range(0, n_samples, chunk_size):
+        chunk = X[start:start+chunk_size]
+        labels = y[start:start+chunk_size]
+        indicator = sparse.csr_matrix(
+            (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+            shape=(n_classes, len(labels)))
+        if is_sparse:
+            chunk = chunk.astype(np.float64)
+            sq += np.asarray(chunk.multiply(chunk).sum(axis=0)).ravel()
+            low = np.minimum(low, chunk.min(axis=0).toarray().ravel())
+            high = np.maximum(high, chunk.max(axis=0).toarray().ravel())
+            sums += (indicator @ chunk).toarray()
+        else:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            sq += np.einsum('ij,ij->j', chunk, chunk)
+            low = np.minimum(low, chunk.min(axis=0))
+            high = np.maximum(high, chunk.max(axis=0))
+            sums += indicator @ chunk
+    
+    counts = np.bincount(y, minlength=n_classes)
+    return counts, sums, sq, low, high
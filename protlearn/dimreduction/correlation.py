@@ -1,31 +1,59 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
+from scipy import sparse
+from ._stats import column_moments
+from .transformers import ColumnSelector
 
-def correlation(X, thres=.9):
+def correlation(X, thres=.9, *, block_size=1024, dtype=np.float64, 
+                return_transformer=False):
     """Pearson correlation.
 
     This function returns the features whose Pearson correlation with one 
     another is below a specified threshold, thus circumventing the problem of 
-    multicollinearity.
+    multicollinearity. A feature is removed if its correlation with any 
+    preceding feature exceeds the threshold.
+
+    The correlation matrix is never formed as a whole: the features are 
+    standardized once, and correlations are computed in tiles of block_size
+    columns, skipping features that have already been removed. Apart from
+    the standardized copy of X, memory use is thus of order 
+    n_features*block_size rather than n_features**2. Sparse input is never
+    densified; correlations are then derived from sparse dot products and the
+    column means.
     
     Parameters
     ----------
 
-    X : ndarray of shape (n_samples, n_features_pre) 
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre) 
         Feature matrix.
 
     thres : float, default=.9
         Features whose correlation coefficient is higher than this threshold 
         value will be removed.
 
+    block_size : int, default=1024
+        Number of features per tile.
+
+    dtype : data-type, default=np.float64
+        Precision of the standardized features and correlations; np.float32 
+        halves memory use and time at the expense of accuracy close to the 
+        threshold.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
+
     Returns
     -------
 
-    arr :  ndarray of shape (n_samples, n_features_post)
+    arr :  ndarray or sparse matrix of shape (n_samples, n_features_post)
         Array containing features that correlate below the threshold with one 
         another.
 
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
     Examples
     --------
 
@@ -45,11 +73,67 @@ def correlation(X, thres=.9):
 
     """
 
-    # remove correlated features
-    corr = np.absolute(np.corrcoef(X, rowvar=False))
-    upper = corr*np.triu(np.ones(corr.shape), k=1).astype(np.bool)
-    to_drop = [column for column in range(upper.shape[1]) \
-               if any(upper[:,column] > thres)]
-    arr = np.delete(X, to_drop, axis=1)
+    if block_size < 1:
+        raise ValueError('block_size must be a positive integer!')
+    if sparse.issparse(X):
+        if X.format not in ['csr', 'csc']:
+            X = X.tocsr()
+        tile = _sparse_tiles(X, dtype)
+    else:
+        X = np.asarray(X)
+        tile = _dense_tiles(X, block_size, dtype)
+    n_features = X.shape[1]
+
+    # remove features correlating with any preceding feature, tile by tile
+    to_drop = np.zeros((n_features,), dtype=bool)
+    for start in range(0, n_features, block_size):
+        stop = min(start+block_size, n_features)
+        for i in range(0, stop, block_size):
+            targets = np.arange(start, stop)[~to_drop[start:stop]]
+            if not len(targets):
+                break
+            sources = np.arange(i, min(i+block_size, n_features))
+            corr = np.absolute(tile(sources, targets))
+            
+            # pairs within the diagonal tile count only once
+            if i == start:
+                corr[sources[:,None] >= targets[None,:]] = 0
+            to_drop[targets[(corr > thres).any(axis=0)]] = True
+
+    arr = X[:,~to_drop]
+
+    if return_transformer:
+        return arr, ColumnSelector(np.flatnonzero(~to_drop), n_features)
     
-    return arr
\ No newline at end of file
+    return arr
+
+def _dense_tiles(X, block_size, dtype):
+    """Standardize the features once and return a function computing the 
+    correlations between two sets of features."""
+    n_samples, n_features = X.shape
+    mean, var = column_moments(X, block_size)
+
+    # constant features are NaN and thus correlate with nothing
+    std = np.where(var > 0, np.sqrt(var), np.nan)
+    Z = np.empty((n_samples, n_features), dtype=dtype)
+    for start in range(0, n_features, block_size):
+        cols = slice(start, start+block_size)
+        Z[:,cols] = (np.asarray(X[:,cols], dtype=np.float64) - mean[cols]) \
+                    / std[cols]
+
+    return lambda sources, targets: Z[:,sources].T @ Z[:,targets] / n_samples
+
+def _sparse_tiles(X, dtype):
+    """Return a function computing the correlations between two sets of 
+    features of a sparse matrix from its sparse dot products."""
+    n_samples = X.shape[0]
+    mean, var = column_moments(X)
+    std = np.where(var > 0, np.sqrt(var), np.nan)
+    X = X.tocsc().astype(dtype)
+
+    def tile(sources, targets):
+        dot = (X[:,sources].T @ X[:,targets]).toarray() / n_samples
+        cov = dot - np.outer(mean[sources], mean[targets])
+        return cov / np.outer(std[sources], std[targets])
+
+    return tile
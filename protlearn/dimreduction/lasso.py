@@ -1,17 +1,22 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
+from scipy import sparse
 from sklearn.feature_selection import SelectFromModel
 from sklearn.linear_model import LogisticRegression
+from .transformers import ColumnSelector
 
-def lasso(X, y, C=1.0):
+def lasso(X, y, C=1.0, *, solver='liblinear', random_state=None,
+          return_transformer=False):
     """Lasso (L1) regularization.
     
-    Linear Model trained with L1 prior as regularizer. 
+    Linear Model trained with L1 prior as regularizer. Both solvers work on
+    sparse matrices directly, so that sparse input (e.g. from ngram) is never
+    densified and the output remains sparse.
 
     Parameters
     ----------
     
-    X : ndarray of shape (n_samples, n_features_pre)
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre)
         Feature matrix.
     
     y : ndarray of shape (n_samples,)
@@ -19,13 +24,27 @@ def lasso(X, y, C=1.0):
     
     C : float, default=1.0
         Inverse of regularization strength.
-        
+
+    solver : string, default='liblinear'
+        'liblinear' : coordinate descent, suited for small to medium datasets
+        'saga' : stochastic average gradient, faster for many samples
+
+    random_state : int or None, default=None
+        Seed used by the solver to shuffle the data.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
+
     Returns
     -------
     
-    arr : ndarray of shape (n_samples, n_features_post)
+    arr : ndarray or sparse matrix of shape (n_samples, n_features_post)
         Array containing lasso-reduced features.
 
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
     Examples
     --------
 
@@ -46,9 +65,15 @@ def lasso(X, y, C=1.0):
     
     """  
     
+    if sparse.issparse(X) and X.format not in ['csr', 'csc']:
+        X = X.tocsr()
     mdl = SelectFromModel(LogisticRegression(C=C, 
                                              penalty='l1', 
-                                             solver='liblinear'))
+                                             solver=solver,
+                                             random_state=random_state))
     arr = mdl.fit_transform(X, y)
+
+    if return_transformer:
+        return arr, ColumnSelector(mdl.get_support(indices=True), X.shape[1])
         
     return arr
\ No newline at end of file
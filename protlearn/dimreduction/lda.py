@@ -1,17 +1,29 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
+import numpy as np
+from scipy import linalg, sparse
+from sklearn.covariance import shrunk_covariance
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from .transformers import Projection
 
-def lda(X, y, *, solver='svd', shrinkage=None, n_components=None):
+def lda(X, y, *, solver='svd', shrinkage=None, n_components=None,
+        return_transformer=False):
     """Linear discriminant analysis.
 
     This function reduces the dimensionality of the input by projecting it to 
     the most discriminative directions.
+
+    Sparse input is never densified: the class means and scatter matrices are
+    computed from sparse products, and the projection is obtained as with the
+    'eigen' solver. The scatter matrices are dense, however, so that memory 
+    use is about 3*8*n_features**2 bytes regardless of the number of samples
+    (about 2 GB for 10,000 features). Wide feature sets such as tetrapeptide
+    counts should therefore be reduced first, e.g. with univariate_filter.
     
     Parameters
     ----------
 
-    X : ndarray of shape (n_samples, n_features_pre) 
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre) 
         Feature matrix. 
     
     y : ndarray of shape (n_samples,)
@@ -21,23 +33,32 @@ def lda(X, y, *, solver='svd', shrinkage=None, n_components=None):
         'svd' : Singular value decomposition
         'lsqr' : Least squares solution
         'eigen' : Eigenvalue decomposition
+        Sparse input is always handled by the eigenvalue decomposition.
         
     shrinkage : string, float, or None, default=None
         Shrinkage parameter.
         None : no shrinkage
-        'auto' : automatic shrinkage using the Ledoit-Wolf lemma
+        'auto' : automatic shrinkage using the Ledoit-Wolf lemma (dense input
+                 only)
         float between 0 and 1: fixed shrinkage parameter
         
     n_components : int or None, default=None
         Number of components for dimensionality reduction. This parameter 
         cannot be larger than min(n_features, n_classes - 1).
 
+    return_transformer : bool, default=False
+        If True, the fitted projection is returned as well.
+
     Returns
     -------
 
     arr :  ndarray of shape (n_samples, n_features_post)
         Array containing the LDA-transformed features.
 
+    proj : Projection
+        Fitted projection, which transforms new data without refitting. Only
+        returned if return_transformer is True.
+
     Examples
     --------
 
@@ -58,9 +79,65 @@ def lda(X, y, *, solver='svd', shrinkage=None, n_components=None):
     
     """
     
+    if sparse.issparse(X):
+        proj = _sparse_eigen(X, y, shrinkage, n_components)
+        arr = proj.transform(X)
+        if return_transformer:
+            return arr, proj
+        return arr
+
     mdl = LinearDiscriminantAnalysis(solver=solver, 
                                      shrinkage=shrinkage,
                                      n_components=n_components)
     arr = mdl.fit_transform(X, y)
+
+    if return_transformer:
+        # sklearn only centers the data for the svd solver
+        k = arr.shape[1]
+        proj = Projection(mdl.scalings_[:,:k].T, 
+                          mdl.xbar_ if solver == 'svd' else None)
+        return arr, proj
     
-    return arr
\ No newline at end of file
+    return arr
+
+def _sparse_eigen(X, y, shrinkage, n_components):
+    """Projection of the eigenvalue solver of LinearDiscriminantAnalysis,
+    computed from the scatter matrices of a sparse matrix."""
+    if isinstance(shrinkage, str):
+        raise ValueError("shrinkage='auto' is not supported for sparse input!")
+    classes, y = np.unique(np.asarray(y), return_inverse=True)
+    n_samples, n_features = X.shape
+    max_components = min(len(classes)-1, n_features)
+    if n_components is None:
+        n_components = max_components
+    elif n_components > max_components:
+        raise ValueError('n_components cannot be larger than '
+                         'min(n_features, n_classes - 1).')
+    X = sparse.csr_matrix(X, dtype=np.float64)
+
+    def cov(X):
+        # (shrunk) empirical covariance, densifying only the gram matrix
+        mean = np.asarray(X.mean(axis=0)).ravel()
+        s = (X.T @ X).toarray() / X.shape[0] - np.outer(mean, mean)
+        return s if shrinkage is None else shrunk_covariance(s, shrinkage)
+
+    # within-class and between-class scatter
+    Sw = np.zeros((n_features, n_features))
+    for c in range(len(classes)):
+        members = y == c
+        Sw += members.mean() * cov(X[members])
+    Sb = cov(X) - Sw
+
+    try:
+        evals, evecs = linalg.eigh(Sb, Sw)
+    except linalg.LinAlgError:
+        # singular within-class scatter (e.g. all-zero columns): solve in the
+        # range of Sw, discarding directions without within-class variance
+        evals_w, evecs_w = linalg.eigh(Sw)
+        rank = evals_w > evals_w.max() * 1e-8
+        W = evecs_w[:,rank] / np.sqrt(evals_w[rank])
+        evals, evecs = linalg.eigh(W.T @ Sb @ W)
+        evecs = W @ evecs
+        n_components = min(n_components, evecs.shape[1])
+    evecs = evecs[:,np.argsort(evals)[::-1]]
+    return Projection(evecs[:,:n_components].T)
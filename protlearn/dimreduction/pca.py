@@ -2,9 +2,11 @@
 
 import warnings
 import numpy as np
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
+from .transformers import Projection
 
-def pca(X, *, thres=.9, whiten=False):
+def pca(X, *, thres=.9, whiten=False, method='full', batch_size=None, 
+        random_state=None, return_transformer=False):
     """Principal component analysis.
 
     PCA is defined as an orthogonal linear transformation that transforms the 
@@ -12,22 +14,54 @@ def pca(X, *, thres=.9, whiten=False):
     scalar projection of the data comes to lie on the first coordinate (called 
     the first principal component), the second greatest variance on the second 
     coordinate, and so on.
+
+    Besides the exact decomposition, two modes for large datasets are 
+    available: 'incremental' fits the decomposition over chunks of rows, which
+    allows fitting data that does not fit into memory (e.g. a memory-mapped
+    .npy file), and 'randomized' only computes as many components as are 
+    needed to reach thres.
     
     Parameters
     ----------
 
-    X : ndarray of shape (n_samples, n_features_pre)
-        Feature matrix. 
+    X : ndarray of shape (n_samples, n_features_pre) or string
+        Feature matrix, or the path of a .npy file containing it, which is 
+        memory-mapped rather than loaded.
 
     thres : float, default=.9
         Specify the desired explained variance.
 
+    whiten : bool, default=False
+        If True, the components are scaled to unit variance.
+
+    method : string, default='full'
+        'full' : exact decomposition of X
+        'incremental' : incremental decomposition over chunks of batch_size
+                        rows
+        'randomized' : randomized decomposition into the leading components, 
+                       whose number is doubled until thres is reached
+
+    batch_size : int, default=None
+        Number of rows processed at a time by the incremental fit and by the 
+        transformation. If None, the incremental fit uses 5*n_features rows 
+        per chunk and X is transformed at once.
+
+    random_state : int, default=None
+        Seed of the randomized decomposition.
+
+    return_transformer : bool, default=False
+        If True, the fitted projection is returned as well.
+
     Returns
     -------
 
     arr :  ndarray of shape (n_samples, n_features_post)
         Array containing the PCA components comprising the specified variance.
 
+    proj : Projection
+        Fitted projection onto the selected components, which transforms new 
+        data without refitting. Only returned if return_transformer is True.
+
     Notes
     -----
 
@@ -42,23 +76,77 @@ def pca(X, *, thres=.9, whiten=False):
     (1000, 575)
     >>> reduced = pca(features, thres=.9)
     (1000, 32)
+    >>> reduced, proj = pca('features.npy', method='incremental', 
+    ...                     batch_size=10000, return_transformer=True)
+    >>> reduced_new = proj.transform(features_new)
 
     """
 
+    # input handling
+    if isinstance(X, str):
+        X = np.load(X, mmap_mode='r')
+    n_samples, n_features = X.shape
+
     # check input dimensionality
-    if X.shape[0] < X.shape[1]:
+    if n_samples < n_features:
         warnings.warn("The number of samples (%i) is less than the number of "
                       "features (%i). Therefore, the PCA output may not be "
-                      "meaningful." % (X.shape[0], X.shape[1]))
+                      "meaningful." % (n_samples, n_features))
     
-    # fit and transform PCA
-    pca = PCA(whiten=whiten).fit(X)
-    var = pca.explained_variance_ratio_[0]
-    comp = 1
-    while var <= thres:
-        var += pca.explained_variance_ratio_[comp]
-        comp += 1
-    
-    arr = pca.transform(X)
+    # fit PCA
+    if method == 'full':
+        model = PCA(whiten=whiten).fit(X)
+    elif method == 'incremental':
+        model = _incremental(X, whiten, batch_size)
+    elif method == 'randomized':
+        model = _randomized(X, thres, whiten, random_state)
+    else:
+        raise ValueError("Method must be 'full', 'incremental', or "
+                         "'randomized'!")
+
+    # smallest number of components explaining more than thres
+    cumulative = np.cumsum(model.explained_variance_ratio_)
+    comp = min(np.searchsorted(cumulative, thres, side='right')+1, 
+               len(cumulative))
+
+    # transform 
+    scale = None
+    if whiten:
+        scale = np.sqrt(model.explained_variance_[:comp])
+        scale = np.maximum(scale, np.finfo(scale.dtype).eps)
+    proj = Projection(model.components_[:comp], model.mean_, scale)
+    arr = proj.transform(X, batch_size)
     
-    return arr[:,:comp]
\ No newline at end of file
+    if return_transformer:
+        return arr, proj
+
+    return arr
+
+def _incremental(X, whiten, batch_size):
+    """Fit an IncrementalPCA chunk by chunk."""
+    from sklearn.utils import gen_batches
+
+    n_samples, n_features = X.shape
+    if batch_size is None:
+        batch_size = 5*n_features
+    n_components = min(n_samples, n_features, batch_size)
+    model = IncrementalPCA(n_components=n_components, whiten=whiten)
+    for rows in gen_batches(n_samples, batch_size, 
+                            min_batch_size=n_components):
+        model.partial_fit(np.asarray(X[rows]))
+
+    return model
+
+def _randomized(X, thres, whiten, random_state):
+    """Fit a randomized PCA, doubling the number of components until they 
+    explain more than thres."""
+    max_components = min(X.shape)
+    n_components = min(16, max_components)
+    while True:
+        model = PCA(n_components=n_components, whiten=whiten, 
+                    svd_solver='randomized', 
+                    random_state=random_state).fit(X)
+        if model.explained_variance_ratio_.sum() > thres \
+                or n_components == max_components:
+            return model
+        n_components = min(2*n_components, max_components)
@@ -1,8 +1,13 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-from sklearn.feature_selection import RFE
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+from .transformers import ColumnSelector
+from .univariate_filter import univariate_filter
 
-def rfe(X, y, *, estimator, n_features=None, step=1):
+def rfe(X, y, *, estimator, n_features=None, step=1, warm_start=False, 
+        prescreen=None, return_transformer=False):
     """Recursive feature elimination.
 
     This function selects features by recursively considering smaller and 
@@ -12,12 +17,18 @@ def rfe(X, y, *, estimator, n_features=None, step=1):
     important features are pruned from the current feature subset. This is 
     repeated recursively on the pruned subset until the desired number of 
     features is eventually reached.
+
+    On wide feature matrices, the number of refits can be reduced with an
+    adaptive step (step='auto'), which removes many features while far from
+    the target and fewer as it approaches it, and by prescreening the 
+    features with a univariate filter.
     
     Parameters
     ----------
 
-    X : ndarray of shape (n_samples, n_features_pre) 
-        Feature matrix.
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre) 
+        Feature matrix. Sparse input is passed on to the estimator without
+        densification.
 
     y : labels, ndarray of shape (n_samples,)
         Response variables.
@@ -28,18 +39,40 @@ def rfe(X, y, *, estimator, n_features=None, step=1):
     n_features : int or None, default=None
         Number of features to select. If None, half of the features are selected.
         
-    step : int, default=1
-        Number of features to remove at each iteration.
+    step : int, float, or 'auto', default=1
+        int : Number of features to remove at each iteration.
+        float : Fraction (between 0 and 1) of the initial features to remove
+                at each iteration.
+        'auto' : Half of the features in excess of n_features are removed at
+                 each iteration.
+
+    warm_start : bool, default=False
+        If True and the estimator supports warm starts (e.g. 
+        LogisticRegression, SGDClassifier), each iteration starts from the 
+        coefficients of the previous one, restricted to the remaining 
+        features.
+
+    prescreen : int or None, default=None
+        If given, only the top features according to univariate_filter 
+        (ANOVA f-scores) are subjected to the elimination. The features 
+        screened out share the last rank.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
 
     Returns
     -------
 
-    arr :  ndarray of shape (n_samples, n_features)
+    arr :  ndarray or sparse matrix of shape (n_samples, n_features)
         Array containing the RFE-selected features.
     
     ranking : ndarray of shape (n_features_pre,)
         Ranking of the features (with 1 being the best).
 
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
     Examples
     --------
 
@@ -62,8 +95,80 @@ def rfe(X, y, *, estimator, n_features=None, step=1):
     
     """
     
-    selector = RFE(estimator, n_features_to_select=n_features, step=step)
-    selector = selector.fit(X, y)
-    arr = selector.transform(X)
+    if sparse.issparse(X) and X.format not in ['csr', 'csc']:
+        X = X.tocsr()
+    n_features_pre = X.shape[1]
+    if prescreen is not None and prescreen < n_features_pre:
+        _, screen = univariate_filter(X, y, top=prescreen, 
+                                      return_transformer=True)
+        candidates = screen.indices
+    else:
+        candidates = np.arange(n_features_pre)
+    
+    # number of features to select and to remove per iteration
+    n_candidates = len(candidates)
+    if n_features is None:
+        n_features = n_candidates // 2
+    elif 0 < n_features < 1:
+        n_features = int(n_features * n_candidates)
+    elif n_features > n_candidates:
+        n_features = n_candidates
+    if step == 'auto':
+        schedule = lambda n_remaining: max(1, (n_remaining-n_features) // 2)
+    elif 0 < step < 1:
+        schedule = lambda n_remaining: max(1, int(step * n_candidates))
+    elif step >= 1:
+        schedule = lambda n_remaining: int(step)
+    else:
+        raise ValueError("step must be a positive number or 'auto'!")
     
-    return arr, selector.ranking_
\ No newline at end of file
+    # only coefficients are carried over, as warm-started ensembles would
+    # add trees instead of refitting
+    warm_start = warm_start and 'warm_start' in estimator.get_params()
+
+    # eliminate the least important features of the current subset
+    support = np.ones((n_candidates,), dtype=bool)
+    ranking = np.ones((n_candidates,), dtype=int)
+    coef = None
+    while support.sum() > n_features:
+        features = np.flatnonzero(support)
+        if coef is None:
+            est = clone(estimator)
+        else:
+            est.coef_ = coef[...,support[kept]]
+        est.fit(X[:,candidates[features]], y)
+        
+        importances = _importances(est)
+        ranks = np.argsort(importances)
+        threshold = min(schedule(len(features)), len(features) - n_features)
+        kept = support.copy()
+        support[features[ranks][:threshold]] = False
+        ranking[~support] += 1
+        if warm_start and hasattr(est, 'coef_'):
+            est.set_params(warm_start=True)
+            coef = est.coef_
+
+    # features screened out rank behind all candidates
+    selected = candidates[support]
+    full_ranking = np.full((n_features_pre,), ranking.max()+1)
+    full_ranking[candidates] = ranking
+    arr = X[:,selected]
+
+    if return_transformer:
+        return arr, full_ranking, ColumnSelector(selected, n_features_pre)
+    
+    return arr, full_ranking
+
+def _importances(estimator):
+    """Feature importances from the coef_ or feature_importances_ attribute
+    of a fitted estimator."""
+    if hasattr(estimator, 'coef_'):
+        coef = np.asarray(estimator.coef_)
+        # squared weights summed over classes, as in sklearn's RFE
+        if coef.ndim == 1:
+            return coef**2
+        return (coef**2).sum(axis=0)
+    if hasattr(estimator, 'feature_importances_'):
+        return np.asarray(estimator.feature_importances_)
+    raise ValueError('The estimator must have a coef_ or '
+                     'feature_importances_ attribute!')
@@ -1,15 +1,28 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-from mlxtend.feature_selection import SequentialFeatureSelector
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import cross_val_score
+from .transformers import ColumnSelector
+from .._config import get_config, effective_n_jobs
 
-def sequential(X, y, *, estimator, direction='forward', n_features=10, cv=0):
+def sequential(X, y, *, estimator, direction='forward', n_features=10, cv=0,
+               scoring='accuracy', floating=False, n_jobs=None, 
+               return_transformer=False):
     """Sequential feature selection.
 
     Sequential feature selection algorithms are a family of greedy search 
     algorithms that are used to reduce an initial d-dimensional feature space 
     to a k-dimensional feature subspace where k < d. These algorithms remove or 
     add one feature at a time based on the classifier performance until a 
-    feature subset of the desired size k is reached.
+    feature subset of the desired size k is reached. With floating=True, each
+    step is followed by conditional steps in the opposite direction as long 
+    as they improve on the best subset of that size found so far.
+
+    The candidate subsets of a step are scored in parallel, and the score of
+    each subset is cached, so that subsets revisited by the floating steps 
+    are not scored again.
     
     Parameters
     ----------
@@ -30,7 +43,21 @@ def sequential(X, y, *, estimator, direction='forward', n_features=10, cv=0):
         Number of features to select.
         
     cv : int, default=0
-        Number of cross-validation steps.
+        Number of cross-validation folds. If 0, subsets are scored on the 
+        training data.
+
+    scoring : string or callable, default='accuracy'
+        Scoring metric, see sklearn.metrics.get_scorer.
+
+    floating : bool, default=False
+        If True, sequential floating selection is performed.
+
+    n_jobs : int or None, default=None
+        Number of candidate subsets scored in parallel (-1 for all CPUs). If
+        None, the n_jobs and backend of protlearn.set_config are used.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
 
     Returns
     -------
@@ -38,6 +65,10 @@ def sequential(X, y, *, estimator, direction='forward', n_features=10, cv=0):
     arr :  ndarray of shape (n_samples, n_features)
         Array containing features selected by the sequential models.
 
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
     Examples
     --------
 
@@ -60,19 +91,77 @@ def sequential(X, y, *, estimator, direction='forward', n_features=10, cv=0):
     
     """
 
-    if direction == 'forward':
-        method = True
-    elif direction == 'backward':
-        method = False
+    if direction not in ['forward', 'backward']:
+        raise ValueError("direction must be 'forward' or 'backward'!")
+    n_features_pre = X.shape[1]
+    if not 0 < n_features <= n_features_pre:
+        raise ValueError('n_features must be between 1 and the number of '
+                         'features!')
+
+    config = get_config()
+    n_jobs = effective_n_jobs(config['n_jobs'] if n_jobs is None else n_jobs)
+    scorer = get_scorer(scoring)
+    scores = {}
+
+    def best(subsets):
+        """Best of the given subsets, scoring those not yet cached."""
+        new = [s for s in dict.fromkeys(subsets) if s not in scores]
+        if n_jobs == 1 or len(new) < 2:
+            results = [_score(estimator, X, y, s, scorer, cv) for s in new]
+        else:
+            from joblib import Parallel, delayed
+            prefer = 'threads' if config['backend'] == 'threads' else None
+            results = Parallel(n_jobs=n_jobs, prefer=prefer)(
+                delayed(_score)(estimator, X, y, s, scorer, cv) for s in new)
+        scores.update(zip(new, results))
+        return max(subsets, key=scores.get)
+
+    def add(subset, exclude=()):
+        return best([tuple(sorted(subset + (f,))) 
+                     for f in range(n_features_pre) 
+                     if f not in subset and f not in exclude])
     
-    mdl = SequentialFeatureSelector(estimator,
-                                    k_features=n_features,
-                                    forward=method,
-                                    floating=False,
-                                    verbose=0,
-                                    scoring='accuracy',
-                                    cv=cv)
-
-    arr = mdl.fit_transform(X, y)
+    def remove(subset, exclude=()):
+        return best([tuple(f for f in subset if f != g) 
+                     for g in reversed(subset) if g not in exclude])
+
+    if direction == 'forward':
+        step, back, subset = add, remove, ()
+        done = lambda subset: len(subset) >= n_features
+        can_float = lambda subset: len(subset) > 2
+    else:
+        step, back, subset = remove, add, tuple(range(n_features_pre))
+        done = lambda subset: len(subset) <= n_features
+        can_float = lambda subset: len(subset) < n_features_pre - 2
+        
+    # best subset of each size
+    records = {len(subset): subset}
+    while not done(subset):
+        previous, subset = subset, step(subset)
+        if len(subset) not in records or \
+                scores[subset] > scores[records[len(subset)]]:
+            records[len(subset)] = subset
+        
+        # conditional steps, never undoing the last step
+        last = set(subset).symmetric_difference(previous)
+        while floating and can_float(subset):
+            candidate = back(subset, exclude=last)
+            if scores[candidate] <= scores.get(records.get(len(candidate))):
+                break
+            records[len(candidate)] = subset = candidate
+
+    selected = np.asarray(records[n_features])
+    arr = X[:,selected]
+
+    if return_transformer:
+        return arr, ColumnSelector(selected, n_features_pre)
     
-    return arr
\ No newline at end of file
+    return arr
+
+def _score(estimator, X, y, subset, scorer, cv):
+    """Score of the estimator on a subset of the features."""
+    X = X[:,list(subset)]
+    if cv:
+        return cross_val_score(clone(estimator), X, y, scoring=scorer, 
+                               cv=cv).mean()
+    return scorer(clone(estimator).fit(X, y), X, y)
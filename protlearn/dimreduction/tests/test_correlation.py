@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+from scipy import sparse
 from ..correlation import correlation
 
 import pkg_resources
@@ -19,4 +20,24 @@ def test_correlation():
     np.testing.assert_almost_equal(corr, np.array([
         [0.28571429, 0.        , 0.        , 0.79428571],
         [0.        , 0.11111111, 0.11111111, 0.45      ],
-        [0.375     , 0.125     , 0.25      , 0.60125   ]]), decimal=3)
\ No newline at end of file
+        [0.375     , 0.125     , 0.25      , 0.60125   ]]), decimal=3)
+
+    # test blockwise computation and precision
+    for block_size in [1, 3, 100]:
+        np.testing.assert_equal(correlation(features, block_size=block_size),
+                                corr)
+    corr32 = correlation(features, dtype=np.float32)
+    np.testing.assert_almost_equal(corr32, corr)
+
+    # test constant features
+    const = np.hstack([features, np.ones((features.shape[0], 2))])
+    assert correlation(const).shape[1] == corr.shape[1] + 2
+
+    # test sparse input
+    corr_sparse = correlation(sparse.csr_matrix(const), block_size=3)
+    assert sparse.issparse(corr_sparse)
+    np.testing.assert_almost_equal(corr_sparse.toarray(), correlation(const))
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        correlation(features, block_size=0)
@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+from scipy import sparse
 from ..lasso import lasso
 
 import pkg_resources
@@ -16,4 +17,19 @@ def test_lasso():
     # compute Lasso-based feature importances
     X_reduced = lasso(X, y)
 
-    assert X.shape > X_reduced.shape
\ No newline at end of file
+    assert X.shape > X_reduced.shape
+
+def test_lasso_sparse():
+    "Test Lasso-based feature selection on sparse input"
+
+    X = np.load(PATH+'features_largeN.npy')
+    X = np.where(X > 1, X, 0)
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    # sparse input selects the same features and stays sparse
+    X_dense, sel_dense = lasso(X, y, random_state=0, return_transformer=True)
+    X_sparse, sel = lasso(sparse.csr_matrix(X), y, random_state=0, 
+                          return_transformer=True)
+    assert sparse.issparse(X_sparse)
+    np.testing.assert_equal(sel.indices, sel_dense.indices)
+    np.testing.assert_almost_equal(X_sparse.toarray(), X_dense)
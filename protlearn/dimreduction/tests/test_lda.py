@@ -1,5 +1,7 @@
 import pytest
 import numpy as np
+from scipy import sparse
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from ..lda import lda
 
 import pkg_resources
@@ -22,4 +24,23 @@ def test_tree_importance():
     np.testing.assert_almost_equal(X_reduced[-1,:], -1.25676961)
 
     # test array shape
-    X_reduced.shape == (700, 1)
\ No newline at end of file
+    X_reduced.shape == (700, 1)
+
+def test_lda_sparse():
+    "Test LDA on sparse input"
+
+    X = sparse.random(700, 60, density=.2, format='csr', random_state=0)
+    y = np.arange(700) % 3
+
+    # same projection as the eigen solver on dense input
+    X_reduced, proj = lda(X, y, return_transformer=True)
+    mdl = LinearDiscriminantAnalysis(solver='eigen').fit(X.toarray(), y)
+    np.testing.assert_almost_equal(X_reduced, mdl.transform(X.toarray()))
+    np.testing.assert_almost_equal(proj.transform(X.toarray()), X_reduced)
+
+    # an all-zero column leaves the projection unchanged
+    X_zero = sparse.hstack([X, sparse.csr_matrix((700, 1))]).tocsr()
+    np.testing.assert_almost_equal(np.abs(lda(X_zero, y)), np.abs(X_reduced))
+
+    with pytest.raises(ValueError):
+        lda(X, y, shrinkage='auto')
@@ -1,4 +1,5 @@
 import pytest
+import tempfile
 import numpy as np
 from ..pca import pca
 
@@ -28,4 +29,36 @@ def test_pca():
          -5.88156252,  66.58515889, -48.50120568,  34.66457294]), decimal=3)
 
     # test array shape
-    features_reduced_large.shape == (700, 10)
\ No newline at end of file
+    features_reduced_large.shape == (700, 10)
+
+def test_pca_modes():
+    "Test incremental and randomized PCA and the fitted projection"
+
+    # load data
+    features_large = np.load(PATH+'features_largeN.npy')
+    reduced, proj = pca(features_large, return_transformer=True)
+
+    # test fitted projection
+    np.testing.assert_almost_equal(proj.transform(features_large), reduced)
+    np.testing.assert_almost_equal(proj.transform(features_large, 
+                                                  batch_size=64), reduced)
+
+    # test incremental and randomized modes (up to the sign of components)
+    for kwargs in [{'method': 'incremental', 'batch_size': 100},
+                   {'method': 'randomized', 'random_state': 0}]:
+        reduced_mode = pca(features_large, **kwargs)
+        assert reduced_mode.shape == reduced.shape
+        np.testing.assert_almost_equal(np.abs(reduced_mode), np.abs(reduced), 
+                                       decimal=3)
+
+    # test memory-mapped file
+    with tempfile.TemporaryDirectory() as tmp:
+        np.save(tmp+'/features.npy', features_large)
+        reduced_mmap = pca(tmp+'/features.npy', method='incremental', 
+                           batch_size=100)
+        np.testing.assert_almost_equal(np.abs(reduced_mmap), np.abs(reduced),
+                                       decimal=3)
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        pca(features_large, method='exact')
@@ -1,6 +1,9 @@
 import pytest
 import numpy as np
+from scipy import sparse
 from sklearn.svm import SVC
+from sklearn.linear_model import LogisticRegression
+from sklearn.feature_selection import RFE
 from ..rfe import rfe
 
 import pkg_resources
@@ -21,4 +24,54 @@ def test_rfe():
 
     # test shapes
     X_reduced.shape == (700, 10)
-    rank.shape == (X.shape[1],)
\ No newline at end of file
+    rank.shape == (X.shape[1],)
+
+def test_rfe_schedule():
+    "Test adaptive step, warm starts, and prescreening"
+
+    X = np.load(PATH+'features_largeN.npy')
+    X = X[:,:50]
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    # warm starts do not change the selection of a convex estimator
+    lr = LogisticRegression(max_iter=5000)
+    X_auto, rank = rfe(X, y, estimator=lr, n_features=10, step='auto')
+    X_warm, rank_warm = rfe(X, y, estimator=lr, n_features=10, step='auto',
+                            warm_start=True)
+    assert X_auto.shape == (700, 10)
+    assert (rank == 1).sum() == 10
+    np.testing.assert_equal(rank, rank_warm)
+
+    # features screened out share the last rank
+    X_pre, rank, sel = rfe(X, y, estimator=lr, n_features=5, prescreen=20, 
+                           return_transformer=True)
+    assert X_pre.shape == (700, 5)
+    assert (rank == rank.max()).sum() == 30
+    np.testing.assert_equal(sel.transform(X), X_pre)
+
+def test_rfe_sparse():
+    "Test RFE on sparse input"
+
+    X = np.load(PATH+'features_largeN.npy')
+    X = np.where(X[:,:50] > 1, X[:,:50], 0)
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    lr = LogisticRegression(max_iter=5000)
+    X_dense, rank_dense = rfe(X, y, estimator=lr, n_features=10, step='auto')
+    X_sparse, rank = rfe(sparse.coo_matrix(X), y, estimator=lr, n_features=10,
+                         step='auto')
+    assert sparse.issparse(X_sparse)
+    np.testing.assert_equal(rank, rank_dense)
+
+def test_rfe_multiclass():
+    "Test RFE with three classes against sklearn"
+
+    X = np.load(PATH+'features_largeN.npy')
+    X = X[:,:30]
+    y = np.arange(X.shape[0]) % 3
+
+    lr = LogisticRegression(max_iter=5000)
+    X_reduced, rank = rfe(X, y, estimator=lr, n_features=8, step=3)
+    ref = RFE(lr, n_features_to_select=8, step=3).fit(X, y)
+    np.testing.assert_equal(rank, ref.ranking_)
+    np.testing.assert_equal(X_reduced, X[:,ref.support_])
@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
 from ..sequential import sequential
 
 import pkg_resources
@@ -22,4 +23,25 @@ def test_sequential():
 
     # test shapes
     X_fwd.shape == (700, 10)
-    X_bwd.shape == (700, 10)
\ No newline at end of file
+    X_bwd.shape == (700, 10)
+
+def test_sequential_floating():
+    "Test floating and parallel sequential feature selection"
+
+    X = np.load(PATH+'features_largeN.npy')
+    X = X[:,:12]
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    # parallel scoring does not change the selection
+    knn = KNeighborsClassifier(n_neighbors=3)
+    X_ser, sel = sequential(X, y, estimator=knn, n_features=4, floating=True,
+                            return_transformer=True)
+    X_par = sequential(X, y, estimator=knn, n_features=4, floating=True, 
+                       n_jobs=2)
+    assert X_ser.shape == (700, 4)
+    np.testing.assert_equal(X_ser, X_par)
+    np.testing.assert_equal(sel.transform(X), X_ser)
+
+    X_bwd = sequential(X, y, estimator=knn, n_features=4, cv=3, 
+                       direction='backward', floating=True)
+    assert X_bwd.shape == (700, 4)
@@ -0,0 +1,55 @@
+import json
+import pickle
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from ..transformers import ColumnSelector, Projection, from_dict
+from ..lda import lda
+from .. import correlation, lasso, pca, rfe, tree_importance, \
+               univariate_filter, variance
+
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_transformers():
+    "Test fitted transformers of the dimensionality reduction functions"
+    
+    # load data
+    X = np.load(PATH+'features_largeN.npy')[:200,:100]
+    y = np.load(PATH+'features_largeN_labels.npy')[:200]
+    X_new = np.load(PATH+'features_largeN.npy')[200:300,:100]
+
+    # fitted transformers reproduce the reduced arrays
+    results = [correlation(X, return_transformer=True),
+               variance(X, thres=1., return_transformer=True),
+               lasso(X, y, return_transformer=True),
+               lda(X, y, return_transformer=True),
+               pca(X, return_transformer=True),
+               rfe(X, y, estimator=LogisticRegression(max_iter=500), 
+                   n_features=5, step=.2, return_transformer=True),
+               tree_importance(X, y, top=5, n_iterations=1, n_estimators=10,
+                               return_transformer=True),
+               univariate_filter(X, y, top=5, return_transformer=True),
+               univariate_filter(X, y, method='chi2', top=5, 
+                                 return_transformer=True)]
+    for out in results:
+        arr, trans = out[0], out[-1]
+        assert isinstance(trans, (ColumnSelector, Projection))
+        np.testing.assert_almost_equal(trans.transform(X), arr)
+
+        # serialization
+        for restored in [pickle.loads(pickle.dumps(trans)),
+                         from_dict(json.loads(json.dumps(trans.to_dict())))]:
+            np.testing.assert_almost_equal(restored.transform(X_new), 
+                                           trans.transform(X_new))
+
+    # chi2 on negative features applies the fitted min-max scaling
+    assert results[-1][1].scale is not None
+    assert results[-1][0].min() == 0
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        results[0][1].transform(X[:,:50])
+    with pytest.raises(ValueError):
+        from_dict({'type': 'Scaler'})
@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
 from xgboost import XGBClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
 from ..tree_importance import tree_importance
 
 import pkg_resources
@@ -43,4 +45,36 @@ def test_tree_importance():
 
     # test array shape
     X_rf.shape == (700, 5)
-    X_xgb.shape == (700,5)
\ No newline at end of file
+    X_xgb.shape == (700,5)
+
+def test_tree_importance_parallel():
+    "Test reproducibility across n_jobs and early stopping"
+
+    X = np.load(PATH+'features_largeN.npy')
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    # seeded iterations give the same ranking in serial and in parallel
+    _, ind = tree_importance(X, y, top=5, n_estimators=10, random_state=0)
+    _, ind_par = tree_importance(X, y, top=5, n_estimators=10, random_state=0,
+                                 n_jobs=2)
+    np.testing.assert_equal(ind, ind_par)
+
+    # a seeded classifier keeps its seed
+    clf = RandomForestClassifier(n_estimators=10, random_state=42)
+    _, ind_seeded = tree_importance(X, y, clf=clf, top=5, n_iterations=2)
+    _, ind_again = tree_importance(X, y, clf=clf, top=5, n_iterations=2)
+    np.testing.assert_equal(ind_seeded, ind_again)
+
+    # iterations stop once the ranking is stable
+    CountingTree.n_fits = 0
+    _, ind_stop = tree_importance(X, y, clf=CountingTree(), top=5, 
+                                  n_iterations=100, patience=2, random_state=0)
+    assert CountingTree.n_fits < 100
+    assert len(ind_stop) == 5
+
+class CountingTree(DecisionTreeClassifier):
+    n_fits = 0
+
+    def fit(self, X, y):
+        CountingTree.n_fits += 1
+        return super().fit(X, y)
@@ -17,4 +17,25 @@ def test_tsne():
     X_reduced = tsne(X, n_components=3, perplexity=5, pca_components=50)
 
     # test array shape
-    X_reduced.shape == (700, 3)
\ No newline at end of file
+    X_reduced.shape == (700, 3)
+
+def test_tsne_subsample():
+    "Test t-SNE on a subsample with projection of the remaining samples"
+
+    X = np.load(PATH+'features_largeN.npy')
+
+    X_reduced, timings = tsne(X, pca_method='randomized', subsample=200, 
+                              random_state=0, return_timings=True)
+    assert X_reduced.shape == (700, 2)
+    assert np.isfinite(X_reduced).all()
+    assert set(timings) == {'pca', 'tsne', 'projection'}
+
+    # projected samples lie within the bounds of the fitted embedding
+    fit = np.sort(np.random.default_rng(0).choice(700, 200, replace=False))
+    embedded = X_reduced[fit]
+    assert (X_reduced >= embedded.min(axis=0) - 1e-9).all()
+    assert (X_reduced <= embedded.max(axis=0) + 1e-9).all()
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        tsne(X, pca_method='arpack')
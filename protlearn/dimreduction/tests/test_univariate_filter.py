@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+from scipy import sparse
 from ..univariate_filter import univariate_filter
 
 import pkg_resources
@@ -48,4 +49,50 @@ def test_univariate_filter():
     # test array shape
     X_f.shape == (700, 10)
     X_chi2.shape == (700, 10)
-    X_mi.shape == (700, 10)
\ No newline at end of file
+    X_mi.shape == (700, 10)
+
+def test_univariate_filter_chunked():
+    "Test filtering from statistics accumulated over chunks of rows"
+
+    X = np.load(PATH+'features_largeN.npy')
+    y = np.load(PATH+'features_largeN_labels.npy')
+
+    # chunked statistics select the same features
+    for method in ['f_test', 'chi2']:
+        X_ref, sel_ref = univariate_filter(X, y, method=method, top=10, 
+                                           return_transformer=True)
+        X_chunk, sel = univariate_filter(X, y, method=method, top=10, 
+                                         chunk_size=64, 
+                                         return_transformer=True)
+        np.testing.assert_equal(sel.indices, sel_ref.indices)
+        np.testing.assert_almost_equal(X_chunk, X_ref)
+
+    # sparse input stays sparse
+    X_sparse = sparse.csr_matrix(np.where(X > 1, X, 0))
+    X_chunk = univariate_filter(X_sparse, y, method='chi2', chunk_size=100)
+    assert sparse.issparse(X_chunk)
+    assert X_chunk.shape == (700, 10)
+
+    # sparse input with negative features is scaled like dense input
+    X_neg = np.where(np.abs(X) > 1, X, 0)
+    X_dense, sel_dense = univariate_filter(X_neg, y, method='chi2', top=100,
+                                           chunk_size=100, 
+                                           return_transformer=True)
+    X_chunk, sel = univariate_filter(sparse.csr_matrix(X_neg), y, 
+                                     method='chi2', top=100, chunk_size=100, 
+                                     return_transformer=True)
+    assert (sel.offset < 0).any()
+    np.testing.assert_equal(sel.indices, sel_dense.indices)
+    np.testing.assert_almost_equal(X_chunk, X_dense)
+
+    # same without chunks
+    X_full, sel = univariate_filter(sparse.csr_matrix(X_neg), y, 
+                                    method='chi2', top=100, 
+                                    return_transformer=True)
+    np.testing.assert_equal(sel.indices, sel_dense.indices)
+    np.testing.assert_almost_equal(X_full, X_dense)
+    np.testing.assert_almost_equal(sel.transform(sparse.csr_matrix(X_neg)), 
+                                   X_dense)
+
+    with pytest.raises(ValueError):
+        univariate_filter(X, y, method='mutual_info', chunk_size=100)
@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+from scipy import sparse
+from ..variance import variance
+
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_variance():
+    "Test variance-based dimensionality reduction"
+    
+    # load data
+    features = np.load(PATH+'features.npy')
+    const = np.hstack([np.zeros((features.shape[0], 1)), features])
+
+    # test variance
+    var = variance(const)
+    n_const = np.sum(features.var(axis=0) == 0)
+    assert var.shape == (features.shape[0], features.shape[1]-n_const)
+    np.testing.assert_equal(var, features[:,features.var(axis=0) > 0])
+
+    # test threshold
+    thres = np.median(features.var(axis=0))
+    var_thres = variance(features, thres=thres)
+    np.testing.assert_equal(var_thres, features[:,features.var(axis=0) > thres])
+
+    # test sparse input
+    var_sparse = variance(sparse.csr_matrix(const), thres=thres)
+    assert sparse.issparse(var_sparse)
+    np.testing.assert_almost_equal(var_sparse.toarray(), var_thres)
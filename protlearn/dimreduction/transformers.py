@@ -0,0 +1,174 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from scipy import sparse
+
+# Transformers returned by the functions in protlearn.dimreduction with
+# return_transformer=True. They only hold arrays, so that they can be pickled
+# or converted to plain dicts (see to_dict and from_dict) for serving.
+
+class ColumnSelector:
+    """Column selection fitted by a feature selection function.
+
+    Applying the selection to new data is a pure slice, optionally followed by
+    a min-max scaling of the selected columns, so new batches can be 
+    transformed without refitting.
+
+    Parameters
+    ----------
+
+    indices : ndarray of shape (n_features_post,)
+        Indices of the selected columns, in the order of the output.
+
+    n_features : int
+        Number of columns of the data the selection was fitted on.
+
+    offset : ndarray of shape (n_features_post,), default=None
+        Subtracted from the selected columns before scaling.
+
+    scale : ndarray of shape (n_features_post,), default=None
+        The selected columns are divided by scale.
+
+    Examples
+    --------
+
+    >>> from protlearn.dimreduction import correlation
+    >>> reduced, sel = correlation(features, return_transformer=True)
+    >>> reduced_new = sel.transform(features_new)
+
+    """
+
+    def __init__(self, indices, n_features, offset=None, scale=None):
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.n_features = int(n_features)
+        self.offset = None if offset is None else np.asarray(offset)
+        self.scale = None if scale is None else np.asarray(scale)
+
+    def __repr__(self):
+        return 'ColumnSelector(n_features=%d, n_selected=%d)' % (
+            self.n_features, len(self.indices))
+
+    def transform(self, X):
+        """Select the fitted columns of a feature matrix (dense, sparse, or 
+        memory-mapped)."""
+        _check_features(X, self.n_features)
+        arr = X[:,self.indices]
+        if self.offset is None and self.scale is None:
+            return arr
+
+        offset = 0 if self.offset is None else self.offset
+        scale = 1 if self.scale is None else self.scale
+        if not sparse.issparse(arr):
+            return (np.asarray(arr, dtype=np.float64) - offset) / scale
+
+        # scaling keeps sparse columns sparse, shifting them does not
+        if np.any(offset):
+            return (arr.toarray() - offset) / scale
+        return arr @ sparse.diags(np.broadcast_to(1 / scale, 
+                                                  (len(self.indices),)))
+
+    def to_dict(self):
+        """Plain (JSON-serializable) representation, see from_dict."""
+        return {'type': 'ColumnSelector', 'indices': self.indices.tolist(),
+                'n_features': self.n_features,
+                'offset': None if self.offset is None else self.offset.tolist(),
+                'scale': None if self.scale is None else self.scale.tolist()}
+
+class Projection:
+    """Linear projection fitted by a dimensionality reduction function.
+
+    Applying the projection to new data requires a single matrix product, so
+    new batches can be transformed without refitting.
+
+    Parameters
+    ----------
+
+    components : ndarray of shape (n_components, n_features)
+        Projection axes.
+
+    mean : ndarray of shape (n_features,), default=None
+        Subtracted from the features before projecting.
+
+    scale : ndarray of shape (n_components,), default=None
+        The projected data is divided by scale (e.g. for whitening).
+
+    Examples
+    --------
+
+    >>> from protlearn.dimreduction import pca
+    >>> reduced, proj = pca(features, thres=.9, return_transformer=True)
+    >>> reduced_new = proj.transform(features_new)
+
+    """
+
+    def __init__(self, components, mean=None, scale=None):
+        self.components = np.asarray(components)
+        self.mean = None if mean is None else np.asarray(mean)
+        self.scale = None if scale is None else np.asarray(scale)
+
+    def __repr__(self):
+        return 'Projection(n_features=%d, n_components=%d)' % (
+            self.components.shape[1], self.components.shape[0])
+
+    def transform(self, X, batch_size=None):
+        """Project a feature matrix.
+
+        Parameters
+        ----------
+
+        X : ndarray or sparse matrix of shape (n_samples, n_features)
+            Feature matrix, e.g. a memory-mapped array.
+
+        batch_size : int, default=None
+            If given, rows are projected in batches of this size, so that only
+            one batch of X is held in memory at a time.
+
+        Returns
+        -------
+
+        arr : ndarray of shape (n_samples, n_components)
+            Projected data.
+
+        """
+
+        _check_features(X, self.components.shape[1])
+        if batch_size is None:
+            return self._transform(X)
+        arr = np.empty((X.shape[0], self.components.shape[0]))
+        for start in range(0, X.shape[0], batch_size):
+            arr[start:start+batch_size] = self._transform(
+                X[start:start+batch_size])
+        return arr
+
+    def _transform(self, X):
+        # subtracting the projected mean keeps sparse input sparse
+        if not sparse.issparse(X):
+            X = np.asarray(X)
+        arr = np.asarray(X @ self.components.T)
+        if self.mean is not None:
+            arr = arr - self.mean @ self.components.T
+        if self.scale is not None:
+            arr = arr / self.scale
+        return arr
+
+    def to_dict(self):
+        """Plain (JSON-serializable) representation, see from_dict."""
+        return {'type': 'Projection', 
+                'components': self.components.tolist(),
+                'mean': None if self.mean is None else self.mean.tolist(),
+                'scale': None if self.scale is None else self.scale.tolist()}
+
+def from_dict(d):
+    """Restore a transformer from its to_dict representation."""
+    params = dict(d)
+    kind = params.pop('type')
+    if kind == 'ColumnSelector':
+        return ColumnSelector(**params)
+    if kind == 'Projection':
+        return Projection(**params)
+    raise ValueError('Unknown transformer type %r.' % (kind,))
+
+def _check_features(X, n_features):
+    if X.shape[1] != n_features:
+        raise ValueError('X has %d features, but the transformer was fitted '
+                         'on %d features.' % (X.shape[1], n_features))
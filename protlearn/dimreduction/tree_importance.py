@@ -1,16 +1,22 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from xgboost import XGBClassifier
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
+from .transformers import ColumnSelector
+from .._config import get_config, effective_n_jobs
 
 def tree_importance(X, y, *, clf=None, method='random_forest', top=None,
                     n_iterations=3, n_estimators=100, max_depth=None,
-                    importance_type='gain'):
+                    importance_type='gain', n_jobs=None, random_state=None,
+                    patience=None, return_transformer=False):
     """Decision tree feature importance.
 
     This function returns the features that were selected as important by 
-    decision tree algorithms such as Random Forest and XGBoost. 
+    decision tree algorithms such as Random Forest and XGBoost. The 
+    importances are summed over n_iterations fits of the classifier, each 
+    with its own random seed, which can run in parallel and stop early once
+    the ranking of the top features has stabilized.
     
     Parameters
     ----------
@@ -32,7 +38,7 @@ def tree_importance(X, y, *, clf=None, method='random_forest', top=None,
         Number of top features to select.
 
     n_iterations : int, default=3
-        Number of iterations.
+        Maximum number of iterations.
         
     n_estimators : int or None, default=2
         Number of trees in the forest.
@@ -48,6 +54,22 @@ def tree_importance(X, y, *, clf=None, method='random_forest', top=None,
         'total_gain' : Total gain
         'total_cover' : Total cover
 
+    n_jobs : int or None, default=None
+        Number of iterations fitted in parallel (-1 for all CPUs). If None, 
+        the n_jobs and backend of protlearn.set_config are used.
+
+    random_state : int or None, default=None
+        Seed from which the seeds of the iterations are derived, for 
+        reproducible importances. If None, a classifier with its own 
+        random_state keeps it in every iteration.
+
+    patience : int or None, default=None
+        If given, iterations stop once the ranking of the top features has not
+        changed for this many consecutive iterations.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
+
     Returns
     -------
 
@@ -57,6 +79,10 @@ def tree_importance(X, y, *, clf=None, method='random_forest', top=None,
     indices : ndarray
         Indices indicating the position of the selected feature in the input vector.
 
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
     Examples
     --------
 
@@ -79,21 +105,60 @@ def tree_importance(X, y, *, clf=None, method='random_forest', top=None,
     
     """
 
-    if clf != None:
-        clf = clf
-    else:
+    if clf is None:
         if method == 'random_forest':
             clf = RandomForestClassifier(n_estimators=n_estimators, 
                                         max_depth=max_depth)
         elif method == 'xgboost':
+            from xgboost import XGBClassifier
             clf = XGBClassifier(n_estimators=n_estimators, 
                                 max_depth=max_depth, 
                                 importance_type=importance_type)
-    importances = []
-    for i in range(n_iterations):
-        clf.fit(X, y)
-        importances.append(clf.feature_importances_)
-    indices = np.argsort(-sum(importances))[:top]
+
+    config = get_config()
+    n_jobs = effective_n_jobs(config['n_jobs'] if n_jobs is None else n_jobs)
+    # seed the iterations unless the classifier is seeded itself
+    params = clf.get_params()
+    if 'random_state' in params and (random_state is not None or 
+                                     params['random_state'] is None):
+        seeds = np.random.SeedSequence(random_state).generate_state(
+            n_iterations)
+    else:
+        seeds = [None] * n_iterations
+
+    # fit iterations in rounds of n_jobs, accumulating their importances in
+    # the order of the iterations
+    importances = 0
+    ranking, stable = None, 0
+    for start in range(0, n_iterations, n_jobs):
+        batch = seeds[start:start+n_jobs]
+        if n_jobs == 1:
+            results = [_importances(clf, X, y, batch[0])]
+        else:
+            from joblib import Parallel, delayed
+            prefer = 'threads' if config['backend'] == 'threads' else None
+            results = Parallel(n_jobs=n_jobs, prefer=prefer)(
+                delayed(_importances)(clf, X, y, seed) for seed in batch)
+
+        for result in results:
+            importances = importances + result
+            previous, ranking = ranking, np.argsort(-importances)[:top]
+            stable = stable + 1 if np.array_equal(ranking, previous) else 0
+        if patience is not None and stable >= patience:
+            break
+
+    indices = ranking
     arr = X[:,indices]
+
+    if return_transformer:
+        return arr, indices, ColumnSelector(indices, X.shape[1])
     
     return arr, indices
+
+def _importances(clf, X, y, seed):
+    """Feature importances of a fresh copy of clf, fitted with the given 
+    seed unless it is None."""
+    clf = clone(clf)
+    if seed is not None:
+        clf.set_params(random_state=int(seed))
+    return clf.fit(X, y).feature_importances_
@@ -1,14 +1,27 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
+from time import perf_counter
+import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+from .._config import get_config, effective_n_jobs
 
-def tsne(X, *, n_components=2, perplexity=30, prior_pca=True, pca_components=50):
+def tsne(X, *, n_components=2, perplexity=30, prior_pca=True, pca_components=50,
+         pca_method='auto', method='barnes_hut', angle=.5, init='pca', 
+         subsample=None, n_neighbors=10, n_jobs=None, random_state=None, 
+         return_timings=False):
     """t-distributed stochastic neighbor embedding.
 
     t-SNE converts similarities between data points to joint probabilities and 
     tries to minimize the Kullback-Leibler divergence between the joint 
     probabilities of the low-dimensional embedding and the high-dimensional data.
+
+    For large datasets, the embedding can be fitted on a random subsample; the
+    remaining samples are then placed at the distance-weighted mean of the 
+    embeddings of their nearest neighbors in the subsample. Together with the
+    Barnes-Hut approximation and a randomized PCA, this scales to hundreds of
+    thousands of samples.
     
     Parameters
     ----------
@@ -31,12 +44,57 @@ def tsne(X, *, n_components=2, perplexity=30, prior_pca=True, pca_components=50)
     pca_components : int, default=50
         Dimension of PCA-preprocessed data that will serve as input to t-SNE.
 
+    pca_method : string, default='auto'
+        'auto' : randomized decomposition for large inputs, exact otherwise 
+                 (see sklearn.decomposition.PCA)
+        'full' : exact decomposition
+        'randomized' : randomized decomposition into the leading components, 
+                       which is much faster on large datasets
+
+    method : string, default='barnes_hut'
+        'barnes_hut' : Barnes-Hut approximation of the gradient, which runs in
+                       O(n_samples*log(n_samples)) time
+        'exact' : exact gradient, which runs in O(n_samples**2) time
+
+    angle : float, default=.5
+        Trade-off between speed and accuracy of the Barnes-Hut approximation;
+        larger values are faster and less accurate.
+
+    init : string or ndarray, default='pca'
+        Initialization of the embedding, 'pca', 'random', or an ndarray of 
+        shape (n_samples, n_components) (of shape (subsample, n_components) 
+        if subsample is given).
+
+    subsample : int or None, default=None
+        If given, t-SNE is fitted on this many randomly drawn samples, and the
+        remaining samples are projected onto the embedding. The PCA is then 
+        fitted on the subsample as well.
+
+    n_neighbors : int, default=10
+        Number of neighbors in the subsample from which the embedding of a 
+        projected sample is computed.
+
+    n_jobs : int or None, default=None
+        Number of parallel jobs of the nearest neighbor searches (-1 for all
+        CPUs). If None, the n_jobs of protlearn.set_config is used.
+
+    random_state : int or None, default=None
+        Seed of the subsample, the randomized PCA, and t-SNE.
+
+    return_timings : bool, default=False
+        If True, the time spent on each step is returned as well.
+
     Returns
     -------
 
     arr :  ndarray of shape (n_samples, n_components)
         Array containing the t-SNE-transformed features.
 
+    timings : dict
+        Time in seconds spent on the PCA ('pca'), on fitting t-SNE ('tsne'),
+        and on projecting the samples outside the subsample ('projection').
+        Only returned if return_timings is True.
+
     Examples
     --------
 
@@ -56,13 +114,61 @@ def tsne(X, *, n_components=2, perplexity=30, prior_pca=True, pca_components=50)
     
     """
     
+    if pca_method not in ['auto', 'full', 'randomized']:
+        raise ValueError("pca_method must be 'auto', 'full', or 'randomized'!")
+    n_jobs = effective_n_jobs(get_config()['n_jobs'] if n_jobs is None 
+                              else n_jobs)
+    timings = dict.fromkeys(['pca', 'tsne', 'projection'], 0.)
+    n_samples = X.shape[0]
+    if subsample is not None and subsample < n_samples:
+        rng = np.random.default_rng(random_state)
+        fit = np.sort(rng.choice(n_samples, subsample, replace=False))
+    else:
+        fit = None
+
     if prior_pca:
-        pca = PCA(n_components=pca_components)
-        pca_reduced = pca.fit_transform(X)
-        arr = TSNE(n_components=n_components, 
-                   perplexity=perplexity).fit_transform(pca_reduced)
+        start = perf_counter()
+        pca = PCA(n_components=pca_components, svd_solver=pca_method,
+                  random_state=random_state)
+        if fit is None:
+            X = pca.fit_transform(X)
+        else:
+            X = pca.fit(X[fit]).transform(X)
+        timings['pca'] = perf_counter() - start
+    
+    start = perf_counter()
+    model = TSNE(n_components=n_components, perplexity=perplexity, 
+                 method=method, angle=angle, init=init, n_jobs=n_jobs, 
+                 random_state=random_state)
+    if fit is None:
+        arr = model.fit_transform(X)
     else:
-        arr = TSNE(n_components=n_components, 
-                   perplexity=perplexity).fit_transform(X)
+        embedded = model.fit_transform(X[fit])
+    timings['tsne'] = perf_counter() - start
+
+    if fit is not None:
+        start = perf_counter()
+        arr = np.empty((n_samples, n_components))
+        arr[fit] = embedded
+        rest = np.setdiff1d(np.arange(n_samples), fit)
+        arr[rest] = _project(X[fit], embedded, X[rest], n_neighbors, n_jobs)
+        timings['projection'] = perf_counter() - start
+
+    if return_timings:
+        return arr, timings
     
-    return arr
\ No newline at end of file
+    return arr
+
+def _project(X_fit, embedded, X, n_neighbors, n_jobs, batch_size=10000):
+    """Embed samples at the inverse distance-weighted mean of the embeddings
+    of their nearest neighbors among the fitted samples."""
+    nn = NearestNeighbors(n_neighbors=min(n_neighbors, len(X_fit)), 
+                          n_jobs=n_jobs).fit(X_fit)
+    arr = np.empty((X.shape[0], embedded.shape[1]))
+    for start in range(0, X.shape[0], batch_size):
+        dist, ind = nn.kneighbors(X[start:start+batch_size])
+        weights = 1 / np.maximum(dist, np.finfo(float).eps)
+        weights /= weights.sum(axis=1, keepdims=True)
+        arr[start:start+batch_size] = np.einsum('ij,ijk->ik', weights, 
+                                                embedded[ind])
+    return arr
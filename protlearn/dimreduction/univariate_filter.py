@@ -1,22 +1,32 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
+import numpy as np
 from sklearn.feature_selection import SelectKBest
 from sklearn.feature_selection import f_classif, chi2, mutual_info_classif
-from sklearn.preprocessing import MinMaxScaler
+from ._stats import class_statistics
+from .transformers import ColumnSelector
 
-def univariate_filter(X, y, *, method='f_test', top=10):
+def univariate_filter(X, y, *, method='f_test', top=10, chunk_size=None,
+                      return_transformer=False):
     """Univariate feature selection.
 
     This function returns the features selected by univariate filtering after 
     examining each feature individually and determining the strength of its 
     relationship with the response variable. Here, three statistical tests can 
     be chosen: f-test, chi-squared, and mutual information.
+
+    The f-test and chi-squared statistics only depend on the class-wise sums
+    and the sums of squares of each feature. With chunk_size, these are 
+    accumulated over chunks of rows, so that matrices that do not fit into 
+    memory (e.g. memory-mapped .npy files) can be filtered.
     
     Parameters
     ----------
     
-    X : ndarray of shape (n_samples, n_features_pre)
-        Feature matrix.
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre), or 
+        string
+        Feature matrix, or the path of a .npy file containing it, which is 
+        memory-mapped rather than loaded.
     
     y : ndarray of shape (n_samples,)
         Response variables.
@@ -28,12 +38,27 @@ def univariate_filter(X, y, *, method='f_test', top=10):
     
     top : int, default=10
         Number of top features to select.
-        
+
+    chunk_size : int or None, default=None
+        If given, the statistics are accumulated over chunks of this many 
+        rows (f_test and chi2 only). If None, X is scored at once. Sparse 
+        input then yields sparse output, unless chi2 min-max scales features
+        with negative values, which shifts their zeros.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
+
     Returns
     -------
     
     arr : ndarray of shape (n_samples, top)
         Array containing the top features.
+
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. If chi2 was applied to negative features, it also 
+        applies the fitted min-max scaling. Only returned if 
+        return_transformer is True.
     
     Examples
     --------
@@ -55,16 +80,83 @@ def univariate_filter(X, y, *, method='f_test', top=10):
     
     """  
     
+    # input handling
+    if isinstance(X, str):
+        X = np.load(X, mmap_mode='r')
+
+    if chunk_size is not None:
+        return _chunked(X, y, method, top, chunk_size, return_transformer)
+
+    sel = None
     if method == 'f_test':
-        arr = SelectKBest(f_classif, k=top).fit_transform(X, y)
+        mdl = SelectKBest(f_classif, k=top)
+        arr = mdl.fit_transform(X, y)
     elif method == 'chi2':
         # only non-negative features
+        mdl = SelectKBest(chi2, k=top)
         try:
-            arr = SelectKBest(chi2, k=top).fit_transform(X, y)
-        except:
-            X = MinMaxScaler().fit_transform(X)
-            arr = SelectKBest(chi2, k=top).fit_transform(X, y)
+            arr = mdl.fit_transform(X, y)
+        except ValueError:
+            # min-max scaled with the column ranges, as in _chunked, which
+            # also covers sparse input
+            _, _, _, low, high = class_statistics(X, y)
+            scale = np.where(high > low, high - low, 1.)
+            scaler = ColumnSelector(np.arange(X.shape[1]), X.shape[1], 
+                                    offset=low, scale=scale)
+            arr = mdl.fit_transform(scaler.transform(X), y)
+            indices = mdl.get_support(indices=True)
+            sel = ColumnSelector(indices, X.shape[1], offset=low[indices], 
+                                 scale=scale[indices])
     elif method == 'mutual_info':
-        arr = SelectKBest(mutual_info_classif, k=top).fit_transform(X, y)
+        mdl = SelectKBest(mutual_info_classif, k=top)
+        arr = mdl.fit_transform(X, y)
+
+    if return_transformer:
+        if sel is None:
+            sel = ColumnSelector(mdl.get_support(indices=True), X.shape[1])
+        return arr, sel
+    
+    return arr
+
+def _chunked(X, y, method, top, chunk_size, return_transformer):
+    """Univariate filter from statistics accumulated over chunks of rows."""
+    if method not in ['f_test', 'chi2']:
+        raise ValueError("Chunked scoring is only available for 'f_test' and "
+                         "'chi2'!")
+    counts, sums, sq, low, high = class_statistics(X, y, chunk_size)
+    n_samples, n_classes = counts.sum(), len(counts)
+    
+    # only non-negative features; otherwise min-max scaled as above
+    scaled = method == 'chi2' and (low < 0).any()
+    if scaled:
+        scale = np.where(high > low, high - low, 1.)
+        sums = (sums - counts[:,None] * low) / scale
+    total = sums.sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'f_test':
+            ss_total = sq - total**2 / n_samples
+            ss_between = (sums**2 / counts[:,None]).sum(axis=0) \
+                         - total**2 / n_samples
+            ss_within = ss_total - ss_between
+            scores = (ss_between / (n_classes-1)) \
+                     / (ss_within / (n_samples-n_classes))
+        else:
+            expected = np.outer(counts / n_samples, total)
+            scores = ((sums - expected)**2 / expected).sum(axis=0)
+    
+    # top features, with ties and NaN scores handled as in SelectKBest
+    scores = np.where(np.isnan(scores), np.finfo(float).min, scores)
+    selected = np.sort(np.argsort(scores, kind='mergesort')[-top:]) \
+               if top else np.array([], dtype=int)
+    if scaled:
+        sel = ColumnSelector(selected, X.shape[1], offset=low[selected], 
+                             scale=scale[selected])
+    else:
+        sel = ColumnSelector(selected, X.shape[1])
+    arr = sel.transform(X)
+    
+    if return_transformer:
+        return arr, sel
     
-    return arr
\ No newline at end of file
+    return arr
@@ -0,0 +1,66 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from scipy import sparse
+from ._stats import column_moments
+from .transformers import ColumnSelector
+
+def variance(X, thres=0., *, return_transformer=False):
+    """Variance filter.
+
+    This function removes features whose variance does not exceed a specified
+    threshold, e.g. constant columns of n-gram or binary profiles that carry no
+    information. Dense input is processed in column blocks, and sparse input
+    is never densified.
+
+    Parameters
+    ----------
+
+    X : ndarray or sparse matrix of shape (n_samples, n_features_pre) 
+        Feature matrix.
+
+    thres : float, default=0.
+        Features whose variance is lower than or equal to this threshold will
+        be removed. With the default, only constant features are removed.
+
+    return_transformer : bool, default=False
+        If True, the fitted column selection is returned as well.
+
+    Returns
+    -------
+
+    arr :  ndarray or sparse matrix of shape (n_samples, n_features_post)
+        Array containing the features whose variance exceeds the threshold.
+
+    sel : ColumnSelector
+        Fitted selection of the columns in arr, which transforms new data
+        without refitting. Only returned if return_transformer is True.
+
+    Examples
+    --------
+
+    >>> from protlearn.features import ngram
+    >>> from protlearn.dimreduction import variance
+    >>> seqs = ['ARKLY', 'EERKPGL', 'PGPGEERNLY']
+    >>> ng, _ = ngram(seqs)
+    >>> ng.shape
+    (3, 400)
+    >>> reduced = variance(ng)
+    >>> reduced.shape
+    (3, 13)
+
+    """
+
+    if sparse.issparse(X):
+        if X.format not in ['csr', 'csc']:
+            X = X.tocsr()
+    else:
+        X = np.asarray(X)
+
+    _, var = column_moments(X)
+    arr = X[:,var > thres]
+
+    if return_transformer:
+        return arr, ColumnSelector(np.flatnonzero(var > thres), X.shape[1])
+
+    return arr
@@ -19,6 +19,7 @@ from .motif import motif
 from .ctdc import ctdc
 from .ctdt import ctdt
 from .ctdd import ctdd
+from .pipeline import FeaturePipeline
 
 __all__ = ['aac',
            'aaindex1',
@@ -40,5 +41,6 @@ __all__ = ['aac',
            'motif',
            'ctdc',
            'ctdt',
-           'ctdd'
+           'ctdd',
+           'FeaturePipeline'
            ]
\ No newline at end of file
@@ -0,0 +1,186 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from contextvars import ContextVar
+from ._data import load_properties, load_ctd
+from ..utils.encoding import encode, composition, segment_ids, segment_sum, \
+                             lag_pairs
+
+# batch shared by all feature functions called within FeaturePipeline.transform
+_active = ContextVar('protlearn_batch', default=None)
+
+# intermediates that each intermediate is derived from
+DEPENDENCIES = {
+    'sliced': [],
+    'encoded': ['sliced'],
+    'ids': ['encoded'],
+    'counts': ['encoded'],
+    'pair_counts': ['encoded'],
+    'lag_sum': ['encoded'],
+    'properties': ['encoded'],
+    'deviations': ['properties', 'ids'],
+    'groups': ['encoded'],
+}
+
+def closure(intermediates):
+    """Intermediates together with all intermediates they are derived 
+    from."""
+    required = set()
+    stack = list(intermediates)
+    while stack:
+        name = stack.pop()
+        if name not in required:
+            required.add(name)
+            stack += DEPENDENCIES[name]
+    return required
+
+def schedule(requirements):
+    """Determine when intermediates can be released.
+
+    Parameters
+    ----------
+
+    requirements : list of lists
+        Intermediates (see DEPENDENCIES) declared by each step, in the order 
+        in which the steps are run.
+
+    Returns
+    -------
+
+    release : list of sets
+        Intermediates whose last consumer is the respective step, i.e. that 
+        can be released once the step has run.
+
+    """
+
+    last = {}
+    for i, intermediates in enumerate(requirements):
+        for name in closure(intermediates):
+            last[name] = i
+    return [{name for name, j in last.items() if j == i} 
+            for i in range(len(requirements))]
+
+class Batch:
+    """Intermediate results of a dataset of amino acid sequences.
+
+    Each intermediate (sliced sequences, integer encoding, amino acid counts, lagged
+    pair counts, property tracks, ...) is computed on first request and then
+    kept until it is released, so that feature functions sharing a batch 
+    never compute the same intermediate twice.
+
+    Feature kernels obtain their batch through Batch.of, which returns the
+    batch activated by FeaturePipeline if it holds the very same list of
+    sequences, and a fresh batch otherwise. Each feature module declares the
+    intermediates its kernel consumes in INTERMEDIATES, from which 
+    FeaturePipeline schedules their release (see schedule).
+
+    Parameters
+    ----------
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    """
+
+    def __init__(self, X):
+        self.X = X
+        self._cache = {}
+
+    @classmethod
+    def of(cls, X):
+        """Return the active batch of X or a new one."""
+        batch = _active.get()
+        if batch is not None and batch.X is X:
+            return batch
+        return cls(X)
+
+    def _get(self, key, func, *args):
+        if key not in self._cache:
+            self._cache[key] = func(*args)
+        return self._cache[key]
+
+    def release(self, intermediates):
+        """Free all cached results of the given intermediates."""
+        for key in [key for key in self._cache if key[0] in intermediates]:
+            del self._cache[key]
+
+    def sliced(self, start, end):
+        """Sequences restricted to positions start to end (one-based)."""
+        if start == 1 and end is None:
+            return self.X
+        return self._get(('sliced', start, end),
+                         lambda: [seq[start-1:end] for seq in self.X])
+
+    def encoded(self, start, end):
+        """Integer codes and offsets of the sliced sequences (see
+        utils.encoding.encode), which compute_rows has validated."""
+        return self._get(('encoded', start, end),
+                         lambda: encode(self.sliced(start, end)))
+
+    def lengths(self, start, end):
+        """Length of each sliced sequence."""
+        return np.diff(self.encoded(start, end)[1])
+
+    def ids(self, start, end):
+        """Sequence index of each residue."""
+        return self._get(('ids', start, end),
+                         lambda: segment_ids(self.encoded(start, end)[1]))
+
+    def counts(self, start, end):
+        """Absolute amino acid counts of shape (n_samples, 20)."""
+        return self._get(('counts', start, end),
+                         lambda: composition(*self.encoded(start, end)))
+
+    def _pair_codes(self, start, end, lag):
+        """Code a*20+b of each residue pair (a, b) that is lag positions apart
+        within a sequence, and the sequence index of each pair."""
+        codes, offsets = self.encoded(start, end)
+        left, pair_ids = lag_pairs(offsets, lag)
+        pairs = codes[left].astype(np.intp)*20 + codes[left+lag]
+        return pairs, pair_ids
+
+    def pair_counts(self, start, end, lag):
+        """Absolute counts of residue pairs that are lag positions apart, of
+        shape (n_samples, 400), columns in the order of
+        itertools.product(AMINO_ACIDS, repeat=2)."""
+        def _pair_counts():
+            pairs, pair_ids = self._pair_codes(start, end, lag)
+            n_samples = len(self.X)
+            arr = np.bincount(pair_ids*400 + pairs, minlength=n_samples*400)
+            return arr.reshape(n_samples, 400).astype(float)
+        return self._get(('pair_counts', start, end, lag), _pair_counts)
+
+    def lag_sum(self, start, end, lag, name, matrix):
+        """Sum of matrix[a, b] over all residue pairs (a, b) that are lag
+        positions apart, for each sequence. The 20x20 matrix is identified by
+        name (e.g. 'grantham') for the purpose of caching."""
+        def _lag_sum():
+            pairs, pair_ids = self._pair_codes(start, end, lag)
+            return np.bincount(pair_ids, weights=matrix.ravel()[pairs],
+                               minlength=len(self.X))
+        return self._get(('lag_sum', start, end, lag, name), _lag_sum)
+
+    def groups(self, start, end):
+        """CTD group (0, 1, or 2) of each residue in each category, of shape 
+        (n_categories, total_length)."""
+        return self._get(('groups', start, end),
+                         lambda: load_ctd()[1][:,self.encoded(start, end)[0]])
+
+    def properties(self, start, end):
+        """Standardized default AAIndex1 properties of each residue, of shape
+        (8, total_length)."""
+        return self._get(('properties', start, end),
+                         lambda: load_properties()[:,self.encoded(start, end)[0]])
+
+    def deviations(self, start, end):
+        """Deviations of each residue's properties from their sequence mean,
+        and the sum of squared deviations of each sequence."""
+        def _deviations():
+            p = self.properties(start, end)
+            ids = self.ids(start, end)
+            lengths = self.lengths(start, end)[:,None]
+            mean = segment_sum(p.T, ids, len(self.X)) / lengths
+            dev = p - mean[ids].T
+            sq_dev = segment_sum((dev**2).T, ids, len(self.X))
+            return dev, sq_dev
+        return self._get(('deviations', start, end), _deviations)
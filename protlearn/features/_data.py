@@ -0,0 +1,91 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import os
+import numpy as np
+from functools import lru_cache
+from .._profiling import stage
+
+try:
+    from importlib.resources import files
+    PATH = os.path.join(str(files(__package__).joinpath('data')), '')
+except ImportError:
+    # importlib.resources.files requires Python 3.9
+    PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', '')
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# default indices of AAIndex1 (Xiao et al., 2015)
+DEFAULT_PROPERTIES = ['CIDH920105', 'BHAR880101', 'CHAM820101', 'CHAM820102',
+                      'CHOC760101', 'BIGC670101', 'CHAM810101', 'DAYM780201']
+
+@stage('loading')
+def _read_csv(filename):
+    """Read a table from the data directory (pandas is only imported once a
+    table is needed)."""
+    import pandas as pd
+    return pd.read_csv(PATH+filename)
+
+# The loaders below read each table at most once per process. The returned
+# arrays are shared between all callers and must not be modified.
+
+@lru_cache(maxsize=None)
+def load_aaindex1():
+    """AAIndex1 index names and values as an array of shape (20, 553), rows in
+    the order of AMINO_ACIDS."""
+    df = _read_csv('aaindex1.csv')
+    desc = df['Description'].values
+    return desc, np.asarray(df[list(AMINO_ACIDS)], dtype=float).T
+
+@lru_cache(maxsize=None)
+def load_properties():
+    """Standardized default AAIndex1 indices as an array of shape (8, 20),
+    columns in the order of AMINO_ACIDS."""
+    df = _read_csv('aaindex1.csv').set_index('Description')
+    df = df.reindex(sorted(df.columns), axis=1)
+    data = np.asarray(df.loc[DEFAULT_PROPERTIES])
+
+    # standardization
+    return (data-data.mean(axis=1, keepdims=True))/data.std(axis=1, keepdims=True)
+
+@lru_cache(maxsize=None)
+def load_atc():
+    """Atomic and bond composition of each amino acid as an array of shape
+    (20, 8), rows in the order of AMINO_ACIDS."""
+    df = _read_csv('atc.csv')
+    return np.asarray(df.iloc[:,1:], dtype=float)
+
+@lru_cache(maxsize=None)
+def load_paac():
+    """Normalized hydrophobicity, hydrophilicity, and side chain mass as an
+    array of shape (20, 3), rows in the order of AMINO_ACIDS."""
+    df = _read_csv('paac.csv')
+    data = np.asarray(df.iloc[:,1:], dtype=float)
+
+    # normalization
+    for i in range(data.shape[1]):
+        mean = np.mean(data[:,i])
+        denom = np.sqrt(sum([(j-mean)**2 for j in data[:,i]])/20)
+        data[:,i] = [(j-mean)/denom for j in data[:,i]]
+
+    return data
+
+@lru_cache(maxsize=None)
+def load_ctd():
+    """CTD categories and the group (0, 1, or 2) of each amino acid as an
+    array of shape (n_categories, 20), columns in the order of AMINO_ACIDS."""
+    df = _read_csv('ctd.csv')
+    categories = list(df.Category)
+    groups = np.zeros((len(categories), 20), dtype=np.uint8)
+    for i in range(len(categories)):
+        for g, col in enumerate(['Group1', 'Group2', 'Group3']):
+            for aa in df[col][i]:
+                groups[i, AMINO_ACIDS.index(aa)] = g
+    return categories, groups
+
+@lru_cache(maxsize=None)
+def load_distance(name):
+    """Distance matrix ('schneider-wrede' or 'grantham') of shape (20, 20),
+    rows and columns in the order of AMINO_ACIDS."""
+    df = _read_csv(name+'.csv').set_index('AminoAcid')
+    return np.asarray(df, dtype=float)
@@ -1,10 +1,25 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from collections import Counter
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-def aac(X, *, method='relative', remove_zero_cols=False, start=1, end=None):
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# intermediates consumed by _aac (see FeaturePipeline)
+INTERMEDIATES = ['counts']
+
+def _aac(X, start, end):
+    """Absolute amino acid counts for each sequence."""
+    return Batch.of(X).counts(start, end)
+
+@profiled
+@handle_invalid()
+def aac(X, *, method='relative', remove_zero_cols=False, start=1, end=None, 
+        on_invalid='raise'):
     """Amino acid composition.
 
     This function returns the frequency of amino acids for each sequence in the
@@ -31,6 +46,13 @@ def aac(X, *, method='relative', remove_zero_cols=False, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -62,20 +84,10 @@ def aac(X, *, method='relative', remove_zero_cols=False, start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # list of amino acids (IUPAC extended)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-
-    # initialize empty array with shape (n_samples, 26)
-    arr = np.zeros((len(X), len(amino_acids)))
+    amino_acids = AMINO_ACIDS
 
     # compute AAC
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical
-        check_natural(seq) # check for unnatural amino acids  
-        seq = seq[start-1:end] # positional information
-        counts = Counter(seq)
-        indices = [amino_acids.index(k) for k in counts.keys()]
-        arr[i,indices] = list(counts.values())
+    arr = compute_rows(_aac, X, len(amino_acids), start=start, end=end)
 
     # delete zero columns
     if remove_zero_cols:
@@ -1,15 +1,32 @@
 # Authors: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 #          Shoji Ihara <ihara@molcure.io>            
 
-import numpy as np
-import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import load_aaindex1
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+# Number of indices
+LEN = 553
 
-def aaindex1(X, *, standardize='none', start=1, end=None):
+# intermediates consumed by _aaindex1 (see FeaturePipeline)
+INTERMEDIATES = ['counts']
+
+def _aaindex1(X, start, end):
+    """Mean AAIndex1 values for each sequence."""
+    batch = Batch.of(X)
+
+    # the mean of the indices across a sequence equals the amino acid counts 
+    # weighted by the indices, divided by the sequence length
+    counts = batch.counts(start, end)
+    arr = counts @ load_aaindex1()[1] / batch.lengths(start, end)[:,None]
+
+    return arr
+
+@profiled
+@handle_invalid()
+def aaindex1(X, *, standardize='none', start=1, end=None, on_invalid='raise'):
     """AAIndex1-based physicochemical properties.
 
     AAindex1 ver.9.2 (release Feb, 2017) is a set of 20 numerical values
@@ -38,6 +55,13 @@ def aaindex1(X, *, standardize='none', start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -84,42 +108,19 @@ def aaindex1(X, *, standardize='none', start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # Number of indices
-    LEN = 553
-    
-    # list of amino acids (IUPAC extended)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    
-    # load AAIndex1 data and get index names
-    aaind1 = pd.read_csv(PATH+'aaindex1.csv')
-    desc = aaind1['Description'].values
-    
-    # convert to dict for better performance
-    aaind1 = {aa: aaind1[aa].to_numpy() for aa in amino_acids}
-
-    # initialize empty array with shape (n_samples, 553)
-    arr = np.zeros((len(X), LEN))
+    # get index names
+    desc = load_aaindex1()[0]
 
     # fill array with mean of indices per protein/peptide
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        tmp_arr = np.zeros((LEN, len(seq)) )
-
-        # fill temporary array with indices for each amino acid of the sequence
-        # and compute their mean across all rows
-        for j, aa in enumerate(seq):
-            tmp_arr[:,j] = aaind1[aa]
-
-        # fill rows with mean vector of tmp_arr
-        arr[i,:] = tmp_arr.mean(axis=1)
+    arr = compute_rows(_aaindex1, X, LEN, start=start, end=end)
 
     if standardize == 'none' or arr.shape[0] == 1:
         
         return arr, desc
 
     else:
+        from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
         # standardization
         if standardize == 'zscore':
             scaler = StandardScaler().fit(arr)
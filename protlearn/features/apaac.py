@@ -1,14 +1,39 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from collections import Counter
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import load_paac
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# intermediates consumed by _apaac (see FeaturePipeline)
+INTERMEDIATES = ['counts', 'lag_sum']
+
+def _apaac(X, lambda_, w, start, end):
+    """Amphiphilic pseudo amino acid composition of each sequence."""
+    batch = Batch.of(X)
+    lengths = batch.lengths(start, end)
+    data = load_paac()
+
+    # hydrophobicity and hydrophilicity correlation factors
+    tau = np.zeros((len(X), 2*lambda_))
+    for n in range(1, lambda_+1):
+        for j, name in enumerate(['apaac_hphob', 'apaac_hphil']):
+            prod = np.outer(data[:,j], data[:,j])
+            tau[:,2*(n-1)+j] = batch.lag_sum(start, end, n, name, prod)/(lengths-n)
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+    # computing pseudo amino acid composition
+    denom = (1+w*tau.sum(axis=1))[:,None]
+    return np.hstack([batch.counts(start, end)/denom, (w*tau)/denom])
 
-def apaac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
+@profiled
+@handle_invalid()
+def apaac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None, 
+          on_invalid='raise'):
     """Amphiphilic pseudo amino acid composition.
 
     This feature has the same form as the vanilla amino acid composition, but 
@@ -43,6 +68,13 @@ def apaac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -108,43 +140,15 @@ def apaac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # load data
-    df = pd.read_csv(PATH+'paac.csv')
-    data = np.asarray(df.iloc[:,1:])
-
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    desc = [aa for aa in amino_acids]
+    desc = [aa for aa in AMINO_ACIDS]
 
     for n in range(1, lambda_+1):
         desc.append('lambda_hphob' + str(n))
         desc.append('lambda_hphil' + str(n))
-    
-    # normalization
-    for i in range(data.shape[1]):
-        mean = np.mean(data[:,i])
-        denom = np.sqrt(sum([(j-mean)**2 for j in data[:,i]])/20)
-        data[:,i] = [(j-mean)/denom for j in data[:,i]]
-
-    aa_dict = {amino_acids[i]: data[i,:] for i in range(20)}
 
     # computing pseudo amino acid composition
-    arr = np.zeros((len(X),len(amino_acids)+2*lambda_))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        tau = []
-        for n in range(1, lambda_+1):
-            for j in range(2):
-                tau.append(
-                    sum([aa_dict[seq[k]][j]*aa_dict[seq[k+n]][j] \
-                         for k in range(len(seq)-n)])/(len(seq)-n))
-        
-        cnt = Counter(seq)
-        apse_aac = [cnt[aa] / (1+w * sum(tau)) for aa in amino_acids]
-        apse_aac = apse_aac + [(w*j) / (1+w * sum(tau)) for j in tau]
-        arr[i,:] = apse_aac
+    arr = compute_rows(_apaac, X, len(desc), lambda_=lambda_, w=w, 
+                       start=start, end=end)
 
     # delete zero columns
     if remove_zero_cols:
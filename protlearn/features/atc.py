@@ -1,13 +1,23 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
-
-PATH = pkg_resources.resource_filename(__name__, 'data/')
-
-def atc(X, *, method='relative', start=1, end=None):
+from ._batch import Batch
+from ._data import load_atc
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# intermediates consumed by _atc (see FeaturePipeline)
+INTERMEDIATES = ['counts']
+
+def _atc(X, start, end):
+    """Absolute atomic (first 5 columns) and bond (last 3 columns) 
+    composition of each sequence."""
+    return Batch.of(X).counts(start, end) @ load_atc()
+
+@profiled
+@handle_invalid(n_arrays=2)
+def atc(X, *, method='relative', start=1, end=None, on_invalid='raise'):
     """Atomic and bond composition.
     
     This function returns the sum of atomic and bond compositions for each
@@ -33,6 +43,13 @@ def atc(X, *, method='relative', start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -75,23 +92,10 @@ def atc(X, *, method='relative', start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # load data
-    df = pd.read_csv(PATH+'atc.csv')
-    data = np.asarray(df.iloc[:,1:])
-
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    atc_dict = {amino_acids[i]: data[i,:] for i in range(20)}
-
     # compute atomic and bond composition
-    arr_atoms = np.zeros((len(X), 5))
-    arr_bonds = np.zeros((len(X), 3))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        arr_atoms[i,:] = sum([atc_dict[aa][:5] for aa in seq]) 
-        arr_bonds[i,:] = sum([atc_dict[aa][5:] for aa in seq]) 
+    arr = compute_rows(_atc, X, 8, start=start, end=end)
+    arr_atoms = arr[:,:5]
+    arr_bonds = arr[:,5:]
     
     if method == 'absolute':
         return arr_atoms, arr_bonds
@@ -1,9 +1,30 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# intermediates consumed by _binary (see FeaturePipeline)
+INTERMEDIATES = ['sliced']
+
+def _binary(X, max_len, start, end):
+    """Binary profile pattern of each sequence, padded to max_len."""
+    aa_dict = {aa: i for i, aa in enumerate(AMINO_ACIDS)}
+    arr = np.zeros((len(X), len(AMINO_ACIDS)*max_len))
+    for i, seq in enumerate(Batch.of(X).sliced(start, end)):
+        binary = [aa_dict[aa]+x*20 for x, aa in enumerate(seq)]
+        arr[i,binary] = 1
 
-def binary(X, *, padding=True, start=1, end=None):
+    return arr
+
+@profiled
+@handle_invalid()
+def binary(X, *, padding=True, start=1, end=None, on_invalid='raise'):
     """Binary profile pattern.
 
     This function returns the binary profile pattern for each amino acid 
@@ -28,6 +49,13 @@ def binary(X, *, padding=True, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -81,10 +109,6 @@ def binary(X, *, padding=True, start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    aa_dict = {aa: i for i, aa in enumerate(amino_acids)}
-
     # define maximum length 
     l = [len(seq) for seq in X]
     max_len = max(l)
@@ -92,12 +116,7 @@ def binary(X, *, padding=True, start=1, end=None):
         raise ValueError('Sequences must be of equal length or padded!')
         
     # compute binary profile pattern
-    arr = np.zeros((len(X), len(amino_acids)*max_len))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        binary = [aa_dict[aa]+x*20 for x, aa in enumerate(seq)]
-        arr[i,binary] = 1
+    arr = compute_rows(_binary, X, len(AMINO_ACIDS)*max_len, max_len=max_len,
+                       start=start, end=end)
 
     return arr
\ No newline at end of file
@@ -1,11 +1,23 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-import re
 import numpy as np
 from itertools import product
-from ..utils.validation import check_input, check_alpha, check_natural
-
-def cksaap(X, *, k=1, remove_zero_cols=False, start=1, end=None):
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# intermediates consumed by _cksaap (see FeaturePipeline)
+INTERMEDIATES = ['pair_counts']
+
+def _cksaap(X, k, start, end):
+    """Counts of each k-spaced amino acid pair in each sequence."""
+    return Batch.of(X).pair_counts(start, end, k+1).astype(int)
+
+@profiled
+@handle_invalid()
+def cksaap(X, *, k=1, remove_zero_cols=False, start=1, end=None, 
+           on_invalid='raise'):
     """Composition of k-spaced amino acid pairs.
 
     This function returns the k-spaced amino acid pair composition of each 
@@ -38,6 +50,13 @@ def cksaap(X, *, k=1, remove_zero_cols=False, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -79,22 +98,14 @@ def cksaap(X, *, k=1, remove_zero_cols=False, start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # initialize empty array 
-    arr = np.empty((len(X), 400), dtype=int)
-    
     # list of amino acids (IUPAC standard)
     amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
     doublets = sorted([c[0]+c[1] for c in product(amino_acids, repeat=2)])
     patterns = [doublets[i][0]+'.'*k+doublets[i][1] for i in range(len(doublets))]
 
     # compute CKSAAP
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        for j, pattern in enumerate(patterns):
-            cnt_pattern = len(re.findall(r'(?=('+pattern+'))', seq))
-            arr[i, j] = cnt_pattern
+    arr = compute_rows(_cksaap, X, len(patterns), dtype=int, 
+                       k=k, start=start, end=end)
             
     # delete zero columns
     if remove_zero_cols:
@@ -3,9 +3,38 @@
 import numpy as np
 from collections import Counter
 from itertools import product
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# define classes
+CLASSES = {'A': 1, 'G': 1, 'V': 1,
+           'I': 2, 'L': 2, 'F': 2, 'P': 2,
+           'Y': 3, 'M': 3, 'T': 3, 'S': 3,
+           'H': 4, 'N': 4, 'Q': 4, 'W': 4,
+           'R': 5, 'K': 5,
+           'D': 6, 'E': 6,
+           'C': 7}
+
+# intermediates consumed by _ctd (see FeaturePipeline)
+INTERMEDIATES = ['sliced']
+
+def _ctd(X, ctd_list, start, end):
+    """Conjoint triad counts of each sequence."""
+    ctd_dict = {triad: i for i, triad in enumerate(ctd_list)}
+    arr = np.zeros((len(X), len(ctd_list)))
+    for i, seq in enumerate(Batch.of(X).sliced(start, end)):
+        seq = ''.join([str(CLASSES[aa]) for aa in seq])
+        keys = [seq[x:x+3] for x in range(len(seq)-2)]
+        for key, cnt in Counter(keys).items():
+            arr[i, ctd_dict[key]] = cnt
+
+    return arr
 
-def ctd(X, *, start=1, end=None):
+@profiled
+@handle_invalid()
+def ctd(X, *, start=1, end=None, on_invalid='raise'):
     """Conjoint triad descriptors.
 
     These descriptors were initially developed to model protein-protein
@@ -28,6 +57,13 @@ def ctd(X, *, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -60,36 +96,9 @@ def ctd(X, *, start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # define classes
-    classes = {'A': 1, 'G': 1, 'V': 1,
-               'I': 2, 'L': 2, 'F': 2, 'P': 2,
-               'Y': 3, 'M': 3, 'T': 3, 'S': 3,
-               'H': 4, 'N': 4, 'Q': 4, 'W': 4,
-               'R': 5, 'K': 5,
-               'D': 6, 'E': 6,
-               'C': 7}
-
     # compute CTD
     ctd_list = [''.join(i) for i in product('1234567', repeat=3)]
-    ctd = {ctd_list[i]: [] for i in range(len(ctd_list))}
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        seq = ''.join([str(classes[aa]) for aa in seq])
-        keys = [seq[x:x+3] for x in range(len(seq)-2)]
-        unq = set(keys)
-        other = ctd.keys()-unq
-        ctd_vals = sorted(Counter(keys).items())
-        vals = [i[1] for i in ctd_vals]
-
-        for num, j in enumerate(unq):
-            if j in ctd:
-                ctd[j].append(vals[num])
-            
-        for k in other:
-            ctd[k].append(0)
-    
-    arr = np.array(list(ctd.values()), dtype=float).T
+    arr = compute_rows(_ctd, X, len(ctd_list), ctd_list=ctd_list, 
+                       start=start, end=end)
     
     return arr, ctd_list
\ No newline at end of file
@@ -1,13 +1,30 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import load_ctd
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+# intermediates consumed by _ctdc (see FeaturePipeline)
+INTERMEDIATES = ['counts']
 
-def ctdc(X, *, start=1, end=None):
+def _ctdc(X, start, end):
+    """CTD composition of each sequence."""
+    batch = Batch.of(X)
+
+    # indicator matrix of shape (20, 3*n_categories) mapping each amino acid
+    # to its group in each category
+    groups = load_ctd()[1]
+    onehot = np.eye(3)[groups.T].reshape(20, -1)
+
+    # compute CTD composition
+    return batch.counts(start, end) @ onehot / batch.lengths(start, end)[:,None]
+
+@profiled
+@handle_invalid()
+def ctdc(X, *, start=1, end=None, on_invalid='raise'):
     """Composition/Transition/Distribution - Composition.
 
     Amino acids are categorized into 3 groups based on their physicochemical 
@@ -38,6 +55,13 @@ def ctdc(X, *, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -127,28 +151,11 @@ def ctdc(X, *, start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # load data
-    df = pd.read_csv(PATH+'ctd.csv')
-
     # get groups
-    categories = list(df.Category)
+    categories = load_ctd()[0]
     desc = [cat+'-G{}'.format(i) for cat in categories for i in range(1,4)]
-    group1 = {df['Category'][i]: df['Group1'][i] for i in range(df.shape[0])}
-    group2 = {df['Category'][i]: df['Group2'][i] for i in range(df.shape[0])}
-    group3 = {df['Category'][i]: df['Group3'][i] for i in range(df.shape[0])}
 
     # compute CTD composition
-    arr = np.zeros((len(X), 39))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        tmp=[]
-        for cat in categories:
-            g1 = sum([seq.count(aa) for aa in group1[cat]])/len(seq)
-            g2 = sum([seq.count(aa) for aa in group2[cat]])/len(seq)
-            g3 = sum([seq.count(aa) for aa in group3[cat]])/len(seq)
-            tmp.append([g1, g2, g3])
-        arr[i,:] = [j for sublist in tmp for j in sublist]
+    arr = compute_rows(_ctdc, X, len(desc), start=start, end=end)
         
     return arr, desc
\ No newline at end of file
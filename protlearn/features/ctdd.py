@@ -1,26 +1,55 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
-
-PATH = pkg_resources.resource_filename(__name__, 'data/')
-
-def distribution(seq, g):
-    percentiles = [.25, .5, .75, 1]
-    cnt = seq.count(g)
-    if cnt:
-        inds = [int(cnt*p) for p in percentiles]
-        inds.insert(0, 1)
-        pp = []
-        for ind in inds:
-            pp.append([i for i, n in enumerate(seq) if n == g][ind-1]+1)
-        return [i/len(seq)*100 for i in pp]
-    else:
-        return np.zeros((5,)).tolist()
-
-def ctdd(X, *, start=1, end=None):
+from ._batch import Batch
+from ._data import load_ctd
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# intermediates consumed by _ctdd (see FeaturePipeline)
+INTERMEDIATES = ['groups', 'ids']
+
+# residues whose positions are reported for each group
+PERCENTILES = [.25, .5, .75, 1]
+
+def _ctdd(X, start, end):
+    """CTD distribution of each sequence."""
+    batch = Batch.of(X)
+    offsets = batch.encoded(start, end)[1]
+    lengths = np.diff(offsets)
+    ids = batch.ids(start, end)
+
+    # compute CTD distribution
+    groups = batch.groups(start, end)
+    arr = np.zeros((len(X), len(groups), 3, 5))
+    for c in range(len(groups)):
+        for g in range(3):
+            # positions (one-based) of all residues of group g, and the index 
+            # of the first of them in each sequence
+            occ = np.flatnonzero(groups[c] == g)
+            occ_ids = ids[occ]
+            pos = occ - offsets[occ_ids] + 1
+            cnt = np.bincount(occ_ids, minlength=len(X))
+            first = np.concatenate([[0], np.cumsum(cnt)[:-1]])
+
+            # first residue, followed by the 25%, 50%, 75%, and 100% residues
+            # (a rank of 0 refers to the last residue)
+            inds = [np.ones_like(cnt)] + [(cnt*p).astype(int) for p in PERCENTILES]
+            present = cnt > 0
+            for k, ind in enumerate(inds):
+                ind = np.where(ind == 0, cnt, ind)
+                sel = first[present] + ind[present] - 1
+                arr[present, c, g, k] = pos[sel]/lengths[present]*100
+
+    return arr.reshape(len(X), -1)
+
+@profiled
+@handle_invalid()
+def ctdd(X, *, start=1, end=None, on_invalid='raise'):
     """Composition/Transition/Distribution - Distribution.
 
     Amino acids are categorized into 3 groups based on their physicochemical 
@@ -57,6 +86,13 @@ def ctdd(X, *, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -93,37 +129,14 @@ def ctdd(X, *, start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # load data
-    df = pd.read_csv(PATH+'ctd.csv')
-
     # get groups
-    categories = list(df.Category)
+    categories = load_ctd()[0]
     groups = ['1', '2', '3']
     percentiles = ['0', '25', '50', '75', '100']
     desc = [cat+'-G{}'.format(i) for cat in categories for i in groups]
     desc = [d+'D{}'.format(i) for d in desc for i in percentiles]
-    group1 = {df['Category'][i]: df['Group1'][i] for i in range(df.shape[0])}
-    group2 = {df['Category'][i]: df['Group2'][i] for i in range(df.shape[0])}
-    group3 = {df['Category'][i]: df['Group3'][i] for i in range(df.shape[0])}
 
     # compute CTD distribution
-    arr = np.zeros((len(X), 195))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        d = []
-        for cat in categories:
-            # convert sequence to groups (integers)
-            g1 = {aa: '1' for aa in group1[cat]}
-            g2 = {aa: '2' for aa in group2[cat]}
-            g3 = {aa: '3' for aa in group3[cat]}
-            g = {**g1, **g2, **g3}
-            conv = ''.join([g[aa] for aa in seq])
-            d1 = distribution(conv, '1')
-            d2 = distribution(conv, '2')
-            d3 = distribution(conv, '3')
-            d.append(i for j in [d1, d2, d3] for i in j)
-        arr[i,:] = [j for sublist in d for j in sublist]
+    arr = compute_rows(_ctdd, X, len(desc), start=start, end=end)
         
     return arr, desc
\ No newline at end of file
@@ -1,13 +1,38 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import load_ctd
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# group pairs counted as transitions 1221, 1331, and 2332
+TRANSITIONS = [(0, 1), (0, 2), (1, 2)]
+
+# intermediates consumed by _ctdt (see FeaturePipeline)
+INTERMEDIATES = ['pair_counts']
+
+def _ctdt(X, start, end):
+    """CTD transition of each sequence."""
+    batch = Batch.of(X)
+
+    # indicator matrix of shape (400, 3*n_categories) mapping each pair of 
+    # adjacent amino acids to the transition it represents in each category
+    groups = load_ctd()[1]
+    trans = np.zeros((20, 20, len(groups), 3))
+    for k, (g1, g2) in enumerate(TRANSITIONS):
+        mask = (groups[:,:,None] == g1) & (groups[:,None,:] == g2)
+        mask |= (groups[:,:,None] == g2) & (groups[:,None,:] == g1)
+        trans[...,k] = mask.transpose(1, 2, 0)
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+    # compute CTD transition
+    pairs = batch.pair_counts(start, end, 1)
+    return pairs @ trans.reshape(400, -1) / (batch.lengths(start, end)[:,None]-1)
 
-def ctdt(X, *, start=1, end=None):
+@profiled
+@handle_invalid()
+def ctdt(X, *, start=1, end=None, on_invalid='raise'):
     """Composition/Transition/Distribution - Transition.
 
     Amino acids are categorized into 3 groups based on their physicochemical 
@@ -39,6 +64,13 @@ def ctdt(X, *, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -129,34 +161,11 @@ def ctdt(X, *, start=1, end=None):
     # input handling
     X = check_input(X)
 
-    # load data
-    df = pd.read_csv(PATH+'ctd.csv')
-
     # get groups
-    categories = list(df.Category)
+    categories = load_ctd()[0]
     desc = [cat+'-T{}'.format(i) for cat in categories for i in ['1221','1331','2332']]
-    group1 = {df['Category'][i]: df['Group1'][i] for i in range(df.shape[0])}
-    group2 = {df['Category'][i]: df['Group2'][i] for i in range(df.shape[0])}
-    group3 = {df['Category'][i]: df['Group3'][i] for i in range(df.shape[0])}
 
     # compute CTD transition
-    arr = np.zeros((len(X), 39))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        cnts = []
-        for cat in categories:
-            # convert sequence to groups (integers)
-            g1 = {aa: '1' for aa in group1[cat]}
-            g2 = {aa: '2' for aa in group2[cat]}
-            g3 = {aa: '3' for aa in group3[cat]}
-            g = {**g1, **g2, **g3}
-            conv = ''.join([g[aa] for aa in seq])
-            t1221 = (conv.count('12') + conv.count('21'))/(len(seq)-1)
-            t1331 = (conv.count('13') + conv.count('31'))/(len(seq)-1)
-            t2332 = (conv.count('23') + conv.count('32'))/(len(seq)-1)
-            cnts.append([t1221, t1331, t2332])
-        arr[i,:] = [j for sublist in cnts for j in sublist]
+    arr = compute_rows(_ctdt, X, len(desc), start=start, end=end)
         
     return arr, desc
\ No newline at end of file
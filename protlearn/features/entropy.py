@@ -1,11 +1,26 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from collections import Counter
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-def entropy(X, *, standardize='none', start=1, end=None):
+# intermediates consumed by _entropy (see FeaturePipeline)
+INTERMEDIATES = ['counts']
+
+def _entropy(X, start, end):
+    """Shannon entropy of each sequence."""
+    batch = Batch.of(X)
+    freq = batch.counts(start, end) / batch.lengths(start, end)[:,None]
+    ent = np.zeros_like(freq)
+    np.multiply(freq, np.log2(freq, where=freq>0, out=ent), out=ent)
+
+    return -ent.sum(axis=1, keepdims=True)
+
+@profiled
+@handle_invalid()
+def entropy(X, *, standardize='none', start=1, end=None, on_invalid='raise'):
     """Shannon entropy.
 
     This function computes the Shannon entropy for each sequence in the 
@@ -31,6 +46,13 @@ def entropy(X, *, standardize='none', start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -51,17 +73,8 @@ def entropy(X, *, standardize='none', start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # initialize empty array with shape (n_samples, 1)
-    arr = np.zeros((len(X), 1))
-    
     # compute shannon entropy
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        seq = seq[start-1:end] # positional information
-        cnt = Counter(seq)
-        ent_aa = {k: (cnt[k]/len(seq))*np.log2(cnt[k]/len(seq)) for k in cnt.keys()}
-        arr[i] = -sum(ent_aa.values())
+    arr = compute_rows(_entropy, X, 1, start=start, end=end)
         
     if len(arr) == 1:
         return arr[0][0]
@@ -70,9 +83,11 @@ def entropy(X, *, standardize='none', start=1, end=None):
         return arr
 
     elif standardize == 'zscore':
+        from sklearn.preprocessing import StandardScaler
         scaler = StandardScaler().fit(arr)
         return scaler.transform(arr)
     
     elif standardize == 'minmax':
+        from sklearn.preprocessing import MinMaxScaler
         scaler = MinMaxScaler().fit(arr)
         return scaler.transform(arr)
\ No newline at end of file
@@ -1,10 +1,20 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-import numpy as np
-from sklearn.preprocessing import OneHotEncoder
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-def length(X, *, method='int'):
+# intermediates consumed by _length (see FeaturePipeline)
+INTERMEDIATES = ['encoded']
+
+def _length(X):
+    """Length of each sequence."""
+    return Batch.of(X).lengths(1, None)[:,None].astype(float)
+
+@profiled
+@handle_invalid()
+def length(X, *, method='int', on_invalid='raise'):
     """Sequence length in amino acids.
     
     The number of amino acids that a protein or peptide is comprised of will be
@@ -21,6 +31,13 @@ def length(X, *, method='int'):
         'int' : interval data 
         'ohe' : one-hot encoded data
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -46,11 +63,7 @@ def length(X, *, method='int'):
     X = check_input(X)
     
     # compute lengths
-    arr = np.zeros((len(X), 1))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids 
-        arr[i] = len(seq)
+    arr = compute_rows(_length, X, 1)
 
     if method == 'int':
         # for single sequence return integer
@@ -60,6 +73,7 @@ def length(X, *, method='int'):
         else:
             return arr
     elif method == 'ohe':
+        from sklearn.preprocessing import OneHotEncoder
         encoder = OneHotEncoder(sparse=False)
         arr_ohe = encoder.fit_transform(arr)
         return arr_ohe
\ No newline at end of file
@@ -1,17 +1,34 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import DEFAULT_PROPERTIES as default
+from ..utils.compute import compute_rows
+from ..utils.encoding import segment_sum, lag_pairs
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+# intermediates consumed by _moran (see FeaturePipeline)
+INTERMEDIATES = ['deviations']
 
-# default indices of AAIndex1 (Xiao et al., 2015)
-default = ['CIDH920105', 'BHAR880101', 'CHAM820101', 'CHAM820102',
-           'CHOC760101', 'BIGC670101', 'CHAM810101', 'DAYM780201']
+def _moran(X, d, start, end):
+    """Moran's I autocorrelation of each sequence."""
+    batch = Batch.of(X)
+    lengths = batch.lengths(start, end)[:,None]
+    left, pair_ids = lag_pairs(batch.encoded(start, end)[1], d)
 
-def moran(X, *, d=1, properties=default, start=1, end=None): 
+    # deviations from the mean property value of each sequence
+    dev, sq_dev = batch.deviations(start, end)
+
+    # calculate Moran's I
+    cross = segment_sum((dev[:,left]*dev[:,left+d]).T, pair_ids, len(X))
+    eq1 = 1/(lengths-d)
+    arr = (eq1*cross)/((1/lengths)*sq_dev)
+
+    return arr
+
+@profiled
+@handle_invalid()
+def moran(X, *, d=1, properties=default, start=1, end=None, on_invalid='raise'): 
     """Moran's I based on AAIndex1.
 
     Moran's I autocorrelation descriptors are defined based on the distribution 
@@ -39,6 +56,13 @@ def moran(X, *, d=1, properties=default, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -85,32 +109,7 @@ def moran(X, *, d=1, properties=default, start=1, end=None):
     if d >= min_len:
         raise ValueError('Lag parameter d must be smaller than sequence length!')
     
-    # load data
-    df = pd.read_csv(PATH+'aaindex1.csv').set_index('Description')
-    df = df.reindex(sorted(df.columns), axis=1)
-    data = np.asarray(df.loc[default])
-
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    aadict = {amino_acids[i]: i for i in range(20)}
-
-    # standardization
-    for i in range(data.shape[0]):
-        data[i,:] = [(j-np.mean(data[i,:]))/np.std(data[i,:]) for j in data[i,:]]
-
     # calculate Moran's I
-    arr = np.zeros((len(X), len(default)))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        eq1 = 1/(len(seq)-d)  
-        for j in range(len(default)):
-            p = [data[j, aadict[aa]] for aa in seq]
-            p_prime = sum(p)/len(seq)
-            eq2 = sum([(p[i]-p_prime)*(p[i+d]-p_prime) for i in range(len(seq)-d)])
-            eq3 = sum([(p[i]-p_prime)**2 for i in range(len(seq))])
-
-            arr[i,j] = (eq1*eq2)/((1/len(seq))*eq3)
+    arr = compute_rows(_moran, X, len(default), d=d, start=start, end=end)
             
     return arr
\ No newline at end of file
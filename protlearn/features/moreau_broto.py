@@ -1,17 +1,34 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
-
-PATH = pkg_resources.resource_filename(__name__, 'data/')
-
-# default indices of AAIndex1 (Xiao et al., 2015)
-default = ['CIDH920105', 'BHAR880101', 'CHAM820101', 'CHAM820102',
-           'CHOC760101', 'BIGC670101', 'CHAM810101', 'DAYM780201']
-
-def moreau_broto(X, *, d=1, properties=default, start=1, end=None): 
+from ._batch import Batch
+from ._data import DEFAULT_PROPERTIES as default
+from ..utils.compute import compute_rows
+from ..utils.encoding import segment_sum, lag_pairs
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# intermediates consumed by _moreau_broto (see FeaturePipeline)
+INTERMEDIATES = ['properties']
+
+def _moreau_broto(X, d, start, end):
+    """Normalized Moreau-Broto autocorrelation of each sequence."""
+    batch = Batch.of(X)
+    lengths = batch.lengths(start, end)[:,None]
+    left, pair_ids = lag_pairs(batch.encoded(start, end)[1], d)
+
+    # property values of each residue, shape (n_properties, total_length)
+    p = batch.properties(start, end)
+
+    # calculate normalized Moreau-Broto
+    ac = segment_sum((p[:,left]*p[:,left+d]).T, pair_ids, len(X))
+    arr = ac/(lengths-d) # normalizing
+
+    return arr
+
+@profiled
+@handle_invalid()
+def moreau_broto(X, *, d=1, properties=default, start=1, end=None, 
+                 on_invalid='raise'): 
     """Normalized Moreau-Broto autocorrelation based on AAIndex1.
 
     Moreau-Broto autocorrelation descriptors are defined based on the 
@@ -39,6 +56,13 @@ def moreau_broto(X, *, d=1, properties=default, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -84,30 +108,7 @@ def moreau_broto(X, *, d=1, properties=default, start=1, end=None):
     if d >= min_len:
         raise ValueError('Lag parameter d must be smaller than sequence length!')
     
-    # load data
-    df = pd.read_csv(PATH+'aaindex1.csv').set_index('Description')
-    df = df.reindex(sorted(df.columns), axis=1)
-    data = np.asarray(df.loc[default])
-
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    aadict = {amino_acids[i]: i for i in range(20)}
-
-    # standardization
-    for i in range(data.shape[0]):
-        data[i,:] = [(j-np.mean(data[i,:]))/np.std(data[i,:]) for j in data[i,:]]
-
-    # calculate normalized Moreau-Broto 
-    arr = np.zeros((len(X), len(default)))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        for j in range(len(default)):
-            p = [data[j, aadict[aa]] for aa in seq]
-            ac = sum([(p[i]*p[i+d]) for i in range(len(seq)-d)])
-            ats = ac/(len(seq)-d) # normalizing
-
-            arr[i,j] = ats
+    # calculate normalized Moreau-Broto
+    arr = compute_rows(_moreau_broto, X, len(default), d=d, start=start, end=end)
             
     return arr
\ No newline at end of file
@@ -2,9 +2,27 @@
 
 import re
 import numpy as np
-from ..utils.validation import check_input, check_alpha
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# intermediates consumed by _motif (see FeaturePipeline)
+INTERMEDIATES = ['sliced']
+
+def _motif(X, pattern, start, end):
+    """Presence of a regex pattern in each sequence."""
+    arr = np.zeros((len(X), 1))
+    for i, seq in enumerate(Batch.of(X).sliced(start, end)):
+        present = re.findall(r'{}'.format(pattern), seq)
+        if present:
+            arr[i] = 1
+
+    return arr
 
-def motif(X, pattern, *, start=1, end=None):
+@profiled
+@handle_invalid(natural=False)
+def motif(X, pattern, *, start=1, end=None, on_invalid='raise'):
     """Sequence motifs.
 
     This function returns a binary vector indicating the presence of a specified 
@@ -30,6 +48,13 @@ def motif(X, pattern, *, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -85,12 +110,7 @@ def motif(X, pattern, *, start=1, end=None):
     pattern = pattern.replace('}', ']')
     
     ## compute binary vector of motif presence
-    arr = np.zeros((len(X),))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        seq = seq[start-1:end] # positional information
-        present = re.findall(r'{}'.format(pattern), seq)
-        if present:
-            arr[i] = 1
+    arr = compute_rows(_motif, X, 1, natural=False, pattern=pattern, 
+                       start=start, end=end)
             
-    return arr
\ No newline at end of file
+    return arr[:,0]
\ No newline at end of file
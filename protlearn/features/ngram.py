@@ -2,9 +2,33 @@
 
 import numpy as np
 from itertools import product
-from ..utils.validation import check_input, check_alpha, check_natural
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.encoding import lag_pairs
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
-def ngram(X, *, n=2, method='relative', start=1, end=None):
+# intermediates consumed by _ngram (see FeaturePipeline)
+INTERMEDIATES = ['pair_counts', 'encoded']
+
+def _ngram(X, n, start, end):
+    """Absolute n-gram counts of each sequence."""
+    batch = Batch.of(X)
+    if n == 2:
+        return batch.pair_counts(start, end, 1)
+
+    # triplets of consecutive residues
+    codes, offsets = batch.encoded(start, end)
+    left, ids = lag_pairs(offsets, 2)
+    codes = codes.astype(np.intp)
+    triplets = codes[left]*400 + codes[left+1]*20 + codes[left+2]
+    arr = np.bincount(ids*8000 + triplets, minlength=len(X)*8000)
+
+    return arr.reshape(len(X), 8000).astype(float)
+
+@profiled
+@handle_invalid()
+def ngram(X, *, n=2, method='relative', start=1, end=None, on_invalid='raise'):
     """N-gram composition.
     
     This function computes the di- or tripeptide composition of amino acid 
@@ -34,6 +58,13 @@ def ngram(X, *, n=2, method='relative', start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
         
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
     
@@ -74,19 +105,10 @@ def ngram(X, *, n=2, method='relative', start=1, end=None):
     # compute n-gram combinations
     amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
     combo = [''.join(i) for i in product(amino_acids, repeat=n)]
-    combo_dict = {combo[i]: i for i in range(len(combo))}
-    
-    # initialize empty array
-    arr = np.zeros((len(X), 20**n))
-    
+
     # compute n-gram composition
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical
-        check_natural(seq) # check for unnatural amino acids  
-        seq = seq[start-1:end] # positional information
-        for j in range(len(seq)-(n-1)):
-            tmp = combo_dict[seq[j:j+n]]
-            arr[i, tmp] += 1
+    arr = compute_rows(_ngram, X, len(combo), n=n, 
+                       start=start, end=end)
                     
     if method=='absolute':
         return arr, combo
@@ -1,14 +1,43 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from collections import Counter
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
+from ._batch import Batch
+from ._data import load_paac
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+def _correlation():
+    """Mean squared difference of the normalized properties of each pair of
+    amino acids, shape (20, 20)."""
+    data = load_paac()
+    return ((data[:,None,:] - data[None,:,:])**2).sum(axis=2) / data.shape[1]
+
+# intermediates consumed by _paac (see FeaturePipeline)
+INTERMEDIATES = ['counts', 'lag_sum']
+
+def _paac(X, lambda_, w, start, end):
+    """Pseudo amino acid composition of each sequence."""
+    batch = Batch.of(X)
+    lengths = batch.lengths(start, end)
+    corr = _correlation()
+
+    # sequence-order correlation factors
+    theta = np.zeros((len(X), lambda_))
+    for n in range(1, lambda_+1):
+        theta[:,n-1] = batch.lag_sum(start, end, n, 'paac', corr)/(lengths-n)
 
-PATH = pkg_resources.resource_filename(__name__, 'data/')
+    # computing pseudo amino acid composition
+    denom = (1+w*theta.sum(axis=1))[:,None]
+    return np.hstack([batch.counts(start, end)/denom, (w*theta)/denom])
 
-def paac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
+@profiled
+@handle_invalid()
+def paac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None, 
+         on_invalid='raise'):
     """Pseudo amino acid composition.
 
     Similar to the vanilla amino acid composition, this feature characterizes 
@@ -45,6 +74,13 @@ def paac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -91,46 +127,14 @@ def paac(X, *, lambda_=30, w=.05, remove_zero_cols=False, start=1, end=None):
     # input handling
     X = check_input(X)
     
-    # load data
-    df = pd.read_csv(PATH+'paac.csv')
-    data = np.asarray(df.iloc[:,1:])
-
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    desc = [aa for aa in amino_acids]
+    desc = [aa for aa in AMINO_ACIDS]
 
     for n in range(1, lambda_+1):
         desc.append('lambda' + str(n))
-    
-    # normalization
-    for i in range(data.shape[1]):
-        mean = np.mean(data[:,i])
-        denom = np.sqrt(sum([(j-mean)**2 for j in data[:,i]])/20)
-        data[:,i] = [(j-mean)/denom for j in data[:,i]]
-
-    aa_dict = {amino_acids[i]: data[i,:] for i in range(20)}
-
-    # correlation function
-    def corr(aa1, aa2, data):
-        return sum([(aa_dict[aa1][i] - aa_dict[aa2][i])**2 \
-                    for i in range(data.shape[1])]) / data.shape[1]
 
     # computing pseudo amino acid composition
-    arr = np.zeros((len(X),len(amino_acids)+lambda_))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information
-        theta = []
-        for n in range(1, lambda_+1):
-            theta.append(
-                sum([corr(seq[j], seq[j+n], data) \
-                     for j in range(len(seq)-n)])/(len(seq)-n))
-        
-        cnt = Counter(seq)
-        pse_aac = [cnt[aa] / (1+w * sum(theta)) for aa in amino_acids]
-        pse_aac = pse_aac + [(w*j) / (1+w * sum(theta)) for j in theta]
-        arr[i,:] = pse_aac
+    arr = compute_rows(_paac, X, len(desc), lambda_=lambda_, w=w, 
+                       start=start, end=end)
 
     # delete zero columns
     if remove_zero_cols:
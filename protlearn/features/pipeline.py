@@ -0,0 +1,189 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from importlib import import_module
+from ._batch import Batch, _active, schedule
+from ._data import DEFAULT_PROPERTIES
+from .._config import get_config
+from .._profiling import profiled
+from ..utils.compute import unique_sequences, _unique
+from ..utils.validation import check_input, handle_invalid, _checked
+
+# modules of the feature functions available as pipeline steps
+MODULES = {name: import_module('.'+name, __package__) for name in 
+           ['aac', 'aaindex1', 'apaac', 'atc', 'binary', 'cksaap', 'ctd', 
+            'ctdc', 'ctdd', 'ctdt', 'entropy', 'geary', 'length', 'moran', 
+            'moreau_broto', 'motif', 'ngram', 'paac', 'posrich', 'qso', 
+            'socn']}
+
+# columns of atc
+ATOMS = ['C', 'H', 'N', 'O', 'S']
+BONDS = ['total', 'single', 'double']
+
+def _as_blocks(name, out, n_samples):
+    """Convert the output of a feature function to a list of (arr, desc)
+    blocks, where arr is 2-dimensional and desc holds one name per column
+    (None for single-column features)."""
+
+    # (arr, desc)
+    if name in ['aac', 'aaindex1', 'apaac', 'cksaap', 'ctd', 'ctdc', 'ctdd',
+                'ctdt', 'ngram', 'paac']:
+        arr, desc = out
+        return [(arr, list(desc))]
+
+    elif name == 'atc':
+        return [(out[0], ATOMS), (out[1], BONDS)]
+
+    elif name == 'socn':
+        d = out[0].shape[1]
+        return [(out[0], ['sw_d{}'.format(i) for i in range(1, d+1)]),
+                (out[1], ['g_d{}'.format(i) for i in range(1, d+1)])]
+
+    elif name == 'qso':
+        return [(out[0], ['sw_'+i for i in out[2]]),
+                (out[1], ['g_'+i for i in out[2]])]
+
+    elif name in ['moran', 'geary', 'moreau_broto']:
+        return [(out, DEFAULT_PROPERTIES)]
+
+    # single values, 1-dimensional arrays, or arrays without descriptors
+    arr = np.reshape(out, (n_samples, -1))
+    if arr.shape[1] == 1:
+        return [(arr, [None])]
+    return [(arr, [str(i) for i in range(arr.shape[1])])]
+
+class FeaturePipeline:
+    """Compute several feature sets in a single pass.
+
+    The sequences are checked, validated, and integer-encoded only once, and
+    intermediate results shared between feature functions (e.g. amino acid
+    counts, lagged residue-pair statistics, or property tracks) are computed
+    once and reused by every step that requires them. For instance, aac,
+    paac, apaac, and qso all share the same amino acid counts, while paac,
+    apaac, socn, and qso share the lagged sums over residue pairs. Each 
+    intermediate is freed as soon as the last step consuming it has run, 
+    which keeps peak memory bounded.
+
+    Parameters
+    ----------
+
+    steps : list of tuples
+        Feature functions to compute, in order, given as (name, params) where
+        name is the name of a function in protlearn.features and params is a
+        dict of keyword arguments (or None). Names must be unique.
+
+    on_invalid : string, default='raise'
+        Policy for sequences that are not comprised of natural amino acids,
+        applied to the stacked output of all steps (see e.g. aac).
+
+    Notes
+    -----
+
+    Intermediate results are shared within the calling process. With
+    protlearn.set_config(n_jobs>1), each step is parallelized on its own as
+    usual.
+
+    Examples
+    --------
+
+    >>> from protlearn.features import FeaturePipeline
+    >>> seqs = ['ARKLY', 'EERKPGL']
+    >>> pipe = FeaturePipeline([('aac', {'method': 'absolute'}),
+    ...                         ('paac', {'lambda_': 3}),
+    ...                         ('length', None)])
+    >>> arr, desc = pipe.transform(seqs)
+    >>> arr.shape
+    (2, 44)
+    >>> desc[:3], desc[-4:]
+    (['aac_A', 'aac_C', 'aac_D'],
+     ['paac_lambda1', 'paac_lambda2', 'paac_lambda3', 'length'])
+
+    """
+
+    def __init__(self, steps, on_invalid='raise'):
+        names = [step[0] for step in steps]
+        for name in names:
+            if name not in MODULES:
+                raise ValueError("Unknown feature function %r. Valid options "
+                                 "are %r." % (name, sorted(MODULES)))
+        if len(set(names)) != len(names):
+            raise ValueError('Names of pipeline steps must be unique!')
+        self.steps = [(name, dict(params or {})) for name, params in steps]
+        if any('on_invalid' in params for _, params in self.steps):
+            raise ValueError('on_invalid applies to the whole pipeline and '
+                             'cannot be set per step!')
+        self.on_invalid = on_invalid
+
+        # intermediates that can be freed after each step
+        self._release = schedule([MODULES[name].INTERMEDIATES 
+                                  for name in names])
+
+    def __repr__(self):
+        if self.on_invalid != 'raise':
+            return 'FeaturePipeline(%r, on_invalid=%r)' % (self.steps, 
+                                                           self.on_invalid)
+        return 'FeaturePipeline(%r)' % (self.steps,)
+
+    @profiled
+    def transform(self, X):
+        """Compute all feature sets.
+
+        Parameters
+        ----------
+
+        X : string, fasta, or a list thereof
+            Dataset of amino acid sequences.
+
+        Returns
+        -------
+
+        arr : ndarray of shape (n_samples, n_features)
+            Horizontally stacked outputs of all steps.
+
+        desc : list of length n_features
+            Column names of arr, given as the step name followed by the
+            descriptor returned by the respective function.
+
+        mask : ndarray of shape (n_samples,)
+            Valid sequences, only returned if on_invalid is 'mask'.
+
+        """
+
+        return handle_invalid()(self._transform)(X, 
+                                                 on_invalid=self.on_invalid)
+
+    def _transform(self, X):
+        # input handling
+        X = check_input(X)
+
+        # share intermediate results (and, with protlearn.set_config(dedup=True),
+        # the unique sequences) between all steps
+        if get_config()['dedup']:
+            X_unique, inverse = unique_sequences(X)
+            unique_token = _unique.set((X, X_unique, inverse))
+            batch = Batch(X_unique if len(X_unique) < len(X) else X)
+        else:
+            unique_token = None
+            batch = Batch(X)
+        token = _active.set(batch)
+        checked_token = _checked.set((X, set()))
+        try:
+            blocks = []
+            for (name, params), release in zip(self.steps, self._release):
+                out = getattr(MODULES[name], name)(X, **params)
+                blocks += [(arr, [name if d is None else name+'_'+str(d)
+                                  for d in desc])
+                           for arr, desc in _as_blocks(name, out, len(X))]
+
+                # free intermediates that no later step consumes
+                batch.release(release)
+        finally:
+            _checked.reset(checked_token)
+            _active.reset(token)
+            if unique_token is not None:
+                _unique.reset(unique_token)
+
+        arr = np.hstack([np.asarray(arr, dtype=float) for arr, _ in blocks])
+        desc = [d for _, desc in blocks for d in desc]
+
+        return arr, desc
@@ -1,12 +1,42 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-import os
 import numpy as np
-from ..utils.validation import check_input, check_alpha, check_natural
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
 
+# intermediates consumed by the kernels (see FeaturePipeline)
+INTERMEDIATES = []
 
+def _posrich_single(X, position, aminoacid):
+    """Presence of a single amino acid at a given position in each 
+    sequence."""
+    arr = np.zeros((len(X), 1))
+    for a, seq in enumerate(X):
+        for i, aa in enumerate(seq):
+            if i == position-1 and aa == aminoacid:
+                arr[a] = 1
 
-def posrich(X, *, position, aminoacid):
+    return arr
+
+def _posrich_multiple(X, position, aminoacid):
+    """Presence of multiple amino acids at given positions in each 
+    sequence."""
+    arr = np.zeros((len(X), len(position)))
+    for a, seq in enumerate(X):
+        for i in range(len(position)):
+            if seq[position[i]-1] == aminoacid[i]:
+                arr[a, i] = 1
+
+    return arr
+
+def _single(position, aminoacid, **kwargs):
+    """Whether posrich is called for a single position."""
+    return isinstance(position, int) and isinstance(aminoacid, str)
+
+@profiled
+@handle_invalid(natural=lambda **kwargs: not _single(**kwargs))
+def posrich(X, *, position, aminoacid, on_invalid='raise'):
     """Position-specific amino acids.
 
     This function returns a binary vector or matrix in which ones indicate the 
@@ -25,6 +55,13 @@ def posrich(X, *, position, aminoacid):
     aminoacid : string or list
         String or list of strings indicating the amino acid(s) of interest.
         
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
     
@@ -54,30 +91,18 @@ def posrich(X, *, position, aminoacid):
     # input handling
     X = check_input(X)
     
-    if isinstance(position, int) and isinstance(aminoacid, str):
-        arr = np.zeros((len(X),))
-        for a, seq in enumerate(X):
-            if str.isalpha(seq) == True:
-                pass
-            else:
-                raise ValueError('Data type must be string!')
-            for i, aa in enumerate(seq):
-                if i == position-1 and aa == aminoacid:
-                    arr[a] = 1
-        return arr
+    if _single(position, aminoacid):
+        arr = compute_rows(_posrich_single, X, 1, natural=False, 
+                           position=position, aminoacid=aminoacid)
+        return arr[:,0]
     
     elif isinstance(position, list) and isinstance(aminoacid, list):
     
         if len(position) != len(aminoacid):
             raise ValueError("Number of positions does not match number of amino acids")
 
-        arr = np.zeros((len(X), len(position)))
-        for a, seq in enumerate(X):
-            check_alpha(seq) # check if alphabetical  
-            check_natural(seq) # check for unnatural amino acids
-            for i in range(len(position)):
-                if seq[position[i]-1] == aminoacid[i]:
-                    arr[a, i] = 1
+        arr = compute_rows(_posrich_multiple, X, len(position), 
+                           position=position, aminoacid=aminoacid)
         return arr
     
     else:
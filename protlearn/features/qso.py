@@ -1,12 +1,34 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from collections import Counter
-from .socn import socn
-from ..utils.validation import check_input, check_alpha, check_natural
-
-def qso(X, *, d=30, w=.1, remove_zero_cols=False, start=1, end=None): 
+from .socn import _socn
+from ._batch import Batch
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# intermediates consumed by _qso (see FeaturePipeline)
+INTERMEDIATES = ['counts', 'lag_sum']
+
+def _qso(X, d, w, start, end):
+    """Schneider-Wrede (first 20+d columns) and Grantham (last 20+d 
+    columns) quasi-sequence-order of each sequence."""
+    counts = Batch.of(X).counts(start, end)
+    socn_arr = _socn(X, d, start, end)
+    arr = []
+    for tau in [socn_arr[:,:d], socn_arr[:,d:]]:
+        denom = (1+w*tau.sum(axis=1))[:,None]
+        arr += [counts/denom, (w*tau)/denom]
+
+    return np.hstack(arr)
+
+@profiled
+@handle_invalid(n_arrays=2)
+def qso(X, *, d=30, w=.1, remove_zero_cols=False, start=1, end=None, 
+        on_invalid='raise'): 
     """Quasi-sequence-order.
 
     This feature is derived from the distance matrix between the 20 amino acids.
@@ -38,6 +60,13 @@ def qso(X, *, d=30, w=.1, remove_zero_cols=False, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -95,32 +124,15 @@ def qso(X, *, d=30, w=.1, remove_zero_cols=False, start=1, end=None):
     if d >= min_len:
         raise ValueError('Lag parameter d must be smaller than sequence length!')
     
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    desc = [aa for aa in amino_acids]
+    desc = [aa for aa in AMINO_ACIDS]
     
     for n in range(1, d+1):
         desc.append('d' + str(n))
 
     # calculate QSO
-    arr_sw = np.zeros((len(X), len(amino_acids)+d))
-    arr_g = np.zeros((len(X), len(amino_acids)+d))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical  
-        check_natural(seq) # check for unnatural amino acids
-        seq = seq[start-1:end] # positional information 
-        socn_sw = socn(seq, d=d)[0]
-        socn_g = socn(seq, d=d)[1]
-        
-        cnt = Counter(seq)
-        
-        qso_sw = [cnt[aa] / (1+w * sum(socn_sw[0])) for aa in amino_acids]
-        qso_sw = qso_sw + [(w*j) / (1+w * sum(socn_sw[0])) for j in socn_sw[0]]
-        arr_sw[i,:] = qso_sw
-        
-        qso_g = [cnt[aa] / (1+w * sum(socn_g[0])) for aa in amino_acids]
-        qso_g = qso_g + [(w*j) / (1+w * sum(socn_g[0])) for j in socn_g[0]]
-        arr_g[i,:] = qso_g
+    arr = compute_rows(_qso, X, 2*len(desc), d=d, w=w, start=start, end=end)
+    arr_sw = arr[:,:len(desc)]
+    arr_g = arr[:,len(desc):]
 
     # delete zero columns
     if remove_zero_cols:
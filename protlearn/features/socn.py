@@ -1,13 +1,30 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-import pandas as pd
-from ..utils.validation import check_input, check_alpha, check_natural
-import pkg_resources
-
-PATH = pkg_resources.resource_filename(__name__, 'data/')
-
-def socn(X, *, d=30, start=1, end=None): 
+from ._batch import Batch
+from ._data import load_distance
+from ..utils.compute import compute_rows
+from ..utils.validation import check_input, handle_invalid
+from .._profiling import profiled
+
+# intermediates consumed by _socn (see FeaturePipeline)
+INTERMEDIATES = ['lag_sum']
+
+def _socn(X, d, start, end):
+    """Schneider-Wrede (first d columns) and Grantham (last d columns) 
+    sequence-order-coupling numbers of each sequence."""
+    batch = Batch.of(X)
+    arr = np.zeros((len(X), 2*d))
+    for i, name in enumerate(['schneider-wrede', 'grantham']):
+        sq_dist = load_distance(name)**2
+        for lag in range(1, d+1):
+            arr[:,i*d+lag-1] = batch.lag_sum(start, end, lag, name, sq_dist)
+
+    return arr
+
+@profiled
+@handle_invalid(n_arrays=2)
+def socn(X, *, d=30, start=1, end=None, on_invalid='raise'): 
     """Sequence-order-coupling number.
 
     This feature is derived from the distance matrix between the 20 amino acids.
@@ -33,6 +50,13 @@ def socn(X, *, d=30, start=1, end=None):
         Determines the end point of the amino acid sequence. Similarly to start,
         this number is based on one-based indexing.
 
+    on_invalid : string, default='raise'
+        'raise' : raise an InvalidSequenceError for invalid sequences
+        'skip' : omit the rows of invalid sequences
+        'nan' : fill the rows of invalid sequences with NaN
+        'mask' : omit the rows of invalid sequences and additionally return
+                 a boolean mask indicating the sequences that were computed
+
     Returns
     -------
 
@@ -77,32 +101,9 @@ def socn(X, *, d=30, start=1, end=None):
     if d >= min_len:
         raise ValueError('Lag parameter d must be smaller than sequence length!')
 
-    # load data
-    df_sw = pd.read_csv(PATH+'schneider-wrede.csv').set_index('AminoAcid')
-    df_g = pd.read_csv(PATH+'grantham.csv').set_index('AminoAcid')
-    sw = np.asarray(df_sw)
-    g = np.asarray(df_g)
-    
-    # list of amino acids (IUPAC standard)
-    amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-    aa_dict = {amino_acids[i]: i for i in range(20)}
-
     # calculate SOCN
-    arr_sw = np.zeros((len(X), d))
-    arr_g = np.zeros((len(X), d))
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical
-        check_natural(seq) # check for unnatural amino acids  
-        seq = seq[start-1:end] # positional information 
-        tmp_sw = np.zeros((d,))
-        tmp_g = np.zeros((d,))
-        for n, lag in enumerate(range(1, d+1)):
-            tmp_sw[n] = sum([(sw[aa_dict[seq[j]], aa_dict[seq[j+lag]]])**2 \
-                            for j in range(len(seq)-lag)])
-            tmp_g[n] = sum([(g[aa_dict[seq[j]], aa_dict[seq[j+lag]]])**2 \
-                            for j in range(len(seq)-lag)])
-        
-        arr_sw[i,:] = tmp_sw
-        arr_g[i,:] = tmp_g
+    arr = compute_rows(_socn, X, 2*d, d=d, start=start, end=end)
+    arr_sw = arr[:,:d]
+    arr_g = arr[:,d:]
         
     return arr_sw, arr_g
\ No newline at end of file
@@ -22,6 +22,12 @@ def test_ctd():
     assert sum(ctd_arr[1]) == 7
     assert sum(ctd_arr[2]) == 6
 
+    # test counts of distinct triads (classes 1111112255111)
+    ctd_arr, desc = ctd('AGVAGVILKKAGV')
+    counts = {desc[i]: ctd_arr[0,i] for i in np.flatnonzero(ctd_arr[0])}
+    assert counts == {'111': 5, '112': 1, '122': 1, '225': 1, '255': 1, 
+                      '551': 1, '511': 1}
+
     # test ValueError
     with pytest.raises(ValueError):
         ctd_error, desc = ctd(X_err)
\ No newline at end of file
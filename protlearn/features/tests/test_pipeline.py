@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from ..pipeline import FeaturePipeline
+from .._batch import schedule
+from .. import aac, atc, entropy, moran, paac, qso, socn
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_pipeline():
+    "Test feature pipeline"
+
+    # load data
+    X_list = open(PATH+'multiple.txt').read().splitlines()
+    X_err = 'AGT2HT9'
+
+    pipe = FeaturePipeline([('aac', {'method': 'absolute'}),
+                            ('paac', {'lambda_': 3}),
+                            ('atc', None),
+                            ('socn', {'d': 2}),
+                            ('qso', {'d': 2}),
+                            ('moran', {'d': 2}),
+                            ('entropy', None)])
+    arr, desc = pipe.transform(X_list)
+
+    # individual results
+    arrays = [aac(X_list, method='absolute')[0],
+              paac(X_list, lambda_=3)[0],
+              *atc(X_list),
+              *socn(X_list, d=2),
+              *qso(X_list, d=2)[:2],
+              moran(X_list, d=2),
+              entropy(X_list)]
+
+    # test array contents
+    assert arr.shape == (3, 20+23+5+3+2+2+22+22+8+1)
+    np.testing.assert_almost_equal(arr, np.hstack(arrays))
+
+    # test descriptors
+    assert len(desc) == arr.shape[1]
+    assert desc[:2] == ['aac_A', 'aac_C']
+    assert desc[20:22] == ['paac_A', 'paac_C']
+    assert desc[43:45] == ['atc_C', 'atc_H']
+    assert desc[51:53] == ['socn_sw_d1', 'socn_sw_d2']
+    assert desc[-1] == 'entropy'
+
+    # test single sequence
+    arr_str, _ = pipe.transform(X_list[0])
+    np.testing.assert_almost_equal(arr_str, arr[:1])
+
+    # test release schedule of intermediates
+    release = schedule([['counts'], ['deviations'], ['counts']])
+    assert release[0] == set()
+    assert release[1] == {'deviations', 'properties', 'ids'}
+    assert release[2] == {'counts', 'encoded', 'sliced'}
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        pipe.transform(X_err)
+    with pytest.raises(ValueError):
+        FeaturePipeline([('aac', None), ('foo', None)])
+    with pytest.raises(ValueError):
+        FeaturePipeline([('aac', None), ('aac', {'start': 2})])
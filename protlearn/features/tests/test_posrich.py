@@ -21,6 +21,14 @@ def test_posrich():
     assert np.array_equal(posrich_multiple[:,0], np.array([1.,0.,1.]))
     assert np.array_equal(posrich_multiple[:,1], np.array([1.,0.,0.]))
     
+    # test on_invalid (single position accepts unnatural amino acids)
+    X_unnat = ['AXK', 'AKK']
+    _, mask = posrich(X_unnat, position=1, aminoacid='A', on_invalid='mask')
+    np.testing.assert_equal(mask, [True, True])
+    _, mask = posrich(X_unnat, position=[1], aminoacid=['A'], 
+                      on_invalid='mask')
+    np.testing.assert_equal(mask, [False, True])
+
     # test ValueError (erroneous input single)
     with pytest.raises(ValueError):
         posrich_err = posrich(X_err, position=1, aminoacid='R')
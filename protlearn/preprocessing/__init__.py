@@ -1,7 +1,9 @@
+from .dedup_fasta import dedup_fasta
 from .integer_encode import integer_encode
 from .remove_duplicates import remove_duplicates
 from .remove_unnatural import remove_unnatural
 
-__all__ = ['integer_encode', 
+__all__ = ['dedup_fasta',
+           'integer_encode', 
            'remove_duplicates',
            'remove_unnatural']
\ No newline at end of file
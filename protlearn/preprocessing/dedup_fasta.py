@@ -0,0 +1,135 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import os
+import sqlite3
+import logging
+import tempfile
+from itertools import islice
+from ..utils.cache import digest, CHUNK_SIZE
+from .._profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+def _seen(conn, digests):
+    """Subset of digests already present in the table."""
+    seen = set()
+    for i in range(0, len(digests), CHUNK_SIZE):
+        chunk = digests[i:i+CHUNK_SIZE]
+        seen.update(d for d, in conn.execute(
+            'SELECT digest FROM seen WHERE digest IN (%s)' %
+            ','.join('?'*len(chunk)), chunk))
+    return seen
+
+@profiled
+def dedup_fasta(path, out, *, counts=None, chunk_size=100000, tmp_dir=None):
+    """Remove duplicate sequences from a FASTA file of any size.
+
+    Records are streamed in chunks and identified by a 128-bit digest of
+    their sequence, which is looked up in a disk-backed set, so memory use is
+    bounded by chunk_size rather than by the size of the file. The first
+    occurrence of each sequence is written to out, in the order of the input.
+
+    Parameters
+    ----------
+
+    path : string
+        Input FASTA file.
+
+    out : string
+        Output FASTA file containing the unique records. Each sequence is
+        written on a single line.
+
+    counts : string, default=None
+        If given, a tab-separated table with the identifier of the first
+        occurrence and the number of occurrences of each duplicated sequence
+        is written to this file.
+
+    chunk_size : int, default=100000
+        Number of records processed at a time.
+
+    tmp_dir : string, default=None
+        Directory in which the temporary set of digests is kept. Defaults to
+        the system's temporary directory; its disk usage is about 40 bytes
+        per unique sequence.
+
+    Returns
+    -------
+
+    n_records : int
+        Number of records in the input.
+
+    n_unique : int
+        Number of records written to out.
+
+    Examples
+    --------
+
+    >>> from protlearn.preprocessing import dedup_fasta
+    >>> n_records, n_unique = dedup_fasta('proteins.fasta', 'unique.fasta',
+    ...                                   counts='duplicates.tsv')
+    >>> n_records, n_unique
+    (120, 97)
+
+    """
+
+    from Bio import SeqIO
+
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer!')
+
+    n_records = n_unique = 0
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'digests.sqlite'),
+                               isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=OFF')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute('CREATE TABLE seen (digest BLOB PRIMARY KEY, '
+                         'id TEXT, count INTEGER) WITHOUT ROWID')
+
+            records = SeqIO.parse(path, 'fasta')
+            with open(out, 'w') as f:
+                while True:
+                    chunk = list(islice(records, chunk_size))
+                    if not chunk:
+                        break
+                    n_records += len(chunk)
+
+                    # occurrences within the chunk, first occurrence first
+                    first, occurrences = {}, {}
+                    for rec in chunk:
+                        seq = str(rec.seq)
+                        d = digest(seq)
+                        if d not in first:
+                            first[d] = (rec, seq)
+                        occurrences[d] = occurrences.get(d, 0) + 1
+
+                    # write and store sequences not seen in earlier chunks
+                    seen = _seen(conn, list(first))
+                    new = [d for d in first if d not in seen]
+                    f.writelines('>%s\n%s\n' % (first[d][0].description,
+                                                first[d][1]) for d in new)
+                    n_unique += len(new)
+
+                    conn.execute('BEGIN')
+                    conn.executemany('INSERT INTO seen VALUES (?, ?, ?)',
+                                     [(d, first[d][0].id, occurrences[d])
+                                      for d in new])
+                    conn.executemany('UPDATE seen SET count = count + ? '
+                                     'WHERE digest = ?',
+                                     [(occurrences[d], d) for d in seen])
+                    conn.execute('COMMIT')
+
+            # table of duplicated sequences
+            if counts is not None:
+                with open(counts, 'w') as f:
+                    f.write('id\tcount\n')
+                    f.writelines('%s\t%d\n' % row for row in conn.execute(
+                        'SELECT id, count FROM seen WHERE count > 1'))
+        finally:
+            conn.close()
+
+    logger.info('%d of %d records were duplicates.', n_records-n_unique,
+                n_records)
+
+    return n_records, n_unique
@@ -1,8 +1,10 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from ..utils.validation import check_input, check_alpha, check_natural
+from ..utils.validation import check_input, check_sequences
+from .._profiling import profiled
 
+@profiled
 def integer_encode(X, *, padding=False):
     """Integer encoding.
 
@@ -49,13 +51,12 @@ def integer_encode(X, *, padding=False):
     
     # input handling 
     X = check_input(X)
+    check_sequences(X)
 
     amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
     aa_dict = {amino_acids[i]: i+1 for i in range(len(amino_acids))}
     enc_list = []
     for seq in X:
-        check_alpha(seq) # check if alphabetical      
-        check_natural(seq) # check for unnatural amino acids 
         seq_trans = [aa_dict[aa] for aa in seq]
         enc_list.append(np.asarray(seq_trans))
     enc_arr = np.asarray(enc_list)
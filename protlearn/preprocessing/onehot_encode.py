@@ -1,8 +1,10 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import numpy as np
-from ..utils.validation import check_input, check_alpha, check_natural
+from ..utils.validation import check_input, check_sequences
+from .._profiling import profiled
 
+@profiled
 def onehot_encode(X):
     """One-hot encoding.
     
@@ -37,6 +39,7 @@ def onehot_encode(X):
 
     # input handling
     X = check_input(X)
+    check_sequences(X)
     
     amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
     aa_dict = {aa: i for i, aa in enumerate(amino_acids)}
@@ -48,8 +51,6 @@ def onehot_encode(X):
 
     # one-hot encoding
     for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical      
-        check_natural(seq) # check for unnatural amino acids
         for j, aa in enumerate(seq):
             k = aa_dict[aa]
             arr[i,j,k] = 1
@@ -1,12 +1,20 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-from collections import Counter
+import logging
+import numpy as np
+from ..utils.compute import unique_sequences
 from ..utils.validation import check_input
+from .._profiling import profiled
 
-def remove_duplicates(X, *, verbose=1):
+logger = logging.getLogger(__name__)
+
+@profiled
+def remove_duplicates(X, *, verbose=1, return_index=False, 
+                      return_inverse=False):
     """Remove duplicate sequences.
 
-    This function detects and removes duplicate sequences from the dataset.
+    This function detects and removes duplicate sequences from the dataset,
+    keeping the first occurrence of each sequence.
 
     Parameters
     ----------
@@ -15,15 +23,37 @@ def remove_duplicates(X, *, verbose=1):
         Dataset of amino acid sequences.
     
     verbose : int, default=1
-        0 : no information on duplicates is printed
-        1 : prints number of duplicates removed
-        2 : prints duplicate sequences and number of times present
+        0 : no information on duplicates is logged
+        1 : logs number of duplicates removed
+        2 : logs duplicate sequences and number of times present
+
+    return_index : bool, default=False
+        If True, also return the indices of the kept sequences in X.
+
+    return_inverse : bool, default=False
+        If True, also return the indices of Y that reconstruct X.
 
     Returns
     -------
 
     Y : list of length n_samples minus the number of duplicates
-        Dataset containing only unique sequences.
+        Dataset containing only unique sequences, in the order of their first
+        occurrence in X.
+
+    index : ndarray of shape (n_unique,)
+        Index of the first occurrence of each sequence of Y in X. Only 
+        returned if return_index is True.
+
+    inverse : ndarray of shape (n_samples,)
+        Indices such that [Y[i] for i in inverse] reconstructs X. Only
+        returned if return_inverse is True.
+
+    Notes
+    -----
+
+    Information on duplicates is emitted through the logger
+    'protlearn.preprocessing.remove_duplicates' at level INFO, e.g. shown
+    after logging.basicConfig(level=logging.INFO).
 
     Examples
     --------
@@ -32,7 +62,12 @@ def remove_duplicates(X, *, verbose=1):
     >>> seqs = ['ARKLY', 'EERNPAA', 'ARKLY', 'QEPGPGLLLK']
     >>> seqs = remove_duplicates(seqs)
     >>> seqs
-    ['EERNPAA', 'QEPGPGLLLK', 'ARKLY']
+    ['ARKLY', 'EERNPAA', 'QEPGPGLLLK']
+    >>> seqs, index, inverse = remove_duplicates(['ARKLY', 'EERNPAA', 'ARKLY'],
+    ...                                          return_index=True, 
+    ...                                          return_inverse=True)
+    >>> index, inverse
+    (array([0, 1]), array([0, 1, 0]))
 
     """
 
@@ -40,21 +75,33 @@ def remove_duplicates(X, *, verbose=1):
     X = check_input(X)
 
     # remove duplicates
-    Y = list(set(X))
-    diff = Counter(X)-Counter(Y)
+    Y, inverse = unique_sequences(X)
+    counts = np.bincount(inverse, minlength=len(Y))
     
     # handle verbosity
-    if diff:
+    if verbose and len(Y) < len(X):
         if verbose == 1:
-            if len(diff) == 1:
-                print("1 duplicate has been removed.")
-            else:
-                print("{} duplicates have been removed.".format(len(diff)))
+            n_removed = len(X)-len(Y)
+            logger.info('%d duplicate%s been removed.', n_removed, 
+                        ' has' if n_removed == 1 else 's have')
         elif verbose == 2:
-            for entry in diff:
-                print("Removed duplicates [sequence: number of times present]:\n")
-                print("{0}: {1}".format(entry, diff[entry]+1))
-    else:
-        print("Data contains no duplicates.")
+            logger.info('Removed duplicates [sequence: number of times '
+                        'present]:')
+            for i in np.flatnonzero(counts > 1):
+                logger.info('%s: %d', Y[i], counts[i])
+    elif verbose:
+        logger.info('Data contains no duplicates.')
+
+    if not (return_index or return_inverse):
+        return Y
+    
+    out = (Y,)
+    if return_index:
+        # first occurrences, assigned in reverse so that the first one wins
+        index = np.empty((len(Y),), dtype=np.intp)
+        index[inverse[::-1]] = np.arange(len(X)-1, -1, -1)
+        out += (index,)
+    if return_inverse:
+        out += (inverse,)
     
-    return Y
\ No newline at end of file
+    return out
@@ -1,8 +1,12 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
-from ..utils.validation import check_input, check_alpha
+import numpy as np
+from ..utils.validation import check_input, NATURAL, _classify, \
+                               _check_classes, _errors
+from .._profiling import profiled, stage
 
-def remove_unnatural(X):
+@profiled
+def remove_unnatural(X, *, return_index=False, return_inverse=False):
     """Remove sequences containing unnatural amino acids.
 
     This function removes sequences containing amino acids other than the 20 
@@ -14,6 +18,13 @@ def remove_unnatural(X):
     X : string, fasta, or a list thereof
         Dataset of amino acid sequences.
 
+    return_index : bool, default=False
+        If True, also return the indices of the kept sequences in X.
+
+    return_inverse : bool, default=False
+        If True, also return the position of each sequence of X in Y, or -1
+        for removed sequences.
+
     Returns
     -------
 
@@ -21,6 +32,14 @@ def remove_unnatural(X):
         unnatural amino acids
         Dataset containing only sequences comprised of natural amino acids.
 
+    index : ndarray of shape (n_kept,)
+        Indices of the sequences of Y in X. Only returned if return_index is
+        True.
+
+    inverse : ndarray of shape (n_samples,)
+        Position of each sequence of X in Y, -1 if removed. Only returned if
+        return_inverse is True.
+
     Examples
     --------
 
@@ -29,26 +48,33 @@ def remove_unnatural(X):
     >>> seqs = remove_unnatural(seqs)
     >>> seqs
     ['ARKLY', 'QEPGPGLLLK']
+    >>> seqs, index = remove_unnatural(['ARKLY', 'EERNPJAB'], return_index=True)
+    >>> index
+    array([0])
 
     """
     
     # input handling 
     X = check_input(X)
 
-    # remove sequences with unnatural amino acids
-    amino_acids = set('ACDEFGHIKLMNPQRSTVWY')
-    indices = []
-    for i, seq in enumerate(X):
-        check_alpha(seq) # check if alphabetical      
-        # get indices of sequences with unnatural amino acids
-        for aa in seq:
-            if aa in amino_acids:
-                pass
-            else:
-                indices.append(i)
-                break
-
-    # remove sequences by indices
-    Y = [i for j, i in enumerate(X) if j not in set(indices)]
+    # remove sequences with unnatural amino acids, classifying the 
+    # characters once for both checks
+    with stage('validation'):
+        classes, offsets = _classify(X)
+        _check_classes(X, classes, offsets, natural=False)
+        valid, _ = _errors(X, classes, offsets, NATURAL)
+    index = np.flatnonzero(valid)
+    Y = [X[i] for i in index]
     
-    return Y
+    if not (return_index or return_inverse):
+        return Y
+
+    out = (Y,)
+    if return_index:
+        out += (index,)
+    if return_inverse:
+        inverse = np.full((len(X),), -1, dtype=np.intp)
+        inverse[index] = np.arange(len(index))
+        out += (inverse,)
+
+    return out
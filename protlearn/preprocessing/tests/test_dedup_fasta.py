@@ -0,0 +1,45 @@
+import os
+import pytest
+import tempfile
+from ..dedup_fasta import dedup_fasta
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_dedup_fasta():
+    "Test streaming deduplication of fasta files"
+
+    # define data
+    seqs = ['ARKLY', 'LYLPGG', 'ARKLY', 'EECCKHR', 'LYLPGG', 'ARKLY', 'MKL']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'in.fasta')
+        with open(path, 'w') as f:
+            for i, seq in enumerate(seqs):
+                f.write('>seq%d some description\n%s\n%s\n' % (i, seq[:3], 
+                                                              seq[3:]))
+
+        # duplicates across and within chunks
+        for chunk_size in [1, 2, 100]:
+            out = os.path.join(tmp, 'out.fasta')
+            counts = os.path.join(tmp, 'counts.tsv')
+            n_records, n_unique = dedup_fasta(path, out, counts=counts,
+                                              chunk_size=chunk_size, 
+                                              tmp_dir=tmp)
+            assert (n_records, n_unique) == (7, 4)
+            assert open(out).read().splitlines() == [
+                '>seq0 some description', 'ARKLY', 
+                '>seq1 some description', 'LYLPGG', 
+                '>seq3 some description', 'EECCKHR', 
+                '>seq6 some description', 'MKL']
+            rows = open(counts).read().splitlines()
+            assert rows[0] == 'id\tcount'
+            assert sorted(rows[1:]) == ['seq0\t3', 'seq1\t2']
+
+        # test fasta without duplicates
+        out = os.path.join(tmp, 'out.fasta')
+        assert dedup_fasta(PATH+'sarcolipin.fasta', out) == (1, 1)
+
+        # test ValueError
+        with pytest.raises(ValueError):
+            dedup_fasta(path, out, chunk_size=0)
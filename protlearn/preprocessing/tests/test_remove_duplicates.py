@@ -1,4 +1,6 @@
 import pytest
+import logging
+import numpy as np
 from ..remove_duplicates import remove_duplicates
 
 def test_remove_duplicates():
@@ -16,4 +18,26 @@ def test_remove_duplicates():
 
     assert set(y0) == set(x0)
     assert set(y1) == set(x0)
-    assert set(y2) == set(['ARKLY', 'LYLPGG'])
\ No newline at end of file
+    assert set(y2) == set(['ARKLY', 'LYLPGG'])
+
+    # test order and index mapping
+    assert y1 == x0
+    y, index, inverse = remove_duplicates(x1, verbose=0, return_index=True,
+                                          return_inverse=True)
+    np.testing.assert_equal(index, [0, 1, 3])
+    np.testing.assert_equal(inverse, [0, 1, 0, 2, 1])
+    assert [y[i] for i in inverse] == x1
+    _, inverse = remove_duplicates(x0, verbose=0, return_inverse=True)
+    np.testing.assert_equal(inverse, [0, 1, 2])
+
+def test_remove_duplicates_logging(caplog):
+    "Test logging of duplicate sequences"
+
+    x = ['ARKLY', 'LYLPGG', 'ARKLY', 'ARKLY']
+    with caplog.at_level(logging.INFO):
+        remove_duplicates(x)
+        remove_duplicates(x, verbose=2)
+        remove_duplicates(x, verbose=0)
+    assert caplog.messages == ['2 duplicates have been removed.',
+                               'Removed duplicates [sequence: number of '
+                               'times present]:', 'ARKLY: 3']
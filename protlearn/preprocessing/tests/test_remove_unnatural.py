@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from ..remove_unnatural import remove_unnatural
 
 def test_remove_unnatural():
@@ -10,4 +11,16 @@ def test_remove_unnatural():
     # test for duplicates
     Y = remove_unnatural(X)
 
-    assert Y == ['ARKLY', 'QERKLI']
\ No newline at end of file
+    assert Y == ['ARKLY', 'QERKLI']
+
+    # test index mapping
+    Y, index, inverse = remove_unnatural(X + ['AXA', 'KLY'], 
+                                         return_index=True, 
+                                         return_inverse=True)
+    assert Y == ['ARKLY', 'QERKLI', 'KLY']
+    np.testing.assert_equal(index, [0, 1, 4])
+    np.testing.assert_equal(inverse, [0, 1, -1, -1, 2])
+
+    # test ValueError
+    with pytest.raises(ValueError):
+        remove_unnatural(X + ['A1B'])
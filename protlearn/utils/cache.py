@@ -0,0 +1,273 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+
+# file name of the cache database within the cache directory
+FILENAME = 'protlearn-cache.sqlite'
+
+# maximum number of parameters per SQL statement
+CHUNK_SIZE = 500
+
+def digest(seq):
+    """128-bit digest of a sequence."""
+    return hashlib.blake2b(seq.encode(), digest_size=16).digest()
+
+def namespace(kernel, n_cols, dtype, params):
+    """Digest identifying the rows computed by a kernel with the given
+    parameters under the installed version of protlearn."""
+    from .. import __version__
+    key = repr((kernel.__module__, kernel.__qualname__, n_cols,
+                np.dtype(dtype).str, sorted(params.items()), __version__))
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+class DiskCache:
+    """Persistent, content-addressed store of feature rows.
+
+    Each row is stored under the digest of its sequence within the namespace
+    of the computation that produced it (see namespace), so that rows are
+    reused across datasets, sessions, and processes, while changes in
+    function, parameters, or protlearn version never return stale results.
+    Once the stored rows exceed max_bytes, the least recently used rows are
+    evicted.
+
+    Parameters
+    ----------
+
+    path : string
+        Directory in which the cache database is kept.
+
+    max_bytes : int
+        Maximum total size of the stored rows.
+
+    """
+
+    def __init__(self, path, max_bytes):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(path, FILENAME),
+                                     check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS rows ('
+                           'namespace BLOB, digest BLOB, row BLOB, '
+                           'size INTEGER, atime INTEGER, '
+                           'PRIMARY KEY (namespace, digest))')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS rows_atime '
+                           'ON rows (atime)')
+
+    def get_many(self, namespace, digests):
+        """Look up rows by sequence digest and mark them as recently used.
+
+        Returns
+        -------
+
+        found : dict
+            Stored rows (as bytes) of all digests found in the cache.
+
+        """
+
+        found = {}
+        now = time.time_ns()
+        with self._lock:
+            for i in range(0, len(digests), CHUNK_SIZE):
+                chunk = digests[i:i+CHUNK_SIZE]
+                marks = ','.join('?'*len(chunk))
+                found.update(self._conn.execute(
+                    'SELECT digest, row FROM rows WHERE namespace = ? AND '
+                    'digest IN (%s)' % marks, [namespace, *chunk]))
+                self._conn.execute(
+                    'UPDATE rows SET atime = ? WHERE namespace = ? AND '
+                    'digest IN (%s)' % marks, [now, namespace, *chunk])
+        return found
+
+    def put_many(self, namespace, rows):
+        """Store rows given as a dict mapping sequence digests to bytes and
+        evict the least recently used rows if the cache is full."""
+        now = time.time_ns()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?)',
+                [(namespace, d, row, len(row), now) for d, row in rows.items()])
+            self._conn.execute('COMMIT')
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute('SELECT SUM(size) FROM rows').fetchone()[0]
+        if not total or total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        evict = []
+        for rowid, size in self._conn.execute(
+                'SELECT rowid, size FROM rows ORDER BY atime'):
+            evict.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany('DELETE FROM rows WHERE rowid = ?', evict)
+
+    def resize(self, max_bytes):
+        """Change the maximum size, evicting rows if necessary."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def size(self):
+        """Total size of the stored rows in bytes."""
+        with self._lock:
+            total = self._conn.execute('SELECT SUM(size) FROM rows').fetchone()[0]
+        return total or 0
+
+    def clear(self):
+        """Remove all stored rows."""
+        with self._lock:
+            self._conn.execute('DELETE FROM rows')
+
+class MemoryCache:
+    """In-process, least recently used store of feature rows.
+
+    Rows are keyed like those of DiskCache, but kept in memory, which makes
+    lookups of single hot sequences cheap. Hits and misses are counted per 
+    row (see memo_info).
+
+    Parameters
+    ----------
+
+    max_rows : int
+        Maximum number of stored rows.
+
+    """
+
+    def __init__(self, max_rows):
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, namespace, digests):
+        """Look up rows by sequence digest and mark them as recently used."""
+        found = {}
+        with self._lock:
+            for d in digests:
+                row = self._rows.get((namespace, d))
+                if row is not None:
+                    self._rows.move_to_end((namespace, d))
+                    found[d] = row
+            self.hits += len(found)
+            self.misses += len(digests) - len(found)
+        return found
+
+    def put_many(self, namespace, rows):
+        """Store rows given as a dict mapping sequence digests to bytes and
+        evict the least recently used rows if the cache is full."""
+        with self._lock:
+            for d, row in rows.items():
+                self._rows[(namespace, d)] = row
+                self._rows.move_to_end((namespace, d))
+            self._evict()
+
+    def _evict(self):
+        while len(self._rows) > self.max_rows:
+            self._rows.popitem(last=False)
+
+    def resize(self, max_rows):
+        """Change the maximum number of rows, evicting rows if necessary."""
+        with self._lock:
+            self.max_rows = max_rows
+            self._evict()
+
+    def clear(self):
+        """Remove all stored rows and reset the counters."""
+        with self._lock:
+            self._rows.clear()
+            self.hits = 0
+            self.misses = 0
+
+# in-process cache shared by all feature functions
+_memo = MemoryCache(0)
+
+def get_memo(max_rows):
+    """Return the in-process cache."""
+    if _memo.max_rows != max_rows:
+        _memo.resize(max_rows)
+    return _memo
+
+def memo_info():
+    """Statistics of the in-process cache of feature rows.
+
+    Returns
+    -------
+
+    info : dict
+        'hits' : number of rows read from the cache
+        'misses' : number of rows that had to be computed
+        'size' : number of rows currently stored
+        'max_size' : maximum number of stored rows (protlearn.set_config)
+
+    Examples
+    --------
+
+    >>> import protlearn
+    >>> from protlearn.features import aac
+    >>> from protlearn.utils.cache import memo_info
+    >>> protlearn.set_config(memo_size=10000)
+    >>> comp, aa = aac('ARKLY')
+    >>> comp, aa = aac('ARKLY')
+    >>> memo_info()
+    {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 10000}
+
+    """
+
+    with _memo._lock:
+        return {'hits': _memo.hits, 'misses': _memo.misses,
+                'size': len(_memo._rows), 'max_size': _memo.max_rows}
+
+def clear_memo():
+    """Empty the in-process cache of feature rows and reset its counters."""
+    _memo.clear()
+
+# open caches by directory
+_caches = {}
+
+def get_cache(path, max_bytes):
+    """Return the cache kept in directory path."""
+    key = os.path.abspath(path)
+    if key not in _caches:
+        _caches[key] = DiskCache(path, max_bytes)
+    if _caches[key].max_bytes != max_bytes:
+        _caches[key].resize(max_bytes)
+    return _caches[key]
+
+def cached_rows(compute, kernel, X, n_cols, dtype, params, cache):
+    """Compute rows through compute(X), reading rows of previously seen
+    sequences from the cache and storing the newly computed ones."""
+    ns = namespace(kernel, n_cols, dtype, params)
+    digests = [digest(seq) for seq in X]
+    found = cache.get_many(ns, digests)
+    if not found:
+        arr = np.asarray(compute(X), dtype=dtype)
+        cache.put_many(ns, {d: row.tobytes() for d, row in zip(digests, arr)})
+        return arr
+
+    # read cached rows in bulk
+    arr = np.empty((len(X), n_cols), dtype=dtype)
+    hits = [i for i, d in enumerate(digests) if d in found]
+    missing = [i for i, d in enumerate(digests) if d not in found]
+    rows = b''.join([found[digests[i]] for i in hits])
+    arr[hits] = np.frombuffer(rows, dtype=dtype).reshape(len(hits), n_cols)
+
+    # compute and store new rows
+    if missing:
+        arr[missing] = compute([X[i] for i in missing])
+        cache.put_many(ns, {digests[i]: arr[i].tobytes() for i in missing})
+
+    return arr
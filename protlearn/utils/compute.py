@@ -0,0 +1,148 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from contextvars import ContextVar
+from .._config import get_config, effective_n_jobs
+from .._profiling import stage
+from .validation import check_sequences, InvalidSequenceError
+from .validation import NATURAL, LETTER, _passed, _record
+
+# unique sequences of the dataset processed by FeaturePipeline, as a tuple
+# (X, X_unique, inverse)
+_unique = ContextVar('protlearn_unique', default=None)
+
+def unique_sequences(X):
+    """Find the unique sequences of a dataset.
+
+    Parameters
+    ----------
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    Returns
+    -------
+
+    X_unique : list of strings
+        Unique sequences in the order of their first occurrence in X.
+
+    inverse : ndarray of shape (n_samples,)
+        Indices such that [X_unique[i] for i in inverse] reconstructs X.
+
+    """
+
+    cached = _unique.get()
+    if cached is not None and cached[0] is X:
+        return cached[1], cached[2]
+
+    index = {}
+    inverse = np.fromiter((index.setdefault(seq, len(index)) for seq in X),
+                          dtype=np.intp, count=len(X))
+
+    return list(index), inverse
+
+def compute_rows(kernel, X, n_cols, *, dtype=float, natural=True, **params):
+    """Compute a feature matrix with one row per sequence.
+
+    All functions in protlearn.features delegate their per-sequence loop to a
+    row-wise kernel through this function, which decides how the rows are
+    computed based on the global configuration (see protlearn.set_config).
+
+    Parameters
+    ----------
+
+    kernel : callable
+        Module-level function with signature kernel(X, **params) returning an
+        ndarray of shape (len(X), n_cols). Each row may only depend on the
+        corresponding sequence.
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    n_cols : int
+        Number of columns returned by kernel.
+
+    dtype : data-type, default=float
+        Data type of the output array.
+
+    natural : bool, default=True
+        Whether the sequences must be comprised of natural amino acids only;
+        otherwise, they must be alphabetical. The sequences whose rows are 
+        computed, i.e. that are not found in a cache, are validated before any
+        row is computed, so kernels may assume valid sequences.
+
+    **params
+        Keyword arguments passed on to kernel.
+
+    Returns
+    -------
+
+    arr : ndarray of shape (n_samples, n_cols)
+        Rows computed by kernel, in the order of X.
+
+    """
+
+    # cached rows stem from valid sequences, so only the sequences to be 
+    # computed are validated; invalid ones are reported relative to X
+    level = NATURAL if natural else LETTER
+    def check(X_rows):
+        if _passed(X, level):
+            return
+        try:
+            check_sequences(X_rows, natural)
+        except InvalidSequenceError:
+            check_sequences(X, natural)
+            raise
+
+    with stage('compute'):
+        # compute unique sequences only and scatter their rows
+        if get_config()['dedup']:
+            X_unique, inverse = unique_sequences(X)
+            if len(X_unique) < len(X):
+                arr = _compute_rows(kernel, X_unique, n_cols, dtype, params,
+                                    check)[inverse]
+                _record(X, level)
+                return arr
+
+        arr = _compute_rows(kernel, X, n_cols, dtype, params, check)
+        _record(X, level)
+        return arr
+
+# caching and parallelization modules are only imported when enabled
+
+def _compute_rows(kernel, X, n_cols, dtype, params, check):
+    config = get_config()
+    def compute(X):
+        check(X)
+        return _map_rows(kernel, X, n_cols, dtype, params)
+
+    # read previously computed rows from the persistent cache
+    if config['cache_dir'] is not None:
+        from .cache import get_cache
+        cache = get_cache(config['cache_dir'], config['cache_size'])
+        compute = _with_cache(compute, cache, kernel, n_cols, dtype, params)
+
+    # ... after looking them up in the in-process cache
+    if config['memo_size']:
+        from .cache import get_memo
+        cache = get_memo(config['memo_size'])
+        compute = _with_cache(compute, cache, kernel, n_cols, dtype, params)
+
+    return compute(X)
+
+def _with_cache(compute, cache, kernel, n_cols, dtype, params):
+    from .cache import cached_rows
+    return lambda X: cached_rows(compute, kernel, X, n_cols, dtype, params, 
+                                 cache)
+
+def _map_rows(kernel, X, n_cols, dtype, params):
+    n_jobs = effective_n_jobs(get_config()['n_jobs'])
+    if n_jobs == 1 or len(X) < 2:
+        return kernel(X, **params)
+
+    from .parallel import process_map, thread_map
+
+    if get_config()['backend'] == 'threads':
+        return thread_map(kernel, X, n_cols, n_jobs, dtype=dtype, params=params)
+
+    return process_map(kernel, X, n_cols, n_jobs, dtype=dtype, params=params)
@@ -0,0 +1,119 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+
+def to_buffer(X):
+    """Pack a list of sequences into a contiguous byte buffer.
+
+    Parameters
+    ----------
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    Returns
+    -------
+
+    buf : ndarray of shape (total_bytes,), dtype=uint8
+        UTF-8 encoded sequences, concatenated.
+
+    offsets : ndarray of shape (n_samples+1,), dtype=int64
+        Sequence i is stored in buf[offsets[i]:offsets[i+1]].
+
+    """
+
+    encoded = [seq.encode() for seq in X]
+    offsets = np.zeros((len(encoded)+1,), dtype=np.int64)
+    np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    return buf, offsets
+
+def from_buffer(buf, offsets, lo=0, hi=None):
+    """Unpack sequences lo to hi from a buffer created by to_buffer."""
+    if hi is None:
+        hi = len(offsets)-1
+    return [buf[offsets[i]:offsets[i+1]].tobytes().decode()
+            for i in range(lo, hi)]
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# lookup table from ASCII code to amino acid index, 255 for anything else
+LUT = np.full((256,), 255, dtype=np.uint8)
+LUT[np.frombuffer(AMINO_ACIDS.encode(), dtype=np.uint8)] = np.arange(20)
+
+def encode(X):
+    """Encode a list of sequences as amino acid indices.
+
+    Parameters
+    ----------
+
+    X : list of strings
+        Dataset of amino acid sequences (natural amino acids only).
+
+    Returns
+    -------
+
+    codes : ndarray of shape (total_length,), dtype=uint8
+        Index of each residue in AMINO_ACIDS, sequences concatenated.
+
+    offsets : ndarray of shape (n_samples+1,), dtype=int64
+        Sequence i is stored in codes[offsets[i]:offsets[i+1]].
+
+    """
+
+    buf, offsets = to_buffer(X)
+    return LUT[buf], offsets
+
+def segment_ids(offsets):
+    """Sequence index of each residue."""
+    lengths = np.diff(offsets)
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+def segment_sum(values, ids, n_samples):
+    """Sum per-residue values of shape (total_length,) or (total_length, k) 
+    over each sequence."""
+    if values.ndim == 1:
+        return np.bincount(ids, weights=values, minlength=n_samples)
+    return np.stack([np.bincount(ids, weights=v, minlength=n_samples) 
+                     for v in values.T], axis=1)
+
+def composition(codes, offsets):
+    """Absolute amino acid counts.
+
+    Returns
+    -------
+
+    arr : ndarray of shape (n_samples, 20)
+        Number of occurrences of each amino acid (in the order of AMINO_ACIDS)
+        in each sequence.
+
+    """
+
+    n_samples = len(offsets)-1
+    ids = segment_ids(offsets)*len(AMINO_ACIDS) + codes
+    arr = np.bincount(ids, minlength=n_samples*len(AMINO_ACIDS))
+
+    return arr.reshape(n_samples, len(AMINO_ACIDS)).astype(float)
+
+def lag_pairs(offsets, d):
+    """Residue pairs that are d positions apart within the same sequence.
+
+    Returns
+    -------
+
+    left : ndarray
+        Positions i in the concatenated sequences such that i+d lies in the
+        same sequence as i.
+
+    ids : ndarray
+        Sequence index of each pair.
+
+    """
+
+    ids = segment_ids(offsets)
+    left = np.arange(len(ids))
+    valid = left+d < offsets[ids+1]
+
+    return left[valid], ids[valid]
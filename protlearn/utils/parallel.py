@@ -0,0 +1,158 @@
+# Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from .._config import config_context
+from .encoding import to_buffer, from_buffer
+
+# number of shards per worker, for load balancing across uneven lengths
+SHARDS_PER_JOB = 4
+
+def _shard_bounds(n_samples, n_jobs):
+    """Row boundaries of contiguous shards."""
+    n_shards = min(n_samples, n_jobs*SHARDS_PER_JOB)
+    return np.linspace(0, n_samples, n_shards+1).astype(int)
+
+def _shared_array(shape, dtype):
+    """Allocate a numpy array backed by a new shared memory block."""
+    nbytes = max(int(np.prod(shape))*np.dtype(dtype).itemsize, 1)
+    shm = SharedMemory(create=True, size=nbytes)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _process_shard(kernel, params, names, n_bytes, shape, dtype, lo, hi):
+    """Compute rows lo to hi and write them into the shared output array."""
+    blocks = [SharedMemory(name=name) for name in names]
+    buf_shm, off_shm, out_shm = blocks
+    buf = np.ndarray((n_bytes,), dtype=np.uint8, buffer=buf_shm.buf)
+    offsets = np.ndarray((shape[0]+1,), dtype=np.int64, buffer=off_shm.buf)
+    out = np.ndarray(shape, dtype=dtype, buffer=out_shm.buf)
+    try:
+        X = from_buffer(buf, offsets, lo, hi)
+
+        # workers never spawn pools of their own
+        with config_context(n_jobs=1):
+            out[lo:hi] = kernel(X, **params)
+    finally:
+        # views must be released before the blocks can be closed
+        del buf, offsets, out
+        for shm in blocks:
+            shm.close()
+
+def process_map(kernel, X, n_cols, n_jobs, dtype=float, params=None):
+    """Shard a row-wise kernel across a pool of worker processes.
+
+    The sequences are packed into a shared byte buffer once, and every worker
+    writes its rows directly into a shared output array, so that neither the
+    input strings nor the resulting rows have to be pickled.
+
+    Parameters
+    ----------
+
+    kernel : callable
+        Module-level function with signature kernel(X, **params) returning an
+        ndarray of shape (len(X), n_cols).
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    n_cols : int
+        Number of columns returned by kernel.
+
+    n_jobs : int
+        Number of worker processes.
+
+    dtype : data-type, default=float
+        Data type of the output array.
+
+    params : dict or None, default=None
+        Keyword arguments passed on to kernel.
+
+    Returns
+    -------
+
+    arr : ndarray of shape (n_samples, n_cols)
+        Rows computed by kernel, in the order of X.
+
+    """
+
+    params = params or {}
+    buf, offsets = to_buffer(X)
+    shape = (len(X), n_cols)
+
+    buf_shm, shared_buf = _shared_array(buf.shape, np.uint8)
+    off_shm, shared_off = _shared_array(offsets.shape, np.int64)
+    out_shm, out = _shared_array(shape, dtype)
+    blocks = [buf_shm, off_shm, out_shm]
+    try:
+        shared_buf[:] = buf
+        shared_off[:] = offsets
+        names = [shm.name for shm in blocks]
+
+        bounds = _shard_bounds(len(X), n_jobs)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_process_shard, kernel, params, names,
+                                       len(buf), shape, dtype, lo, hi)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+        arr = out.copy()
+    finally:
+        del shared_buf, shared_off, out
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    return arr
+
+def thread_map(kernel, X, n_cols, n_jobs, dtype=float, params=None):
+    """Compute a row-wise kernel in chunks on a pool of threads.
+
+    This only pays off for kernels that spend most of their time in NumPy
+    operations which release the GIL, but it avoids the start-up and transfer
+    costs of worker processes entirely.
+
+    Parameters
+    ----------
+
+    kernel : callable
+        Function with signature kernel(X, **params) returning an ndarray of 
+        shape (len(X), n_cols).
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    n_cols : int
+        Number of columns returned by kernel.
+
+    n_jobs : int
+        Number of threads.
+
+    dtype : data-type, default=float
+        Data type of the output array.
+
+    params : dict or None, default=None
+        Keyword arguments passed on to kernel.
+
+    Returns
+    -------
+
+    arr : ndarray of shape (n_samples, n_cols)
+        Rows computed by kernel, in the order of X.
+
+    """
+
+    params = params or {}
+    arr = np.empty((len(X), n_cols), dtype=dtype)
+
+    def compute_chunk(lo, hi):
+        arr[lo:hi] = kernel(X[lo:hi], **params)
+
+    bounds = _shard_bounds(len(X), n_jobs)
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(compute_chunk, lo, hi)
+                   for lo, hi in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+
+    return arr
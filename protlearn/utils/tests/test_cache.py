@@ -0,0 +1,101 @@
+import pytest
+import tempfile
+import numpy as np
+import protlearn
+from .. import compute
+from ..cache import get_cache, memo_info, clear_memo
+from ..validation import InvalidSequenceError
+from ...features import aac, cksaap, paac
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_cache():
+    "Test persistent feature cache"
+
+    # load data
+    X_list = open(PATH+'multiple.txt').read().splitlines()
+    X_more = X_list + ['KLLPAGW', 'MMRKE']
+
+    # results without cache
+    aac_ref, _ = aac(X_more)
+    paac_ref, _ = paac(X_more, lambda_=3)
+    cksaap_ref, _ = cksaap(X_more)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with protlearn.config_context(cache_dir=tmp):
+            cache = get_cache(tmp, protlearn.get_config()['cache_size'])
+
+            # first call stores rows
+            aac(X_list)
+            size = cache.size()
+            assert size == len(X_list)*20*8
+
+            # second call reads stored rows and computes new ones
+            aac_cached, _ = aac(X_more)
+            assert cache.size() == len(X_more)*20*8
+            paac_cached, _ = paac(X_more, lambda_=3)
+            paac_cached, _ = paac(X_more, lambda_=3)
+            cksaap_cached, _ = cksaap(X_more)
+            cksaap_cached, _ = cksaap(X_more)
+
+            # test ValueError
+            with pytest.raises(ValueError):
+                aac(X_more + ['AGT2HT9'])
+
+        # test array contents
+        np.testing.assert_equal(aac_cached, aac_ref)
+        np.testing.assert_equal(paac_cached, paac_ref)
+        np.testing.assert_equal(cksaap_cached, cksaap_ref)
+        assert cksaap_cached.dtype == cksaap_ref.dtype
+
+        # test eviction of least recently used rows
+        with protlearn.config_context(cache_dir=tmp, cache_size=1000):
+            aac(X_list)
+            assert cache.size() <= 1000
+            aac_cached, _ = aac(X_more)
+        np.testing.assert_equal(aac_cached, aac_ref)
+        cache.clear()
+        assert cache.size() == 0
+
+    # test in-process cache
+    clear_memo()
+    with protlearn.config_context(memo_size=4):
+        aac(X_list)
+        aac_single, _ = aac(X_list[0])
+        paac(X_list, lambda_=3)
+        assert memo_info() == {'hits': 1, 'misses': 6, 'size': 4, 
+                               'max_size': 4}
+        aac_memo, _ = aac(X_more)
+    np.testing.assert_equal(aac_memo, aac_ref)
+    np.testing.assert_equal(aac_single, aac_ref[:1])
+    clear_memo()
+
+    # test invalid configuration
+    with pytest.raises(ValueError):
+        protlearn.set_config(cache_size=0)
+    with pytest.raises(ValueError):
+        protlearn.set_config(memo_size=-1)
+
+def test_cache_validation(monkeypatch):
+    "Test that only sequences missing the cache are validated"
+
+    checked = []
+    check_sequences = compute.check_sequences
+    def spy(X, natural=True):
+        checked.append(list(X))
+        check_sequences(X, natural)
+    monkeypatch.setattr(compute, 'check_sequences', spy)
+
+    clear_memo()
+    with protlearn.config_context(memo_size=4):
+        aac(['ARKLY'])
+        checked.clear()
+        aac(['ARKLY', 'EERNP'])
+        assert checked == [['EERNP']]
+
+        # invalid sequences are reported relative to the dataset
+        with pytest.raises(InvalidSequenceError) as e:
+            aac(['ARKLY', 'EERNP', 'AXK'])
+        np.testing.assert_equal(e.value.indices, [2])
+    clear_memo()
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import protlearn
+from ..compute import unique_sequences
+from ...features import FeaturePipeline, aac, aaindex1, ctdd, entropy, paac
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_compute():
+    "Test deduplicated feature computation"
+
+    # load data
+    X_list = open(PATH+'multiple.txt').read().splitlines()
+    X_dup = [X_list[i] for i in [0, 1, 0, 2, 2, 0]]
+
+    # test unique sequences
+    X_unique, inverse = unique_sequences(X_dup)
+    assert X_unique == X_list
+    np.testing.assert_equal(inverse, [0, 1, 0, 2, 2, 0])
+
+    # sequential results
+    aac_seq, _ = aac(X_dup)
+    aaind_seq, _ = aaindex1(X_dup, standardize='zscore')
+    ctdd_seq, _ = ctdd(X_dup)
+    ent_seq = entropy(X_dup)
+    paac_seq, _ = paac(X_dup, lambda_=3)
+    pipe = FeaturePipeline([('aac', None), ('paac', {'lambda_': 3})])
+    pipe_seq, _ = pipe.transform(X_dup)
+
+    # deduplicated results
+    with protlearn.config_context(dedup=True):
+        aac_dedup, _ = aac(X_dup)
+        aaind_dedup, _ = aaindex1(X_dup, standardize='zscore')
+        ctdd_dedup, _ = ctdd(X_dup)
+        ent_dedup = entropy(X_dup)
+        paac_dedup, _ = paac(X_dup, lambda_=3)
+        pipe_dedup, _ = pipe.transform(X_dup)
+
+    # test array contents
+    np.testing.assert_equal(aac_dedup, aac_seq)
+    np.testing.assert_almost_equal(aaind_dedup, aaind_seq)
+    np.testing.assert_equal(ctdd_dedup, ctdd_seq)
+    np.testing.assert_equal(ent_dedup, ent_seq)
+    np.testing.assert_equal(paac_dedup, paac_seq)
+    np.testing.assert_equal(pipe_dedup, pipe_seq)
+
+    # test invalid configuration
+    with pytest.raises(ValueError):
+        protlearn.set_config(dedup='yes')
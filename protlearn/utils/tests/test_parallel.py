@@ -0,0 +1,98 @@
+import pytest
+import threading
+import numpy as np
+import protlearn
+from ...features import aac, aaindex1, atc, cksaap, ctdd, moran, paac, qso
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_parallel():
+    "Test parallel feature computation"
+
+    # load data
+    X_list = open(PATH+'multiple.txt').read().splitlines()
+    X_list = X_list*5
+    X_err = X_list + ['AGT2HT9']
+
+    # sequential results
+    aac_seq, _ = aac(X_list, remove_zero_cols=True)
+    cksaap_seq, _ = cksaap(X_list)
+    ctdd_seq, _ = ctdd(X_list)
+    paac_seq, _ = paac(X_list, lambda_=3)
+    qso_sw_seq, qso_g_seq, _ = qso(X_list, d=3)
+
+    # parallel results
+    with protlearn.config_context(n_jobs=2):
+        assert protlearn.get_config()['n_jobs'] == 2
+        aac_par, _ = aac(X_list, remove_zero_cols=True)
+        cksaap_par, _ = cksaap(X_list)
+        ctdd_par, _ = ctdd(X_list)
+        paac_par, _ = paac(X_list, lambda_=3)
+        qso_sw_par, qso_g_par, _ = qso(X_list, d=3)
+
+        # test ValueError raised inside a worker
+        with pytest.raises(ValueError):
+            aac(X_err)
+    assert protlearn.get_config()['n_jobs'] == 1
+
+    # test array contents
+    np.testing.assert_equal(aac_par, aac_seq)
+    np.testing.assert_equal(cksaap_par, cksaap_seq)
+    assert cksaap_par.dtype == cksaap_seq.dtype
+    np.testing.assert_equal(ctdd_par, ctdd_seq)
+    np.testing.assert_equal(paac_par, paac_seq)
+    np.testing.assert_equal(qso_sw_par, qso_sw_seq)
+    np.testing.assert_equal(qso_g_par, qso_g_seq)
+
+    # test thread-parallel NumPy kernels
+    with protlearn.config_context(n_jobs=3, backend='threads'):
+        aac_thr, _ = aac(X_list, remove_zero_cols=True)
+        aaind_thr, _ = aaindex1(X_list)
+        atoms_thr, bonds_thr = atc(X_list)
+        moran_thr = moran(X_list, d=2)
+
+        # test ValueError raised inside a thread
+        with pytest.raises(ValueError):
+            aac(X_err)
+    assert protlearn.get_config()['backend'] == 'processes'
+
+    np.testing.assert_equal(aac_thr, aac_seq)
+    np.testing.assert_almost_equal(aaind_thr, aaindex1(X_list)[0])
+    np.testing.assert_almost_equal(atoms_thr, atc(X_list)[0])
+    np.testing.assert_almost_equal(bonds_thr, atc(X_list)[1])
+    np.testing.assert_almost_equal(moran_thr, moran(X_list, d=2))
+
+    # test invalid configuration
+    with pytest.raises(ValueError):
+        protlearn.set_config(n_jobs=0)
+    with pytest.raises(ValueError):
+        protlearn.set_config(backend='gpu')
+
+def test_config_context_threads():
+    "Test that config_context is local to the thread that entered it"
+
+    entered, checked = threading.Event(), threading.Event()
+    seen = {}
+
+    def worker():
+        with protlearn.config_context(n_jobs=4, dedup=True):
+            entered.set()
+            checked.wait(5)
+            seen['worker'] = protlearn.get_config()
+        seen['after'] = protlearn.get_config()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    entered.wait(5)
+
+    # the main thread keeps its own settings, and vice versa
+    seen['main'] = protlearn.get_config()
+    with protlearn.config_context(n_jobs=2):
+        checked.set()
+        thread.join()
+        assert protlearn.get_config()['n_jobs'] == 2
+    assert seen['main']['n_jobs'] == 1 and not seen['main']['dedup']
+    assert seen['worker']['n_jobs'] == 4 and seen['worker']['dedup']
+    assert seen['after']['n_jobs'] == 1 and not seen['after']['dedup']
+    assert protlearn.get_config()['n_jobs'] == 1
@@ -0,0 +1,52 @@
+import numpy as np
+import protlearn
+from ..._profiling import STAGES
+from ...features import aac, paac, FeaturePipeline
+from ...preprocessing import remove_duplicates
+import pkg_resources
+
+PATH = pkg_resources.resource_filename(__name__, 'test_data/')
+
+def test_profiling():
+    "Test profiling of function calls"
+
+    # load data
+    X_list = open(PATH+'multiple.txt').read().splitlines()
+    n_bytes = sum(len(seq) for seq in X_list)
+
+    records = []
+    with protlearn.profile(records.append) as prof:
+        aac(X_list)
+        aac(X_list[0])
+        paac(X_list, lambda_=3)
+        FeaturePipeline([('aac', None), ('entropy', None)]).transform(X_list)
+        remove_duplicates(X_list, verbose=0)
+
+    # test per-function statistics
+    stats = prof.stats
+    assert set(stats) == {'aac', 'paac', 'entropy', 'remove_duplicates',
+                          'FeaturePipeline.transform'}
+    assert stats['aac']['calls'] == 3
+    assert stats['aac']['n_sequences'] == 2*len(X_list) + 1
+    assert stats['paac']['n_bytes'] == n_bytes
+    assert set(stats['paac']['seconds']) == set(STAGES + ['total'])
+
+    # test records and callback
+    assert records == prof.records
+    assert len(records) == 7
+    assert records[0]['function'] == 'aac'
+    assert records[0]['n_sequences'] == len(X_list)
+    for rec in records:
+        seconds = rec['seconds']
+        assert min(seconds.values()) >= 0
+        assert seconds['total'] >= seconds['compute']
+
+    # test exclusive stage times add up to the total
+    for rec in records:
+        if rec['function'] != 'FeaturePipeline.transform':
+            total = sum(rec['seconds'][stage] for stage in STAGES)
+            np.testing.assert_almost_equal(total, rec['seconds']['total'])
+
+    # test that nothing is recorded outside the context
+    aac(X_list)
+    assert prof.stats['aac']['calls'] == 3
@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
-from ..validation import check_input
+from ..validation import check_input, validate_sequences, \
+                         check_sequences, InvalidSequenceError
+from ...features import aac, aaindex1, atc, entropy, motif, FeaturePipeline
 import pkg_resources
 
 PATH = pkg_resources.resource_filename(__name__, 'test_data/')
@@ -23,4 +25,68 @@ def test_validation():
 
     # test TypeError
     with pytest.raises(TypeError):
-        val_err = check_input(X_err)
\ No newline at end of file
+        val_err = check_input(X_err)
+
+    # test validate_sequences
+    X_mixed = ['ARKLY', 'AXK', 'A1B', '', 'AKé']
+    valid, errors = validate_sequences(X_mixed)
+    np.testing.assert_equal(valid, [True, False, False, False, False])
+    np.testing.assert_equal(errors, [[1, 1], [2, 1], [2, 2], [4, 2]])
+    valid, errors = validate_sequences(X_mixed, natural=False)
+    np.testing.assert_equal(valid, [True, True, False, False, True])
+    np.testing.assert_equal(errors, [[2, 1]])
+
+    # test check_sequences
+    check_sequences(X_list)
+    check_sequences(['AXK'], natural=False)
+    with pytest.raises(InvalidSequenceError) as e:
+        check_sequences(X_list + ['AXK', 'A1B'])
+    np.testing.assert_equal(e.value.indices, [len(X_list)+1])
+    with pytest.raises(ValueError) as e:
+        check_sequences(X_list + ['AXK'])
+    np.testing.assert_equal(e.value.indices, [len(X_list)])
+
+    # test on_invalid policies
+    X_bad = X_list[:1] + ['AXK'] + X_list[1:] + ['A1B']
+    valid = np.array([True, False] + [True]*(len(X_list)-1) + [False])
+    comp, _ = aac(X_list)
+    comp_skip, _ = aac(X_bad, on_invalid='skip')
+    np.testing.assert_equal(comp_skip, comp)
+    comp_nan, _ = aac(X_bad, on_invalid='nan')
+    np.testing.assert_equal(comp_nan[valid], comp)
+    assert np.isnan(comp_nan[~valid]).all()
+    comp_mask, _, mask = aac(X_bad, on_invalid='mask')
+    np.testing.assert_equal(comp_mask, comp)
+    np.testing.assert_equal(mask, valid)
+    atoms, bonds = atc(X_bad, on_invalid='nan')
+    assert atoms.shape == (len(X_bad), 5) and np.isnan(bonds[1]).all()
+    ent = entropy([X_list[0], 'AXK'], on_invalid='nan')
+    np.testing.assert_almost_equal(ent, [[entropy(X_list[0])], [np.nan]])
+
+    # a single valid sequence with dataset-level standardization
+    X_one = [X_list[0], 'AXK']
+    for func, kwargs in [(aaindex1, {'standardize': 'zscore'}), 
+                         (entropy, {'standardize': 'minmax'})]:
+        out = func(X_one, on_invalid='nan', **kwargs)
+        out_skip = func(X_one, on_invalid='skip', **kwargs)
+        arr = out[0] if isinstance(out, tuple) else out
+        arr_skip = out_skip[0] if isinstance(out_skip, tuple) else out_skip
+        np.testing.assert_almost_equal(arr[:1], np.reshape(arr_skip, (1, -1)))
+        assert np.isnan(arr[1]).all()
+    mot, mask = motif(['AXK', 'A1K'], 'XK', on_invalid='mask')
+    np.testing.assert_equal(mask, [True, False])
+    pipe = FeaturePipeline([('aac', None), ('entropy', None)], 
+                           on_invalid='nan')
+    arr, desc = pipe.transform(X_bad)
+    np.testing.assert_equal(arr[valid, :20], comp)
+    assert np.isnan(arr[~valid]).all()
+
+    # test errors of on_invalid
+    with pytest.raises(InvalidSequenceError):
+        aac(X_bad)
+    with pytest.raises(InvalidSequenceError):
+        aac(['AXK', 'A1B'], on_invalid='skip')
+    with pytest.raises(ValueError):
+        aac(X_list, on_invalid='ignore')
+    with pytest.raises(ValueError):
+        FeaturePipeline([('aac', {'on_invalid': 'nan'})])
@@ -1,8 +1,13 @@
 # Author: Thomas Dorfer <thomas.a.dorfer@gmail.com>
 
 import os
-from Bio import SeqIO
+import numpy as np
+from functools import wraps
+from contextvars import ContextVar
+from .encoding import to_buffer
+from .._profiling import stage, record_input
 
+@stage('parsing')
 def check_input(X):
     """Check if input has the correct type."""
     # correct fasta extensions for proteins
@@ -12,6 +17,7 @@ def check_input(X):
         
         # fasta format
         if extension in ext:
+            from Bio import SeqIO
             # single fasta sequence
             try:
                 X = [str(SeqIO.read(X, 'fasta').seq)]
@@ -29,6 +35,7 @@ def check_input(X):
     else:
         raise TypeError('Data must be string or list.')
     
+    record_input(X)
     return X
 
 def check_alpha(X):
@@ -42,3 +49,233 @@ def check_natural(X):
     if set(X).issubset(amino_acids) == False:
         raise ValueError("Data contains sequences with unnatural amino acids. "+ 
                          "Consider running preprocessing.remove_unnatural.")
+
+# list of amino acids (IUPAC standard)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# character classes in increasing order of severity
+NATURAL, LETTER, OTHER, NON_ASCII = 0, 1, 2, 3
+
+# lookup table from byte to character class; bytes of non-ASCII characters 
+# are classified per sequence
+CLASSES = np.full((256,), NON_ASCII, dtype=np.uint8)
+CLASSES[:128] = OTHER
+CLASSES[[ord(c) for c in map(chr, range(128)) if c.isalpha()]] = LETTER
+CLASSES[np.frombuffer(AMINO_ACIDS.encode(), dtype=np.uint8)] = NATURAL
+
+class InvalidSequenceError(ValueError):
+    """Raised if sequences are empty or contain characters other than (natural)
+    amino acids.
+
+    Attributes
+    ----------
+
+    indices : ndarray of shape (n_invalid,)
+        Indices of the invalid sequences.
+
+    errors : ndarray of shape (n_errors, 2)
+        Sequence index and position (zero-based) of each offending character.
+
+    """
+
+    def __init__(self, message, indices, errors):
+        super().__init__(message)
+        self.indices = indices
+        self.errors = errors
+
+# dataset processed by FeaturePipeline and the levels it passed 
+# check_sequences at, as a tuple (X, levels)
+_checked = ContextVar('protlearn_checked', default=None)
+
+def _classify(X):
+    """Character classes of the concatenated sequences and their offsets."""
+    buf, offsets = to_buffer(X)
+    return CLASSES[buf], offsets
+
+def _errors(X, classes, offsets, level):
+    """Validity mask and offending characters, where all characters of a class
+    above level are offending."""
+    pos = np.flatnonzero(classes > level)
+    ids = np.searchsorted(offsets, pos, side='right') - 1
+    cols = pos - offsets[ids]
+    valid = np.diff(offsets) > 0
+    valid[ids] = False
+
+    # non-ASCII characters span several bytes and may be letters
+    non_ascii = np.unique(ids[classes[pos] == NON_ASCII])
+    if len(non_ascii):
+        keep = ~np.isin(ids, non_ascii)
+        ids, cols = [ids[keep]], [cols[keep]]
+        for i in non_ascii:
+            bad = [j for j, c in enumerate(X[i]) if not c.isalpha() or 
+                   (level == NATURAL and c not in AMINO_ACIDS)]
+            valid[i] = not bad
+            ids.append(np.full((len(bad),), i, dtype=np.intp))
+            cols.append(np.asarray(bad, dtype=np.intp))
+        ids, cols = np.concatenate(ids), np.concatenate(cols)
+        order = np.argsort(ids, kind='stable')
+        ids, cols = ids[order], cols[order]
+
+    return valid, np.column_stack([ids, cols]).astype(np.intp)
+
+def validate_sequences(X, natural=True):
+    """Validate a dataset of sequences in a single vectorized pass.
+
+    Parameters
+    ----------
+
+    X : list of strings
+        Dataset of amino acid sequences.
+
+    natural : bool, default=True
+        Whether only the 20 natural amino acids are allowed; otherwise, any
+        alphabetical character is.
+
+    Returns
+    -------
+
+    valid : ndarray of shape (n_samples,), dtype=bool
+        Whether each sequence is non-empty and contains allowed characters
+        only.
+
+    errors : ndarray of shape (n_errors, 2)
+        Sequence index and position (zero-based) of each offending character,
+        ordered by sequence.
+
+    Examples
+    --------
+
+    >>> from protlearn.utils.validation import validate_sequences
+    >>> valid, errors = validate_sequences(['ARKLY', 'AXK', 'A1B'])
+    >>> valid
+    array([ True, False, False])
+    >>> errors
+    array([[1, 1],
+           [2, 1],
+           [2, 2]])
+
+    """
+
+    classes, offsets = _classify(X)
+    return _errors(X, classes, offsets, NATURAL if natural else LETTER)
+
+def _format(indices, limit=10):
+    listed = ', '.join(str(i) for i in indices[:limit])
+    return listed + (', ...' if len(indices) > limit else '')
+
+@stage('validation')
+def check_sequences(X, natural=True):
+    """Check that all sequences are alphabetical and, if natural is True, 
+    comprised of natural amino acids only.
+
+    Raises
+    ------
+
+    InvalidSequenceError
+        Reporting the indices of the invalid sequences.
+
+    """
+
+    level = NATURAL if natural else LETTER
+    if _passed(X, level):
+        return
+
+    _check_classes(X, *_classify(X), natural)
+    _record(X, level)
+
+def _check_classes(X, classes, offsets, natural):
+    """check_sequences on the character classes of X (see _classify)."""
+    level = NATURAL if natural else LETTER
+    if not (len(classes) and classes.max() <= level and 
+            np.all(np.diff(offsets) > 0)):
+        valid, errors = _errors(X, classes, offsets, LETTER)
+        if not valid.all():
+            indices = np.flatnonzero(~valid)
+            raise InvalidSequenceError('Data must be alphabetical! Invalid '
+                                       'sequences at indices %s.' % 
+                                       _format(indices), indices, errors)
+        if natural:
+            valid, errors = _errors(X, classes, offsets, NATURAL)
+            if not valid.all():
+                indices = np.flatnonzero(~valid)
+                raise InvalidSequenceError(
+                    'Data contains sequences with unnatural amino acids at '
+                    'indices %s. Consider running '
+                    'preprocessing.remove_unnatural.' % _format(indices), 
+                    indices, errors)
+
+def _passed(X, level):
+    """Whether X is the dataset of FeaturePipeline and has passed 
+    check_sequences at level or a stricter one."""
+    checked = _checked.get()
+    return checked is not None and checked[0] is X and \
+           any(passed <= level for passed in checked[1])
+
+def _record(X, level):
+    """Record that X has passed check_sequences at level."""
+    checked = _checked.get()
+    if checked is not None and checked[0] is X:
+        checked[1].add(level)
+
+# policies for invalid sequences (see handle_invalid)
+POLICIES = ['raise', 'skip', 'nan', 'mask']
+
+def handle_invalid(n_arrays=1, natural=True):
+    """Decorator implementing the on_invalid parameter of a feature function.
+
+    Unless on_invalid is 'raise', sequences that fail validation (see 
+    validate_sequences) are removed before the function is called, and its
+    first n_arrays outputs, which then have one row per valid sequence, are
+    adapted to the policy: 'skip' returns them as they are, 'nan' scatters
+    them into arrays with one row per input sequence and NaN rows for invalid
+    sequences, and 'mask' appends the boolean mask of valid sequences to the
+    outputs. natural is either a bool or, for functions whose strictness 
+    depends on their parameters, a callable receiving the keyword arguments
+    of the call and returning a bool.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(X, *args, on_invalid='raise', **kwargs):
+            if on_invalid not in POLICIES:
+                raise ValueError("on_invalid must be 'raise', 'skip', 'nan', "
+                                 "or 'mask'!")
+            if on_invalid == 'raise':
+                return func(X, *args, **kwargs)
+
+            X = check_input(X)
+            strict = natural(**kwargs) if callable(natural) else natural
+            with stage('validation'):
+                valid, errors = validate_sequences(X, strict)
+            if not valid.any():
+                raise InvalidSequenceError('Data contains no valid sequences!',
+                                           np.arange(len(X)), errors)
+            if on_invalid == 'nan' and not valid.all():
+                return _fill_invalid(func, X, valid, n_arrays, args, kwargs)
+
+            X_valid = X if valid.all() else [seq for seq, v in zip(X, valid) 
+                                             if v]
+            out = func(X_valid, *args, **kwargs)
+            if on_invalid == 'mask':
+                return out + (valid,) if isinstance(out, tuple) else (out, 
+                                                                      valid)
+            return out
+
+        return wrapper
+
+    return decorator
+
+def _fill_invalid(func, X, valid, n_arrays, args, kwargs):
+    """Outputs of func with NaN rows for invalid sequences."""
+    X_valid = [seq for seq, v in zip(X, valid) if v]
+    out = func(X_valid, *args, **kwargs)
+
+    # many functions return a scalar or squeezed array for a single sequence
+    items = list(out) if isinstance(out, tuple) else [out]
+    for i in range(n_arrays):
+        rows = np.asarray(items[i])
+        if len(X_valid) == 1:
+            rows = np.reshape(rows, (1, -1))
+        items[i] = np.full((len(X),)+rows.shape[1:], np.nan)
+        items[i][valid] = rows
+
+    return tuple(items) if isinstance(out, tuple) else items[0]
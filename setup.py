@@ -9,7 +9,7 @@ with open(path.join(here, 'README.md'), encoding='utf-8') as f:
 
 setup(
   name = 'protlearn',       
-  packages = find_packages(exclude=["tests.*", "tests"]), 
+  packages = find_packages(exclude=["tests.*", "tests", "benchmarks.*", "benchmarks"]), 
   package_data={'protlearn': ['features/data/*.csv']},  
   version = '0.0.3',      
   license='MIT',        
@@ -22,12 +22,12 @@ setup(
   download_url = 'https://github.com/tadorfer/protlearn/archive/v0.0.3.tar.gz',  
   keywords = ['amino acids', 'proteins', 'peptides', 'preprocessing', 'feature engineering', 'dimensionality reduction', 'machine learning'], 
   setup_requires = ['wheel'],
+  python_requires = '>=3.8',
   install_requires=[            
           'numpy',
           'pandas',
           'scikit-learn',
           'xgboost',
-          'mlxtend',
           'biopython'
       ],
   classifiers=[
@@ -35,8 +35,6 @@ setup(
     'Intended Audience :: Science/Research',      
     'Topic :: Software Development :: Build Tools',
     'License :: OSI Approved :: MIT License',   
-    'Programming Language :: Python :: 3.6',
-    'Programming Language :: Python :: 3.7',
     'Programming Language :: Python :: 3.8',
   ]
 )